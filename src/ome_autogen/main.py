@@ -58,13 +58,14 @@ def get_config(
     CodeWriter.register_generator(OME_FORMAT, OmeGenerator)
 
     mixins = []
-    for class_name, import_string, prepend in MIXINS:
+    for class_name, import_string, prepend, *derived in MIXINS:
         mixins.append(
             cfg.GeneratorExtension(
                 type=cfg.ExtensionType.CLASS,
                 class_name=class_name,
                 import_string=import_string,
                 prepend=prepend,
+                apply_if_derived=any(derived),
             )
         )
 
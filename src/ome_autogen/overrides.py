@@ -11,13 +11,17 @@ if TYPE_CHECKING:
 AUTO_SEQUENCE = "__auto_sequence__"
 
 MIXIN_MODULE = "ome_types._mixins"
-# class_name, import_string, whether-to-prepend or append to the existing Bases
-MIXINS: list[tuple[str, str, bool]] = [
+# class_name, import_string, whether-to-prepend or append to the existing Bases,
+# and (optionally) whether to also apply it to classes that extend another class
+MIXINS: list[tuple[str, str, bool] | tuple[str, str, bool, bool]] = [
     (".*", f"{MIXIN_MODULE}._base_type.OMEType", False),  # base type on every class
     ("OME", f"{MIXIN_MODULE}._ome.OMEMixin", True),
     ("Instrument", f"{MIXIN_MODULE}._instrument.InstrumentMixin", False),
     ("Reference", f"{MIXIN_MODULE}._reference.ReferenceMixin", True),
+    ("BinData", f"{MIXIN_MODULE}._payload.BinDataMixin", True),
+    ("XMLAnnotation", f"{MIXIN_MODULE}._payload.PayloadMixin", True, True),
     ("Map", f"{MIXIN_MODULE}._map_mixin.MapMixin", False),
+    ("Pixels", f"{MIXIN_MODULE}._pixels.PixelsMixin", False),
     ("Union", f"{MIXIN_MODULE}._collections.ShapeUnionMixin", True),
     (
         "StructuredAnnotations",
@@ -73,7 +77,11 @@ OVERRIDES: dict[str, Ovr] = {
         add_lines=["_vany = field_validator('any_elements')(any_elements_validator)"],
     ),
     "Pixels": Ovr(
-        add_lines=["_vpix = model_validator(mode='before')(pixels_root_validator)"],
+        add_lines=[
+            "_vpix = model_validator(mode='before')(pixels_root_validator)",
+            "_vcolumnar = field_validator('planes', 'tiff_data_blocks', mode='wrap')(columnar_validator)",
+            "_scolumnar = field_serializer('planes', 'tiff_data_blocks', mode='wrap')(serialize_columnar)",
+        ],
     ),
     "XMLAnnotation": Ovr(
         add_lines=[
@@ -128,12 +136,15 @@ IMPORT_PATTERNS: dict[str, dict[str, list[str]]] = {
         "validator": ["validator("],
         "model_validator": ["model_validator("],
         "field_validator": ["field_validator("],
+        "field_serializer": ["field_serializer("],
     },
     "ome_types._mixins._validators": {
         "any_elements_validator": ["any_elements_validator"],
         "bin_data_root_validator": ["bin_data_root_validator"],
+        "columnar_validator": ["columnar_validator"],
         "pixel_type_to_numpy_dtype": ["pixel_type_to_numpy_dtype"],
         "pixels_root_validator": ["pixels_root_validator"],
+        "serialize_columnar": ["serialize_columnar"],
         "validate_map_annotation": ["validate_map_annotation"],
         "validate_shape_union": ["validate_shape_union"],
         "validate_structured_annotations": ["validate_structured_annotations"],
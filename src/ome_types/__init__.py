@@ -11,19 +11,36 @@ if TYPE_CHECKING:
     from ome_types.units import ureg
 
 from ome_types import model
-from ome_types._conversion import from_tiff, from_xml, to_dict, to_xml, validate_xml
+from ome_types._batch import from_tiff_many, from_xml_many
+from ome_types._conversion import (
+    clear_schema_cache,
+    from_tiff,
+    from_xml,
+    iter_xml,
+    to_dict,
+    to_xml,
+    to_xml_stream,
+    validate_xml,
+    warm_schema_cache,
+)
 from ome_types.model import OME
 
 __all__ = [
     "OME",
     "__version__",
+    "clear_schema_cache",
     "from_tiff",
+    "from_tiff_many",
     "from_xml",
+    "from_xml_many",
+    "iter_xml",
     "model",
     "to_dict",
     "to_xml",
+    "to_xml_stream",
     "ureg",
     "validate_xml",
+    "warm_schema_cache",
 ]
 
 
@@ -0,0 +1,105 @@
+"""Parse many documents in parallel, using a pool of processes."""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+    from typing import Any, Callable, TypeVar
+
+    from ome_types.model import OME
+
+    P = TypeVar("P", bound="Path | str")
+
+__all__ = ["from_tiff_many", "from_xml_many"]
+
+
+def from_tiff_many(
+    paths: Iterable[P],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+    executor: Executor | None = None,
+    **kwargs: Any,
+) -> Iterator[tuple[P, OME | Exception]]:
+    """Generate OME objects from many TIFF files, in parallel.
+
+    Each file is read and parsed in a separate process (parsing is CPU-bound, so
+    threads would not help). The resulting objects are pickled back to the calling
+    process, where their references are re-linked.
+
+    Parameters
+    ----------
+    paths : Iterable[Path | str]
+        Paths to TIFF files.
+    workers : int | None
+        The number of worker processes. If None, the number of CPUs is used.
+        Ignored if `executor` is provided.
+    ordered : bool
+        If True (the default), results are yielded in the order of `paths`.
+        Otherwise, they are yielded as soon as they are available.
+    executor : Executor | None
+        An existing executor to submit the work to (it is not shut down).  If None,
+        a new `ProcessPoolExecutor` is created (and shut down at the end).
+    **kwargs : Any
+        Passed to [`ome_types.from_tiff`][] (must be picklable).
+
+    Yields
+    ------
+    tuple[Path | str, OME | Exception]
+        Each path, with either the OME object, or the exception raised while reading
+        or parsing it.  An error in one file does not abort the batch.
+    """
+    from ome_types._conversion import from_tiff
+
+    return _map(partial(from_tiff, **kwargs), paths, workers, ordered, executor)
+
+
+def from_xml_many(
+    paths: Iterable[P],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+    executor: Executor | None = None,
+    **kwargs: Any,
+) -> Iterator[tuple[P, OME | Exception]]:
+    """Generate OME objects from many XML files, in parallel.
+
+    See [`ome_types.from_tiff_many`][] for details on the parameters. `kwargs` are
+    passed to [`ome_types.from_xml`][].
+    """
+    from ome_types._conversion import from_xml
+
+    return _map(partial(from_xml, **kwargs), paths, workers, ordered, executor)
+
+
+def _map(
+    func: Callable[[P], OME],
+    paths: Iterable[P],
+    workers: int | None,
+    ordered: bool,
+    executor: Executor | None,
+) -> Iterator[tuple[P, OME | Exception]]:
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    futures: dict[Future[OME], P] = {}
+    try:
+        for path in paths:
+            futures[pool.submit(func, path)] = path
+        for future in futures if ordered else as_completed(futures):
+            exc = future.exception()
+            if exc is None:
+                yield futures[future], future.result()
+            elif isinstance(exc, Exception):
+                yield futures[future], exc
+            else:  # pragma: no cover
+                raise exc
+    finally:
+        # (if the caller stops early, don't wait for results nobody will look at)
+        for future in futures:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=True)
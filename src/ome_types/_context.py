@@ -0,0 +1,13 @@
+"""The XML binding context shared by the parsers and serializers of ome-types."""
+
+from __future__ import annotations
+
+from xsdata_pydantic_basemodel.bindings import XmlContext
+
+# shared context, so that class metadata is only built once per process
+_CONTEXT = XmlContext()
+
+
+def default_context() -> XmlContext:
+    """Return the shared `XmlContext`."""
+    return _CONTEXT
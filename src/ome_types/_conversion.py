@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 import io
-import operator
+import mmap
 import os
+import threading
 import warnings
 from contextlib import nullcontext, suppress
-from functools import cache
+from copy import deepcopy
+from dataclasses import replace
+from functools import cache, partial
+from itertools import chain
 from pathlib import Path
 from struct import Struct
-from typing import TYPE_CHECKING, Callable, cast, overload
+from typing import TYPE_CHECKING, Callable, cast, get_args, get_origin, overload
 
 from pydantic import BaseModel
 from xsdata.formats.dataclass.parsers.config import ParserConfig
 
+from ome_types._mixins._construct import trusted_factory
+from ome_types._mixins._ids import IdScope, id_scope
 from xsdata_pydantic_basemodel.bindings import (
     SerializerConfig,
     XmlParser,
@@ -26,16 +32,19 @@ except ImportError:  # pragma: no cover
 
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Collection, Iterable, Iterator
     from contextlib import AbstractContextManager
-    from typing import Any, BinaryIO, Literal, TypedDict
+    from typing import Any, BinaryIO, Literal, TextIO, TypedDict
     from xml.etree import ElementTree
 
     import xmlschema
+    from lxml import etree
     from lxml.etree import _XSLTResultTree
     from xsdata.formats.dataclass.parsers.mixins import XmlHandler
 
+    from ome_types._fast_parser import FastXmlParser
     from ome_types._mixins._base_type import OMEType
+    from ome_types._mixins._ome import LazyFields
     from ome_types.model import OME
     from xsdata_pydantic_basemodel.bindings import XmlContext
 
@@ -43,7 +52,7 @@ if TYPE_CHECKING:
     AnyElementTree = ElementTree.ElementTree | ET._ElementTree
     ElementOrTree = AnyElement | AnyElementTree
     TransformationCallable = Callable[[AnyElementTree], AnyElementTree]
-    XMLSource = Path | str | bytes | BinaryIO
+    XMLSource = Path | str | bytes | memoryview | BinaryIO
     FileLike = str | io.BufferedIOBase
 
     class ParserKwargs(TypedDict, total=False):
@@ -52,7 +61,17 @@ if TYPE_CHECKING:
         handler: type[XmlHandler]
 
 
-__all__ = ["from_tiff", "from_xml", "tiff2xml", "to_dict", "to_xml"]
+__all__ = [
+    "clear_schema_cache",
+    "from_tiff",
+    "from_xml",
+    "iter_xml",
+    "tiff2xml",
+    "tiff_xml_offset",
+    "to_dict",
+    "to_xml",
+    "warm_schema_cache",
+]
 
 OME_ROOT = "http://www.openmicroscopy.org/Schemas/OME"
 OME_2016_06_URI = f"{OME_ROOT}/2016-06"
@@ -68,6 +87,12 @@ def from_xml(
     parser_kwargs: ParserKwargs | None = None,
     transformations: Iterable[TransformationCallable] = (),
     warn_on_schema_update: bool = False,
+    engine: Literal["xsdata", "fast"] = "xsdata",
+    trusted: bool = False,
+    lazy: bool = False,
+    columnar: bool = False,
+    defer: Collection[str] = (),
+    skip: Collection[str] = (),
 ) -> OME:  #  Not totally true, see note below
     """Generate an OME object from an XML document.
 
@@ -100,6 +125,47 @@ def from_xml(
     warn_on_schema_update : bool
         Whether to warn if a transformation was applied to bring the document to
         OME-2016-06.
+    engine : Literal["xsdata", "fast"]
+        The engine used to bind the parsed XML to model objects.  "xsdata" (the
+        default) uses xsdata's generic XmlParser.  "fast" uses precomputed per-class
+        binding tables to build the models directly from the element tree.  Both
+        produce identical objects. The `handler` in `parser_kwargs` is ignored by
+        the "fast" engine.
+    trusted : bool
+        If True, the document is assumed to be valid OME-XML, and model objects are
+        created without calling their constructor: their fields are assigned
+        directly (as `model_construct` does), skipping pydantic validation, ID
+        normalization, and extra-field checks.  References are still linked, and
+        `model_fields_set` is populated exactly as in the default mode.  This is
+        considerably faster, but malformed documents may produce invalid objects.
+        Best combined with `validate=True`, or with documents from a known-good
+        source.  Cannot be combined with a custom `class_factory` in
+        `parser_kwargs`.
+    lazy : bool
+        If True (and the root element is `<OME>`), top-level collections such as
+        `images`, `instruments`, `rois` or `structured_annotations` are kept as parsed
+        XML, and only converted to model objects when first accessed.  References
+        are resolved as usual (loading the field that holds the referenced object on
+        demand). Everything is loaded when the object is compared, dumped, copied or
+        pickled.
+    columnar : bool
+        If True, the `planes` and `tiff_data_blocks` of each `Pixels` are stored in
+        columnar containers (NumPy structured arrays, see `ome_types.columnar`)
+        instead of lists of objects.  This is much faster and more compact for
+        images with many planes, and allows vectorized queries.  Requires numpy.
+    defer : Collection[str]
+        Names of types whose payload is not decoded while parsing, but only when it
+        is first accessed: "BinData" (the base64 text of each `BinData` element is
+        kept as is, and decoded when its `value` is accessed, or directly into an
+        array by `BinData.to_numpy`) and/or "XMLAnnotation" (the contents of the
+        `value` of each `XMLAnnotation` are kept as XML elements, and converted when
+        it is accessed).
+    skip : Collection[str]
+        Names of types whose payload is discarded while parsing: "BinData" (the
+        `value` of each `BinData` is empty) and/or "XMLAnnotation" (the `value` of
+        each `XMLAnnotation` has no elements).  The objects themselves (and their
+        other fields, such as IDs) are kept.  Useful to read only the metadata of
+        documents with large embedded payloads.
 
     Returns
     -------
@@ -130,8 +196,192 @@ def from_xml(
             warnings.warn("Transformation returned None, skipping", stacklevel=2)
 
     OME_type = _get_root_ome_type(xml_2016)
-    parser = XmlParser(**(parser_kwargs or {}))
-    return parser.parse(xml_2016, OME_type)
+    parser = _get_parser(parser_kwargs, engine, trusted)
+    if defer or skip:
+        from ome_types._deferred import PayloadParser
+
+        parser = PayloadParser(parser, defer, skip)
+    if columnar:
+        from ome_types.columnar import ColumnarParser
+
+        parser = ColumnarParser(parser)
+    # IDs are numbered and converted for this document only (see `id_scope`)
+    with id_scope() as scope:
+        lazy_fields = None
+        if lazy and OME_type.__name__ == "OME":
+            root, lazy_fields = _split_lazy_fields(xml_2016, OME_type, parser)
+            lazy_fields.id_scope = scope
+            result = parser.parse(root, OME_type)
+        else:
+            result = parser.parse(xml_2016, OME_type)
+    if (trusted or getattr(parser, "needs_linking", False)) and hasattr(
+        result, "_link_refs"
+    ):
+        # model construction bypassed OMEMixin.__init__ (or columnar containers
+        # with references were added after it)
+        result._link_refs()
+    if lazy_fields is not None:
+        result._set_lazy_fields(lazy_fields)  # type: ignore[attr-defined]
+    return cast("OME", result)
+
+
+def _split_lazy_fields(
+    tree: Any, cls: type[OMEType], parser: Any
+) -> tuple[Any, LazyFields]:
+    """Separate the children of `tree` that can be loaded lazily.
+
+    Returns a copy of the root element with only the remaining children, and the
+    elements to be loaded lazily, for each field of `cls`.
+    """
+    from ome_types._mixins._ome import LazyFields
+
+    root = tree.getroot() if hasattr(tree, "getroot") else tree
+    fields = _lazy_fields_by_tag(cls)
+    nsmap = {"nsmap": root.nsmap} if hasattr(root, "nsmap") else {}
+    shell = root.makeelement(root.tag, root.attrib, **nsmap)
+    elements: dict[str, tuple[type, bool, list]] = {}
+    for child in list(root):
+        entry = fields.get(child.tag) if isinstance(child.tag, str) else None
+        if entry is None:
+            shell.append(child)
+        else:
+            name, clazz, is_list = entry
+            elements.setdefault(name, (clazz, is_list, []))[2].append(child)
+    return shell, LazyFields(elements, parser)
+
+
+@cache
+def _lazy_fields_by_tag(cls: type[OMEType]) -> dict[str, tuple[str, type, bool]]:
+    """Return {tag: (field name, model class, is_list)} for lazy fields of `cls`."""
+    fields = {}
+    for name, field in cls.model_fields.items():
+        extra = cast("dict", field.json_schema_extra or {})
+        if extra.get("type") != "Element":
+            continue
+        is_list = get_origin(field.annotation) is list
+        clazz = next(a for a in get_args(field.annotation) if a is not type(None))
+        with suppress(ValueError):
+            # nested classes (like OME.BinaryOnly) can't be parsed on their own
+            _element_tag(clazz)
+            fields[f"{OME_2016_06_NS}{extra['name']}"] = (name, clazz, is_list)
+    return fields
+
+
+def iter_xml(
+    source: XMLSource,
+    types: Iterable[type[OMEType]] | None = None,
+    *,
+    parser_kwargs: ParserKwargs | None = None,
+    engine: Literal["xsdata", "fast"] = "xsdata",
+    trusted: bool = False,
+) -> Iterator[OMEType]:
+    """Incrementally parse an XML document, yielding model objects of given types.
+
+    Unlike `from_xml`, this never materializes the whole document: the source is
+    parsed incrementally, each element of a requested type is converted to a model
+    object (and yielded) as soon as its closing tag is parsed, and parsed elements are
+    discarded as soon as they are no longer needed.  Peak memory is therefore bounded
+    by the largest requested element, rather than by the size of the document.
+
+    Objects are yielded in document order of their *closing* tags, so if requested
+    types are nested (e.g. `Plate` and `WellSample`), the inner objects are yielded
+    before the outer object that contains them.
+
+    NOTE: yielded objects are not part of an `OME` object, so references to other
+    objects (e.g. `Image.instrument_ref.ref`) are not resolved.
+
+    Parameters
+    ----------
+    source : Path | str | bytes | io.BytesIO
+        Path to an XML file, string or bytes containing XML, or a file-like object.
+        If the source is not OME-2016-06 XML, it will be transformed to that namespace
+        if possible (which requires loading the full document).
+    types : Iterable[type[OMEType]] | None
+        The model types to yield, for example `(model.Image, model.ROI)`.  Nested
+        classes (like `ROI.Union`) are not supported. By default, `Image`, `Plate`
+        and `ROI` objects are yielded.
+    parser_kwargs : ParserKwargs | None
+        Passed to the XmlParser constructor. If None, a default parser
+        will be used.
+    engine : Literal["xsdata", "fast"]
+        The engine used to bind XML elements to model objects.
+        See [`ome_types.from_xml`][] for details.
+    trusted : bool
+        If True, build model objects without validation.
+        See [`ome_types.from_xml`][] for details.
+
+    Yields
+    ------
+    OMEType
+        Model objects of the requested types, one at a time.
+    """
+    from ome_types import model
+
+    if types is None:
+        types = (model.Image, model.Plate, model.ROI)
+    classes = {_element_tag(cls): cls for cls in types}
+    parser = _get_parser(parser_kwargs, engine, trusted)
+
+    # as in from_xml: IDs are numbered and converted for this document only
+    scope = IdScope()
+    # number of currently open elements of a requested type
+    n_open = 0
+    for event, elem in ET.iterparse(ensure_2016(source), events=("start", "end")):
+        cls = classes.get(elem.tag)  # type: ignore[arg-type]
+        if event == "start":
+            n_open += cls is not None
+            continue
+        if cls is not None:
+            n_open -= 1
+            # elements inside a larger requested element must be kept intact
+            # (the xsdata parser clears elements as it binds them)
+            with id_scope(scope):
+                obj = parser.parse(deepcopy(elem) if n_open else elem, cls)
+            yield obj
+        if not n_open:
+            # nothing still open needs this element anymore
+            elem.clear()
+            # with lxml, also drop the (now empty) preceding siblings
+            parent = elem.getparent() if hasattr(elem, "getparent") else None
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+def _element_tag(cls: type[OMEType]) -> str:
+    """Return the qualified tag of the XML element for a (non-nested) model class."""
+    meta = getattr(cls, "Meta", None)
+    namespace = getattr(meta, "namespace", None)
+    if namespace is None:
+        raise ValueError(f"{cls.__qualname__!r} is not a top-level OME element type")
+    return f"{{{namespace}}}{getattr(meta, 'name', None) or cls.__name__}"
+
+
+def _get_parser(
+    parser_kwargs: ParserKwargs | None,
+    engine: Literal["xsdata", "fast"],
+    trusted: bool,
+) -> XmlParser | FastXmlParser:
+    """Return a parser that binds element trees to model objects."""
+    kwargs = cast("ParserKwargs", dict(parser_kwargs or {}))
+    if trusted:
+        config = kwargs.get("config") or ParserConfig()
+        if config.class_factory is not ParserConfig().class_factory:
+            raise ValueError(
+                "`trusted=True` cannot be combined with a custom `class_factory` "
+                "in `parser_kwargs['config']`"
+            )
+        factory = trusted_factory
+        kwargs["config"] = replace(config, class_factory=factory)  # type: ignore
+
+    if engine == "fast":
+        from ome_types._fast_parser import FastXmlParser
+
+        kwargs.pop("handler", None)
+        return FastXmlParser(**kwargs)  # type: ignore
+    if engine == "xsdata":
+        return XmlParser(**kwargs)
+    raise ValueError(f"Unknown parser engine {engine!r}")
 
 
 # ------------------------
@@ -142,6 +392,8 @@ def from_tiff(
     *,
     validate: bool | None = None,
     parser_kwargs: ParserKwargs | None = None,
+    trusted: bool = False,
+    use_mmap: bool = False,
 ) -> OME:
     """Generate an OME object from a TIFF file.
 
@@ -156,9 +408,19 @@ def from_tiff(
     parser_kwargs : ParserKwargs | None
         Passed to the XmlParser constructor. If None, a default parser
         will be used.
+    trusted : bool
+        If True, build model objects without validation.
+        See [`ome_types.from_xml`][] for details.
+    use_mmap : bool
+        If True, memory-map the file to locate and read the OME-XML, rather than
+        using file reads, so that only the TIFF headers and the OME-XML are paged
+        in. (The OME-XML is still copied for parsing.) See
+        [`ome_types.tiff2xml`][].
     """
-    xml = tiff2xml(path)
-    return from_xml(xml, validate=validate, parser_kwargs=parser_kwargs)
+    xml = tiff2xml(path, use_mmap=use_mmap)
+    return from_xml(
+        xml, validate=validate, parser_kwargs=parser_kwargs, trusted=trusted
+    )
 
 
 TIFF_TYPES: dict[bytes, tuple[Struct, Struct, int, Struct]] = {
@@ -167,47 +429,171 @@ TIFF_TYPES: dict[bytes, tuple[Struct, Struct, int, Struct]] = {
     b"II+\0": (Struct("<Q"), Struct("<Q"), 20, Struct("<H")),
     b"MM\0+": (Struct(">Q"), Struct(">Q"), 20, Struct(">H")),
 }
+# TIFF tags
+IMAGE_DESCRIPTION = 270
+SUB_IFDS = 330
+# size of the (offset) values of a SubIFDs tag, by TIFF data type
+_OFFSET_TYPES = {4: "I", 13: "I", 16: "Q", 18: "Q"}
+# how OME-XML is recognized among image descriptions
+_OME_MARKER = b"openmicroscopy.org/Schemas/"
 
 
-def _unpack(fh: BinaryIO, strct: Struct) -> int:
-    return strct.unpack(fh.read(strct.size))[0]
+@overload
+def tiff2xml(
+    path: Path | str | BinaryIO, *, use_mmap: Literal[False] = ...
+) -> bytes: ...
 
 
-def tiff2xml(path: Path | str | BinaryIO) -> bytes:
-    """Extract the OME-XML from a TIFF file."""
-    if hasattr(path, "read"):
-        ctx: AbstractContextManager[BinaryIO] = nullcontext(path)  # type: ignore[arg-type]
-    else:
-        ctx = Path(path).open(mode="rb")
+@overload
+def tiff2xml(path: Path | str | BinaryIO, *, use_mmap: Literal[True]) -> memoryview: ...
 
-    with ctx as fh:
-        head = fh.read(4)
-        if head not in TIFF_TYPES:  # pragma: no cover
-            raise ValueError(f"{path!r} does not have a recognized TIFF header")
-
-        offset_fmt, tagno_fmt, tagsize, codeformat = TIFF_TYPES[head]
-        offset_size = offset_fmt.size
-        offset_size_4 = offset_size + 4
-
-        if offset_size == 8:
-            fh.seek(4, 1)
-        fh.seek(_unpack(fh, offset_fmt))
-        for _ in range(_unpack(fh, tagno_fmt)):
-            tagstruct = fh.read(tagsize)
-            if codeformat.unpack(tagstruct[:2])[0] == 270:
-                size = offset_fmt.unpack(tagstruct[4:offset_size_4])[0]
-                if size <= offset_size:
-                    desc = tagstruct[offset_size_4 : offset_size_4 + size]
-                    break
-                fh.seek(offset_fmt.unpack(tagstruct[-offset_size:])[0])
-                desc = fh.read(size)
-                break
-        else:  # pragma: no cover
-            raise ValueError(f"No OME metadata found in file: {path}")
-
-    if desc[-1] == 0:
-        desc = desc[:-1]  # pragma: no cover
-    return desc
+
+@overload
+def tiff2xml(path: Path | str | BinaryIO, *, use_mmap: bool) -> bytes | memoryview: ...
+
+
+def tiff2xml(
+    path: Path | str | BinaryIO, *, use_mmap: bool = False
+) -> bytes | memoryview:
+    """Extract the OME-XML from a TIFF file.
+
+    All IFDs (including SubIFDs) are searched for an ImageDescription containing
+    OME-XML. If there is none, the first ImageDescription is returned.
+
+    Parameters
+    ----------
+    path : Path | str | BinaryIO
+        Path to a TIFF file or a file-like object.
+    use_mmap : bool
+        If True, the file is memory-mapped, and a `memoryview` of the OME-XML is
+        returned without copying it (or reading anything else than the TIFF
+        headers). The file stays mapped as long as the `memoryview` is alive.
+        File-like objects that are not backed by a file are read as usual.
+
+    Returns
+    -------
+    bytes | memoryview
+        The OME-XML (without any trailing NUL byte).
+    """
+    if use_mmap:
+        mm = None
+        # (ValueError: empty files can't be mapped, and are read as usual, so that
+        # the error does not depend on `use_mmap`)
+        with suppress(AttributeError, OSError, ValueError):
+            mm = _mmap_file(path)
+        if mm is not None:
+            offset, size = _find_tiff_xml(partial(_read_mmap, mm), path)
+            return memoryview(mm)[offset : offset + size]
+
+    with _open_tiff(path) as fh:
+        offset, size = _find_tiff_xml(partial(_read_file, fh), path)
+        desc = _read_file(fh, offset, size)
+    return memoryview(desc) if use_mmap else desc
+
+
+def tiff_xml_offset(path: Path | str | BinaryIO) -> tuple[int, int]:
+    """Return the byte offset and size of the OME-XML in a TIFF file.
+
+    This can be used to (re-)read just the OME-XML later on, e.g.
+    `fh.seek(offset); xml = fh.read(size)`.  See [`ome_types.tiff2xml`][].
+    """
+    with _open_tiff(path) as fh:
+        return _find_tiff_xml(partial(_read_file, fh), path)
+
+
+def _open_tiff(path: Path | str | BinaryIO) -> AbstractContextManager[BinaryIO]:
+    if hasattr(path, "read"):
+        return nullcontext(path)  # type: ignore[arg-type]
+    return Path(path).open(mode="rb")
+
+
+def _mmap_file(path: Path | str | BinaryIO) -> mmap.mmap:
+    """Memory-map a file (raises OSError, AttributeError or ValueError if it fails)."""
+    if not isinstance(path, (str, Path)):
+        return mmap.mmap(path.fileno(), 0, access=mmap.ACCESS_READ)
+    with Path(path).open(mode="rb") as fh:
+        # (the mapping stays valid after the file is closed)
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _read_file(fh: BinaryIO, offset: int, size: int) -> bytes:
+    fh.seek(offset)
+    return fh.read(size)
+
+
+def _read_mmap(mm: mmap.mmap, offset: int, size: int) -> bytes:
+    return mm[offset : offset + size]
+
+
+def _find_tiff_xml(
+    read: Callable[[int, int], bytes], path: Path | str | BinaryIO
+) -> tuple[int, int]:
+    """Return (offset, size) of the OME-XML ImageDescription in a TIFF file."""
+    head = read(0, 4)
+    if head not in TIFF_TYPES:
+        raise ValueError(f"{path!r} does not have a recognized TIFF header")
+
+    first = None
+    for offset, size in _iter_descriptions(read, head):
+        if read(offset + size - 1, 1) == b"\0":
+            size -= 1
+        # the OME namespace is declared right at the start of the document
+        if _OME_MARKER in read(offset, min(size, SNIFF_SIZE)):
+            return offset, size
+        first = first or (offset, size)
+    if first is None:  # pragma: no cover
+        raise ValueError(f"No OME metadata found in file: {path}")
+    return first
+
+
+def _iter_descriptions(
+    read: Callable[[int, int], bytes], head: bytes
+) -> Iterator[tuple[int, int]]:
+    """Yield (offset, size) of the ImageDescription tag of every IFD and SubIFD."""
+    offset_fmt, tagno_fmt, tagsize, codeformat = TIFF_TYPES[head]
+    byteorder = offset_fmt.format[0]
+    offset_size = offset_fmt.size
+    offset_size_4 = offset_size + 4
+
+    first_ifd = offset_fmt.unpack(read(8 if offset_size == 8 else 4, offset_size))[0]
+    pending = [first_ifd]
+    seen: set[int] = set()
+    while pending:
+        ifd = pending.pop(0)
+        if not ifd or ifd in seen:
+            continue
+        seen.add(ifd)
+
+        ntags = tagno_fmt.unpack(read(ifd, tagno_fmt.size))[0]
+        start = ifd + tagno_fmt.size
+        tags = read(start, ntags * tagsize)
+        for pos in range(0, ntags * tagsize, tagsize):
+            tagstruct = tags[pos : pos + tagsize]
+            code = codeformat.unpack(tagstruct[:2])[0]
+            if code not in (IMAGE_DESCRIPTION, SUB_IFDS):
+                continue
+            count = offset_fmt.unpack(tagstruct[4:offset_size_4])[0]
+            if code == IMAGE_DESCRIPTION:
+                nbytes = count
+            else:
+                dtype = codeformat.unpack(tagstruct[2:4])[0]
+                value_fmt = f"{byteorder}{count}{_OFFSET_TYPES.get(dtype, 'I')}"
+                nbytes = Struct(value_fmt).size
+            if nbytes <= offset_size:
+                # the value is stored in the tag itself
+                value_offset = start + pos + offset_size_4
+            else:
+                value_offset = offset_fmt.unpack(tagstruct[-offset_size:])[0]
+
+            if code == IMAGE_DESCRIPTION:
+                if nbytes:
+                    yield value_offset, nbytes
+            else:
+                pending.extend(Struct(value_fmt).unpack(read(value_offset, nbytes)))
+
+        next_ifd = read(start + ntags * tagsize, offset_size)
+        if len(next_ifd) == offset_size:
+            pending.append(offset_fmt.unpack(next_ifd)[0])
 
 
 # ------------------------
@@ -284,6 +670,116 @@ def to_xml(
     str
         The XML document as a string.
     """
+    config = _serializer_config(
+        exclude_defaults=exclude_defaults,
+        exclude_unset=exclude_unset,
+        indent=indent,
+        include_schema_location=include_schema_location,
+        canonicalize=canonicalize,
+    )
+    from ome_types._context import default_context
+
+    # (a shared context, so that serialization plans are built once per process)
+    context = default_context()
+    if canonicalize:
+        from ome_types._xml_writers import CanonicalXmlWriter
+
+        # the writer reproduces, byte for byte, the output of
+        # `ET.canonicalize(xml, strip_text=True)` pretty-printed by minidom
+        serializer = XmlSerializer(
+            config=config, context=context, writer=CanonicalXmlWriter
+        )
+    else:
+        serializer = XmlSerializer(config=config, context=context)
+    # NOTE: with exclude_unset, the serializer takes care of updating
+    # `model_fields_set` of each object (for fields that pydantic can't know have
+    # been set, like mutated lists) as it renders it.
+    xml = serializer.render(obj, ns_map=_ns_map(include_namespace, canonicalize))
+
+    if validate:
+        validate_xml(xml)
+    return xml
+
+
+def to_xml_stream(
+    obj: OMEType,
+    dest: Path | str | BinaryIO,
+    *,
+    exclude_defaults: bool = False,
+    exclude_unset: bool = True,
+    indent: int = 2,
+    include_namespace: bool | None = None,
+    include_schema_location: bool = True,
+    canonicalize: bool = False,
+) -> None:
+    """Write an XML document for an OME object to a file, as it is generated.
+
+    Unlike `to_xml`, the document is never held in memory as a whole: it is encoded
+    (as UTF-8) and written in chunks as the object is serialized.  The output is
+    identical to `to_xml(obj, ...).encode()`.
+
+    Parameters
+    ----------
+    obj : OMEType
+        Instance of an ome-types model class.
+    dest : Path | str | BinaryIO
+        Path to the output file, or a writable binary file-like object (e.g. an open
+        file, or `socket.makefile("wb")`).  File-like objects are not closed.
+    exclude_defaults : bool, optional
+        Whether to exclude attributes that are set to their default value,
+        by default False.
+    exclude_unset : bool, optional
+        Whether to exclude attributes that are not explicitly set,
+        by default True.
+    indent : int, optional
+        Number of spaces to indent the XML document, by default 2.
+    include_namespace : bool | None, optional
+        Whether to include the OME namespace in the root element.  If `None`, will
+        be set to the value of `canonicalize`, by default None.
+    include_schema_location : bool, optional
+        Whether to include the schema location in the root element, by default True.
+    canonicalize : bool, optional
+        Whether to canonicalize the XML output, by default False.
+    """
+    from ome_types._context import default_context
+    from ome_types._xml_writers import (
+        CanonicalXmlWriter,
+        ChunkedWriter,
+        PrettyXmlWriter,
+    )
+
+    serializer = XmlSerializer(
+        config=_serializer_config(
+            exclude_defaults=exclude_defaults,
+            exclude_unset=exclude_unset,
+            indent=indent,
+            include_schema_location=include_schema_location,
+            canonicalize=canonicalize,
+        ),
+        context=default_context(),
+        writer=CanonicalXmlWriter if canonicalize else PrettyXmlWriter,
+    )
+    ns_map = _ns_map(include_namespace, canonicalize)
+
+    ctx: AbstractContextManager[BinaryIO]
+    if hasattr(dest, "write"):
+        ctx = nullcontext(dest)  # type: ignore[arg-type]
+    else:
+        ctx = Path(dest).open(mode="wb")  # type: ignore[arg-type]
+    with ctx as fh:
+        out = ChunkedWriter(fh)
+        serializer.write(cast("TextIO", out), obj, ns_map=ns_map)
+        out.flush()
+
+
+def _serializer_config(
+    *,
+    exclude_defaults: bool,
+    exclude_unset: bool,
+    indent: int,
+    include_schema_location: bool,
+    canonicalize: bool,
+) -> SerializerConfig:
     # xsdata>=24.2
     if hasattr(SerializerConfig, "indent"):
         indent_kwargs: dict = {"indent": " " * indent}
@@ -297,38 +793,16 @@ def to_xml(
         xml_declaration=False,
         ignore_default_attributes=exclude_defaults,
         ignore_unset_attributes=exclude_unset,
-        attribute_sort_key=operator.attrgetter("name") if canonicalize else None,
     )
     if include_schema_location:
         config.schema_location = f"{OME_2016_06_URI} {OME_2016_06_URI}/ome.xsd"
+    return config
 
-    serializer = XmlSerializer(config=config)
+
+def _ns_map(include_namespace: bool | None, canonicalize: bool) -> dict:
     if include_namespace is None:
         include_namespace = canonicalize
-
-    if exclude_unset:
-        # if we're excluding unset attributes, we need to be very careful that the
-        # __fields_set__ attribute is accurate, otherwise we'll exclude attributes
-        # this is tricky for things like mutable sequences that pydantic doesn't
-        # know about. this method recurses the object and updates the __fields_set__
-        # attribute if the field is not equal to its default value
-        obj._update_set_fields()
-
-    ns_map = {"ome" if include_namespace else None: OME_2016_06_URI}
-    xml = serializer.render(obj, ns_map=ns_map)
-
-    if canonicalize:
-        xml = _canonicalize(xml, indent=" " * indent)
-    if validate:
-        validate_xml(xml)
-    return xml
-
-
-def _canonicalize(xml: str, indent: str) -> str:
-    from xml.dom import minidom
-
-    xml_out = ET.canonicalize(xml, strip_text=True)
-    return minidom.parseString(xml_out).toprettyxml(indent=indent)
+    return {"ome" if include_namespace else None: OME_2016_06_URI}
 
 
 # ------------------------
@@ -363,11 +837,11 @@ def validate_xml_with_lxml(
     xml: XMLSource, schema: Path | str | None = None, warn_on_schema_update: bool = True
 ) -> AnyElementTree:
     """Validate XML against an XML Schema using lxml."""
-    from lxml import etree
-
+    # (raises ImportError if lxml is not installed)
+    xmlschema = _get_lxml_schema(schema or OME_2016_06_XSD)
     tree = ensure_2016(xml, warn_on_schema_update=warn_on_schema_update, as_tree=True)
-    xmlschema = etree.XMLSchema(etree.parse(schema or OME_2016_06_XSD))
 
+    # (the schema belongs to this thread, so its error_log is this validation's)
     if not xmlschema.validate(cast("ET._ElementTree", tree)):
         msg = f"Validation of {str(xml)[:20]!r} failed:"
         for error in xmlschema.error_log:
@@ -391,6 +865,69 @@ def validate_xml_with_xmlschema(
     return tree
 
 
+# compiled lxml schemas, keyed by schema location.
+# lxml validates without holding the GIL, and keeps the errors of the last validation
+# on the schema object, so (as for XSLT transformers) the cache is per-thread.  The
+# caches of all threads are dropped when the generation changes (see
+# clear_schema_cache).
+_LXML_SCHEMAS = threading.local()
+_LXML_SCHEMAS_GENERATION = 0
+
+
+def _schema_key(schema: Path | str) -> str:
+    schema = os.fspath(schema)
+    return os.path.abspath(schema) if os.path.exists(schema) else schema
+
+
+def _lxml_schemas() -> dict[str, etree.XMLSchema]:
+    """Return the lxml schemas compiled by the current thread."""
+    local = _LXML_SCHEMAS.__dict__
+    if local.get("generation") != _LXML_SCHEMAS_GENERATION:
+        local["generation"] = _LXML_SCHEMAS_GENERATION
+        local["cache"] = {}
+    return cast("dict[str, etree.XMLSchema]", local["cache"])
+
+
+def _get_lxml_schema(schema: Path | str) -> etree.XMLSchema:
+    """Return a compiled (and cached) lxml XMLSchema for `schema`."""
+    from lxml import etree
+
+    cache = _lxml_schemas()
+    key = _schema_key(schema)
+    if key not in cache:
+        cache[key] = etree.XMLSchema(etree.parse(key))
+    return cache[key]
+
+
+def warm_schema_cache(schema: Path | str | None = None) -> None:
+    """Compile and cache an XML schema, so that the first `validate_xml` is fast.
+
+    Schemas are compiled lazily the first time they are used for validation, and
+    are then reused until `clear_schema_cache` is called.  Call this (e.g. at
+    application startup) to pay the compilation cost up front.  With lxml, compiled
+    schemas are cached per thread (so that threads validate in parallel): call this
+    in each thread that will validate documents, e.g. as the `initializer` of a
+    `ThreadPoolExecutor`.
+
+    Parameters
+    ----------
+    schema : Path | str | None
+        The schema to compile.  By default, the OME 2016-06 schema.
+    """
+    schema = schema or OME_2016_06_XSD
+    try:
+        _get_lxml_schema(schema)
+    except ImportError:  # pragma: no cover
+        _get_XMLSchema(schema)
+
+
+def clear_schema_cache() -> None:
+    """Clear all compiled XML schemas cached by `validate_xml` (in all threads)."""
+    global _LXML_SCHEMAS_GENERATION
+    _LXML_SCHEMAS_GENERATION += 1
+    _get_XMLSchema.cache_clear()
+
+
 @cache
 def _get_XMLSchema(schema: Path | str) -> xmlschema.XMLSchema:
     import xmlschema
@@ -461,53 +998,107 @@ def ensure_2016(
         If lxml is not installed and a transformation is required.
     """
     normed_source = _normalize(source)
-    try:
-        ns_in = _get_ns_file(normed_source)
-    except Exception as e:
-        raise ValueError(f"Could not parse XML from {source!r}") from e
+    with _open_source(normed_source) as fh:
+        try:
+            head, ns_in = _sniff_namespace(fh)
+        except Exception as e:
+            raise ValueError(f"Could not parse XML from {source!r}") from e
+
+        if ns_in == OME_2016_06_URI and not as_tree:
+            # nothing to do, just hand back the (rewound) source
+            if hasattr(normed_source, "seek"):
+                normed_source.seek(0)
+            return normed_source
 
-    # catch rare case of OME-XML with lowercase ome in namespace
-    if "Schemas/ome/" in ns_in:
-        normed_source = _capitalize_ome(normed_source)
-        ns_in = _get_ns_file(normed_source)
+        # the sniffed prefix is replayed to the parser: each byte is read only once
+        chunks: Iterable[bytes] = chain([head], iter(partial(fh.read, READ_SIZE), b""))
 
-    if hasattr(normed_source, "seek"):
-        normed_source.seek(0)
+        # catch rare case of OME-XML with lowercase ome in namespace
+        if "Schemas/ome/" in ns_in:
+            chunks = _capitalize_ome(chunks)
+            ns_in = ns_in.replace("Schemas/ome/", "Schemas/OME/")
+            if ns_in == OME_2016_06_URI and not as_tree:
+                return io.BytesIO(b"".join(chunks))
+
+        if ns_in != OME_2016_06_URI and ns_in not in TRANSFORMS:
+            raise ValueError(f"Unsupported document namespace {ns_in!r}")
+
+        tree = _parse_chunks(chunks)
 
     if ns_in == OME_2016_06_URI:
-        if as_tree:
-            return ET.parse(normed_source)
-        return normed_source
-
-    if ns_in in TRANSFORMS:
-        tree = ET.parse(normed_source)
-        ns = ns_in
-        while ns in TRANSFORMS:
-            tree = _apply_xslt(tree, TRANSFORMS[ns])
-            ns = _get_ns_elem(tree)
-        if warn_on_schema_update:
-            warnings.warn(
-                f"Transformed source from {ns_in!r} to {OME_2016_06_URI!r}",
-                stacklevel=2,
-            )
+        return tree
+
+    ns = ns_in
+    while ns in TRANSFORMS:
+        tree = _apply_xslt(tree, TRANSFORMS[ns])
+        ns = _get_ns_elem(tree)
+    if warn_on_schema_update:
+        warnings.warn(
+            f"Transformed source from {ns_in!r} to {OME_2016_06_URI!r}",
+            stacklevel=2,
+        )
+
+    return tree if as_tree else io.BytesIO(ET.tostring(tree, encoding="utf-8"))
 
-        return tree if as_tree else io.BytesIO(ET.tostring(tree, encoding="utf-8"))
 
-    raise ValueError(f"Unsupported document namespace {ns_in!r}")
+# number of bytes initially read from a document to find its root element.
+SNIFF_SIZE = 4096
+# chunk size used when feeding the rest of a document to the parser.
+READ_SIZE = 1 << 20
 
 
-def _capitalize_ome(source: FileLike) -> FileLike:
-    """Fix OME namespace capitalization errors."""
-    if hasattr(source, "read") and hasattr(source, "seek"):
+def _open_source(source: FileLike) -> AbstractContextManager[BinaryIO]:
+    """Open a normalized source for reading, from the start."""
+    if isinstance(source, str):
+        return open(source, "rb")
+    if hasattr(source, "seek"):
         source.seek(0)
-        data = source.read()
-    else:
-        with open(source, "rb") as fh:
-            data = fh.read()
+    return nullcontext(cast("BinaryIO", source))
 
-    io_out = io.BytesIO(data.replace(b"Schemas/ome/", b"Schemas/OME/"))
-    io_out.seek(0)
-    return io_out
+
+def _sniff_namespace(fh: BinaryIO) -> tuple[bytes, str]:
+    """Read just enough of `fh` to determine the namespace of the root element.
+
+    Returns the bytes that were read (so that they can be passed on to the parser)
+    along with the namespace.
+    """
+    sniffer = ET.XMLPullParser(events=("start",))
+    head: list[bytes] = []
+    size = SNIFF_SIZE
+    while True:
+        chunk = fh.read(size)
+        head.append(chunk)
+        if chunk:
+            sniffer.feed(chunk)
+        else:
+            sniffer.close()  # raises if the document is malformed or empty
+        for _, root in sniffer.read_events():
+            return b"".join(head), _get_ns_elem(root)  # type: ignore[arg-type]
+        if not chunk:  # pragma: no cover
+            raise ValueError("Could not find root element")
+        # a long prolog (e.g. big comments): keep reading, in bigger chunks
+        size = min(size * 4, READ_SIZE)
+
+
+def _parse_chunks(chunks: Iterable[bytes]) -> ET._ElementTree:
+    """Parse an XML document from an iterable of byte chunks."""
+    parser = ET.XMLParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return ET.ElementTree(parser.close())
+
+
+def _capitalize_ome(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Fix OME namespace capitalization errors in a stream of chunks."""
+    bad, good = b"Schemas/ome/", b"Schemas/OME/"
+    keep = len(bad) - 1
+    tail = b""
+    for chunk in chunks:
+        data = (tail + chunk).replace(bad, good)
+        # hold back enough bytes to catch a match that spans two chunks
+        tail = data[-keep:]
+        yield data[:-keep]
+    yield tail
 
 
 def _normalize(source: XMLSource) -> FileLike:
@@ -515,7 +1106,7 @@ def _normalize(source: XMLSource) -> FileLike:
 
     Parameters
     ----------
-    source : Path | str | bytes | io.BytesIO
+    source : Path | str | bytes | memoryview | io.BytesIO
         Path to an XML file, string or bytes containing XML, or a file-like object.
 
     Returns
@@ -529,7 +1120,7 @@ def _normalize(source: XMLSource) -> FileLike:
         if os.path.isfile(source):
             return source
         return io.BytesIO(source.encode())
-    elif isinstance(source, bytes):
+    elif isinstance(source, (bytes, memoryview)):
         return io.BytesIO(source)
     elif isinstance(source, io.BufferedIOBase):
         return source
@@ -542,7 +1133,7 @@ def _normalize(source: XMLSource) -> FileLike:
 def _apply_xslt(root: ET._ElementTree, xslt_path: str | Path) -> _XSLTResultTree:
     """Apply an XSLT transform to an element or element tree."""
     try:
-        from lxml import etree
+        import lxml  # noqa: F401
     except ImportError:  # pragma: no cover
         ns = _get_ns_elem(root)
         raise ImportError(
@@ -551,9 +1142,23 @@ def _apply_xslt(root: ET._ElementTree, xslt_path: str | Path) -> _XSLTResultTree
             "Please run `pip install lxml`"
         ) from None
 
-    # Create a transformer object
-    transformer = etree.XSLT(ET.parse(xslt_path))
-    return transformer(root)
+    return _get_xslt(xslt_path)(root)
+
+
+# compiled XSLT transformers, keyed by stylesheet path.
+# lxml XSLT objects should not be shared between threads, so the cache is per-thread.
+_XSLT_CACHE = threading.local()
+
+
+def _get_xslt(xslt_path: str | Path) -> etree.XSLT:
+    """Return a compiled (and cached) XSLT transformer for `xslt_path`."""
+    from lxml import etree
+
+    cache: dict[str, etree.XSLT] = _XSLT_CACHE.__dict__.setdefault("cache", {})
+    key = str(xslt_path)
+    if key not in cache:
+        cache[key] = etree.XSLT(etree.parse(key))
+    return cache[key]
 
 
 # ------------------------
@@ -568,14 +1173,6 @@ def _get_ns_elem(elem: ET._Element | AnyElementTree) -> str:
     return ""
 
 
-def _get_ns_file(source: FileLike) -> str:
-    """Get namespace from a file or file-like object."""
-    if hasattr(source, "seek"):
-        source.seek(0)
-    _, root = next(ET.iterparse(source, events=("start",)))
-    return _get_ns_elem(root)  # type: ignore[arg-type]
-
-
 def _get_root_ome_type(xml: FileLike | AnyElementTree) -> type[OMEType]:
     """Resolve a ome_types.model class for the root element of an OME XML document."""
     from ome_types import model
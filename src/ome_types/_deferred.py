@@ -0,0 +1,129 @@
+"""Parsing with deferred or skipped payloads.
+
+See `from_xml(..., defer=..., skip=...)`.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import replace
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from ome_types._mixins._payload import PayloadMixin, base64_loader
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from pydantic import BaseModel
+
+__all__ = ["PAYLOADS", "PayloadParser"]
+
+# the types whose payload can be deferred or skipped, and the elements they are in
+PAYLOADS = {
+    "BinData": ("Pixels", "BinaryFile", "Mask"),
+    "XMLAnnotation": ("StructuredAnnotations",),
+}
+
+
+class PayloadParser:
+    """Wraps a parser, to defer or skip the payload of `BinData` and `XMLAnnotation`.
+
+    The payloads (the text of `BinData` elements and the contents of the `Value` of
+    `XMLAnnotation` elements) are removed from the tree before it is parsed (so the
+    tree is modified), and handed to the objects created for these elements, which
+    are created in document order.
+
+    Parameters
+    ----------
+    parser : Any
+        The parser to wrap.  Its config is modified.
+    defer : Collection[str]
+        Names of the types whose payload is loaded on first access.
+    skip : Collection[str]
+        Names of the types whose payload is discarded: `BinData.value` is empty, and
+        `XMLAnnotation.value` has no elements.
+    """
+
+    def __init__(
+        self, parser: Any, defer: Collection[str] = (), skip: Collection[str] = ()
+    ) -> None:
+        if unknown := (set(defer) | set(skip)) - set(PAYLOADS):
+            raise ValueError(
+                f"Cannot defer or skip {sorted(unknown)}. Supported types are: "
+                f"{sorted(PAYLOADS)}"
+            )
+        self.parser = parser
+        self.defer = set(defer) - set(skip)
+        self.skip = set(skip)
+        self._factory = parser.config.class_factory
+        parser.config = replace(parser.config, class_factory=self._class_factory)
+        # the payloads of the elements, in document order, until their object is built
+        self._pending: dict[str, deque[Any]] = {name: deque() for name in PAYLOADS}
+
+    def parse(self, source: Any, clazz: type) -> Any:
+        root = source.getroot() if hasattr(source, "getroot") else source
+        tag = root.tag if isinstance(root.tag, str) else ""
+        ns = tag[: tag.index("}") + 1] if tag.startswith("{") else ""
+
+        try:
+            # (XML annotations first: their contents may be anything, even BinData)
+            if "XMLAnnotation" in self.defer | self.skip:
+                for elem in _iter_payload_elements(root, ns, "XMLAnnotation"):
+                    value = elem.find(f"{ns}Value")
+                    if value is None:  # pragma: no cover
+                        continue
+                    # the contents are moved to a detached Value element
+                    detached = value.makeelement(value.tag, value.attrib)
+                    detached.text = value.text
+                    detached.extend(list(value))
+                    value.text = None
+                    value[:] = []
+                    self._pending["XMLAnnotation"].append(detached)
+            if "BinData" in self.defer | self.skip:
+                defer = "BinData" in self.defer
+                for elem in _iter_payload_elements(root, ns, "BinData"):
+                    # (the text is only copied out of the tree if it is needed)
+                    self._pending["BinData"].append(elem.text if defer else None)
+                    elem.text = ""
+            return self.parser.parse(source, clazz)
+        finally:
+            for pending in self._pending.values():
+                pending.clear()
+
+    def _class_factory(self, cls: type[BaseModel], params: dict[str, Any]) -> Any:
+        obj = self._factory(cls, params)
+        if isinstance(obj, PayloadMixin):
+            name = cls.__name__
+            pending = self._pending.get(name)
+            if pending:
+                payload = pending.popleft()
+                if name in self.defer:
+                    self._defer(obj, name, payload)
+        return obj
+
+    def _defer(self, obj: PayloadMixin, name: str, payload: Any) -> None:
+        if name == "BinData":
+            if payload is not None and payload.strip():
+                obj._defer(base64_loader(payload))
+        elif len(payload):
+            # (with the wrapped parser, as the payload has already been removed)
+            value_type = type(obj).model_fields["value"].annotation
+            obj._defer(partial(self.parser.parse, payload, value_type))
+
+
+def _iter_payload_elements(root: Any, ns: str, name: str) -> list[Any]:
+    """Return the elements of type `name` that are children of their parent types.
+
+    (So that elements with the same tag in the contents of XML annotations are not
+    included.)
+    """
+    tag = f"{ns}{name}"
+    parents = {f"{ns}{parent}" for parent in PAYLOADS[name]}
+    return [
+        child
+        for elem in root.iter()
+        if elem.tag in parents
+        for child in elem
+        if child.tag == tag
+    ]
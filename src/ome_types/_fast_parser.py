@@ -0,0 +1,172 @@
+"""A fast, direct element-tree to model parser.
+
+xsdata's `XmlParser` binds documents through a generic, event driven machinery
+that looks up (and re-derives) class metadata for every element it visits.  The OME
+schema is very regular though, so here we precompute a small table for each model
+class (mapping attribute and child element names to fields) once, and then build
+models by walking an already-parsed element tree directly.
+
+Classes that can hold arbitrary XML content (i.e. those with wildcard fields, like
+`XMLAnnotation.Value`) are delegated to the regular xsdata parser.
+"""
+
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from xsdata.exceptions import ParserError
+from xsdata.formats.dataclass.parsers.config import ParserConfig
+from xsdata.formats.dataclass.parsers.utils import ParserUtils
+from xsdata.models.enums import Namespace
+from xsdata.utils.namespaces import target_uri
+
+from ome_types._context import default_context
+from xsdata_pydantic_basemodel.bindings import XmlContext, XmlParser
+
+if TYPE_CHECKING:
+    from typing import TypeVar
+
+    from xsdata.formats.dataclass.models.elements import XmlMeta, XmlVar
+
+    T = TypeVar("T")
+
+__all__ = ["FastXmlParser"]
+
+_XSI_NS = f"{{{Namespace.XSI.uri}}}"
+
+
+class _Entry(NamedTuple):
+    """How to bind one attribute, child element, or text of a class."""
+
+    name: str
+    var: XmlVar
+    # plain strings need no conversion at all
+    is_str: bool
+
+
+class _ClassPlan(NamedTuple):
+    """Precomputed binding table for a model class."""
+
+    meta: XmlMeta
+    attributes: dict[str, _Entry]
+    elements: dict[str, _Entry]
+    text: _Entry | None
+    # whether this class must be handed to the generic xsdata parser
+    delegate: bool
+
+
+def _entry(var: XmlVar) -> _Entry:
+    is_str = var.types == (str,) and not var.tokens and not var.format
+    return _Entry(var.name, var, is_str)
+
+
+def _build_plan(meta: XmlMeta) -> _ClassPlan:
+    elements: dict[str, _Entry] = {}
+    for qname, vars_ in meta.elements.items():
+        # with compound fields disabled, each qname maps to a single field
+        if len(vars_) == 1 and not vars_[0].is_clazz_union:
+            elements[qname] = _entry(vars_[0])
+    delegate = bool(
+        meta.wildcards
+        or meta.any_attributes
+        or meta.choices
+        or meta.wrappers
+        or len(elements) != len(meta.elements)
+    )
+    return _ClassPlan(
+        meta=meta,
+        attributes={qname: _entry(var) for qname, var in meta.attributes.items()},
+        elements=elements,
+        text=_entry(meta.text) if meta.text else None,
+        delegate=delegate,
+    )
+
+
+# binding tables, per context, per class
+_PLANS: weakref.WeakKeyDictionary[
+    XmlContext, dict[tuple[type, str | None], _ClassPlan]
+] = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class FastXmlParser:
+    """Build ome-types models directly from an lxml (or ElementTree) element tree.
+
+    This is a drop-in replacement for `XmlParser.parse` when the source has already
+    been parsed into an element tree, and produces identical objects.
+    """
+
+    config: ParserConfig = field(default_factory=ParserConfig)
+    context: XmlContext = field(default_factory=default_context)
+
+    def __post_init__(self) -> None:
+        self._plans = _PLANS.setdefault(self.context, {})
+
+    def parse(self, source: Any, clazz: type[T]) -> T:
+        """Parse an element or element tree into an instance of `clazz`."""
+        root = source.getroot() if hasattr(source, "getroot") else source
+        namespace = target_uri(root.tag) or None
+        return self._build(root, clazz, namespace)  # type: ignore[no-any-return]
+
+    def _plan(self, clazz: type, namespace: str | None) -> _ClassPlan:
+        # (nested classes inherit the namespace of their parent element)
+        key = (clazz, namespace)
+        try:
+            return self._plans[key]
+        except KeyError:
+            meta = self.context.build(clazz, namespace)
+            plan = self._plans[key] = _build_plan(meta)
+            return plan
+
+    def _convert(self, meta: XmlMeta, entry: _Entry, value: str | None) -> Any:
+        if entry.is_str and value is not None:
+            return value
+        return ParserUtils.parse_var(
+            meta=meta, var=entry.var, config=self.config, value=value
+        )
+
+    def _build(self, elem: Any, clazz: type, namespace: str | None) -> Any:
+        plan = self._plan(clazz, namespace)
+        if plan.delegate:
+            return XmlParser(config=self.config, context=self.context).parse(
+                elem, clazz
+            )
+
+        meta = plan.meta
+        config = self.config
+        params: dict[str, Any] = {}
+
+        for qname, value in elem.attrib.items():
+            if entry := plan.attributes.get(qname):
+                params[entry.name] = self._convert(meta, entry, value)
+            elif config.fail_on_unknown_attributes and not qname.startswith(_XSI_NS):
+                raise ParserError(f"Unknown attribute {meta.qname}:{qname}")
+
+        for child in elem:
+            tag = child.tag
+            if not isinstance(tag, str):
+                continue  # comments and processing instructions
+            entry = plan.elements.get(tag)
+            if entry is not None and (
+                entry.var.list_element or entry.name not in params
+            ):
+                var = entry.var
+                if var.clazz is not None:
+                    value = self._build(child, var.clazz, meta.namespace)
+                else:
+                    value = self._convert(meta, entry, child.text)
+                    if value is None and not var.nillable:
+                        value = b"" if bytes in var.types else ""
+                if var.list_element:
+                    params.setdefault(entry.name, []).append(value)
+                else:
+                    params[entry.name] = value
+            elif config.fail_on_unknown_properties:
+                raise ParserError(f"Unknown property {meta.qname}:{tag}")
+
+        if plan.text is not None and elem.text is not None:
+            params[plan.text.name] = self._convert(meta, plan.text, elem.text)
+
+        return config.class_factory(clazz, params)
@@ -0,0 +1,247 @@
+"""Content digests of OME objects, computed without rendering XML.
+
+The digest is computed from the same event stream that the XML serializer emits
+(so it follows the same `exclude_defaults` / `exclude_unset` semantics), but the
+events are fed straight into a hasher, in a normalized form that mirrors canonical
+XML: attributes are sorted, and whitespace around text is stripped (except where
+`xml:space="preserve"` applies).
+
+The digest of each nested model is computed separately, and memoized on the object
+itself.  The memo is dropped when a field of the object is assigned, and is only
+reused if the contents of its list fields haven't changed (and the digests of its
+children are still the same), so only modified subtrees are re-hashed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from operator import is_
+from typing import TYPE_CHECKING, Any
+
+from xsdata.formats.converter import converter
+from xsdata.formats.dataclass.serializers.mixins import XmlWriterEvent
+
+from ome_types._context import default_context
+from ome_types._mixins._base_type import OMEType
+from ome_types._mixins._util import is_columnar
+from xsdata_pydantic_basemodel.bindings import SerializerConfig, XmlSerializer
+from xsdata_pydantic_basemodel.compat import AnyElement, DerivedElement
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    # a list field, its items, and the state of any generic XML elements in it
+    _ListState = tuple[list, tuple, Any]
+
+__all__ = ["fingerprint"]
+
+# marker event for a nested model, standing in for its (separately hashed) events
+_CHILD = "child"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+class _Record:
+    """The memoized digest of one object (for one set of options)."""
+
+    __slots__ = ("children", "digest", "lists")
+
+    def __init__(
+        self,
+        digest: bytes,
+        lists: tuple[_ListState, ...],
+        children: list[tuple[OMEType, str | None, bytes]],
+    ) -> None:
+        self.digest = digest
+        # the list fields of the object, with their items (and the contents of
+        # generic XML elements) at hashing time
+        self.lists = lists
+        # nested models, with the namespace they were hashed with, and their digest
+        self.children = children
+
+
+@dataclass
+class _FingerprintSerializer(XmlSerializer):
+    """Serializer that emits a placeholder event for each nested model."""
+
+    def convert_dataclass(
+        self,
+        obj: Any,
+        namespace: str | None = None,
+        qname: str | None = None,
+        nillable: bool = False,
+        xsi_type: str | None = None,
+    ) -> Generator:
+        yield _CHILD, obj, namespace, qname, nillable, xsi_type
+
+    def digest(self, obj: Any, namespace: str | None) -> bytes:
+        """Return the (possibly memoized) digest of `obj`."""
+        key = (
+            self.config.ignore_default_attributes,
+            getattr(self.config, "ignore_unset_attributes", False),
+            namespace,
+        )
+        records = _get_records(obj) if isinstance(obj, OMEType) else None
+        if records and (record := records.get(key)) and self._is_valid(record):
+            return record.digest
+
+        digest, children = self._hash(obj, namespace)
+        if isinstance(obj, OMEType) and (lists := _snapshot(obj)) is not None:
+            if records is None:
+                records = {}
+                object.__setattr__(obj, _SLOT, records)
+            records[key] = _Record(digest, lists, children)
+        return digest
+
+    def _is_valid(self, record: _Record) -> bool:
+        for lst, items, state in record.lists:
+            if len(lst) != len(items) or not all(map(is_, lst, items)):
+                return False
+            if state is not None and _element_state(lst) != state:
+                return False
+        return all(
+            self.digest(child, namespace) == digest
+            for child, namespace, digest in record.children
+        )
+
+    def _hash(
+        self, obj: Any, namespace: str | None
+    ) -> tuple[bytes, list[tuple[OMEType, str | None, bytes]]]:
+        """Hash the events of `obj`, using the digests of its nested models."""
+        hasher = hashlib.sha256()
+        update = hasher.update
+        children: list[tuple[OMEType, str | None, bytes]] = []
+        attrs: list[tuple[str, str]] = []
+        text: list[str] = []
+        preserve = [False]
+
+        def flush_attrs() -> None:
+            space = preserve[-1]
+            for key, value in sorted(attrs):
+                update(b"@%s\0%s\0" % (key.encode(), value.encode()))
+                if key == _XML_SPACE:
+                    space = value == "preserve"
+            preserve.append(space)
+            attrs.clear()
+
+        def flush_text() -> None:
+            data = "".join(text)
+            if not preserve[-1]:
+                data = data.strip()
+            if data:
+                update(b"#%s\0" % data.encode())
+            text.clear()
+
+        # (the base class produces the events of the object itself)
+        events = XmlSerializer.convert_dataclass(self, obj, namespace)
+        in_start = False
+        for event, *args in events:
+            if event == XmlWriterEvent.ATTR:
+                attrs.append((str(args[0]), _encode(args[1]) or ""))
+                continue
+            if in_start:
+                flush_attrs()
+                in_start = False
+            if event == XmlWriterEvent.DATA:
+                if (data := _encode(args[0])) is not None:
+                    text.append(data)
+                continue
+            if text:
+                flush_text()
+            if event == XmlWriterEvent.START:
+                update(b"<%s\0" % args[0].encode())
+                in_start = True
+            elif event == XmlWriterEvent.END:
+                update(b">")
+                preserve.pop()
+            else:  # a nested model
+                child, child_ns, qname, nillable, xsi_type = args
+                digest = self.digest(child, child_ns)
+                if isinstance(child, OMEType):
+                    children.append((child, child_ns, digest))
+                update(
+                    b"*%s\0%s\0%d"
+                    % ((qname or "").encode(), (xsi_type or "").encode(), nillable)
+                )
+                update(digest)
+        return hasher.digest(), children
+
+
+def _encode(value: Any) -> str | None:
+    """Encode a value as it would be written to XML (see `EventHandler.encode_data`)."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, list) and not value:
+        return None
+    return converter.serialize(value)
+
+
+_SLOT = "_OMEType__memo"
+
+
+def _get_records(obj: OMEType) -> dict | None:
+    try:
+        return getattr(obj, _SLOT)  # type: ignore[no-any-return]
+    except AttributeError:
+        return None
+
+
+def _snapshot(obj: OMEType) -> tuple[_ListState, ...] | None:
+    """Return the list fields of `obj` with their items, or None if not memoizable.
+
+    Lists of models and of immutable values are tracked by identity.  Arbitrary XML
+    elements (e.g. in an `XMLAnnotation`) are tracked by value.  Objects with any
+    other mutable contents (like columnar containers) can't be tracked, and are
+    always re-hashed.
+    """
+    lists = []
+    for value in obj.__dict__.values():
+        if is_columnar(value):
+            return None
+        if isinstance(value, list):
+            state = None
+            for item in value:
+                if not isinstance(item, OMEType) and type(item).__hash__ is None:
+                    try:
+                        state = _element_state(value)
+                    except TypeError:
+                        return None
+                    break
+            lists.append((value, tuple(value), state))
+    return tuple(lists)
+
+
+def _element_state(value: Any) -> Any:
+    """Return a (comparable) copy of the contents of generic XML elements."""
+    if isinstance(value, list):
+        return tuple(map(_element_state, value))
+    if isinstance(value, AnyElement):
+        return (
+            value.qname,
+            value.text,
+            value.tail,
+            tuple(value.attributes.items()),
+            _element_state(value.children),
+        )
+    if isinstance(value, DerivedElement):
+        return (value.qname, value.type, _element_state(value.value))
+    if isinstance(value, OMEType) or type(value).__hash__ is None:
+        raise TypeError(f"cannot track {type(value)}")
+    return value
+
+
+def fingerprint(
+    obj: OMEType, *, exclude_defaults: bool = False, exclude_unset: bool = True
+) -> str:
+    """Return a stable digest (hex sha256) of the contents of an OME object.
+
+    Two objects have the same fingerprint when their canonical XML (i.e.
+    `to_xml(obj, canonicalize=True)` with the same `exclude_*` options) is the same.
+    See [`OMEType.fingerprint`][ome_types._mixins._base_type.OMEType.fingerprint].
+    """
+    config = SerializerConfig(
+        ignore_default_attributes=exclude_defaults,
+        ignore_unset_attributes=exclude_unset,
+    )
+    serializer = _FingerprintSerializer(config=config, context=default_context())
+    return serializer.digest(obj, None).hex()
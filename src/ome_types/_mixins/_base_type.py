@@ -3,11 +3,12 @@ from collections.abc import Sequence
 from datetime import datetime
 from enum import Enum
 from textwrap import indent
-from typing import TYPE_CHECKING, Any, ClassVar, Optional, TypeVar, cast
+from typing import TYPE_CHECKING, Any, ClassVar, Optional, TypeVar, cast, overload
 
 from pydantic import BaseModel, field_validator
 
 from ome_types._mixins._ids import validate_id
+from ome_types._mixins._tracked import TrackedList, changed, track_lists
 from ome_types._pydantic_compat import field_type, update_set_fields
 
 try:
@@ -16,6 +17,10 @@ except ImportError:
     add_quantity_properties = lambda cls: None  # noqa: E731
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from typing import BinaryIO
+
     from ome_types._conversion import XMLSource
 
 T = TypeVar("T", bound="OMEType")
@@ -79,6 +84,11 @@ class OMEType(BaseModel):
 
     _vid = field_validator("id", mode="before", check_fields=False)(validate_id)
 
+    # memoized data derived from the fields, such as digests (see `fingerprint`),
+    # cleared when a field is assigned (a slot, so that it is neither compared,
+    # copied, nor pickled)
+    __slots__ = ("__memo",)
+
     def __iter__(self) -> Any:
         return super().__iter__()
 
@@ -87,6 +97,7 @@ class OMEType(BaseModel):
         field_names = set(type(self).model_fields)
         _move_deprecated_fields(data, field_names)
         super().__init__(**data)
+        track_lists(self.__dict__)
         if type(self).__name__ == "Map":
             # special escape hack for Map subclass, which can convert any
             # dict into appropriate key-value pairs
@@ -99,6 +110,29 @@ class OMEType(BaseModel):
                 stacklevel=3,
             )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name.startswith("_"):
+            # private attributes (e.g. `Reference._ref`) are not part of the data
+            return
+        values = self.__dict__
+        if type(values.get(name)) is list:
+            values[name] = TrackedList(values[name])
+        object.__setattr__(self, "_OMEType__memo", None)
+        changed()
+
+    def _memo(self) -> dict:
+        """Return the memo of this object (see `__slots__`), creating it if needed."""
+        try:
+            # (through the slot itself: a missing attribute would go to __getattr__)
+            memo = OMEType.__memo.__get__(self)  # type: ignore[attr-defined]
+        except AttributeError:
+            memo = None
+        if memo is None:
+            memo = {}
+            object.__setattr__(self, "_OMEType__memo", memo)
+        return memo
+
     def __init_subclass__(cls) -> None:
         """Add `*_quantity` property for fields that have both a value and a unit.
 
@@ -108,19 +142,34 @@ class OMEType(BaseModel):
 
     def __repr_args__(self) -> Sequence[tuple[Optional[str], Any]]:
         """Repr with only set values, and truncated sequences."""
+        from ome_types._walk import nested_fields
+
+        cls = type(self)
+        # lists of (at least 6) models are truncated without being dumped: their
+        # repr always has more than 5 commas (this is not done for classes that
+        # serialize themselves differently, like `Map`)
+        long: dict[str, int] = {}
+        if not cls.__pydantic_decorators__.model_serializers:
+            for name in nested_fields(cls):
+                value = getattr(self, name)
+                if isinstance(value, Sequence) and len(value) > 5:
+                    long[name] = len(value)
+        dumped = self.model_dump(exclude_defaults=True, exclude=set(long))
         args = []
-        for k, v in self.model_dump(exclude_defaults=True).items():
-            if k == "kind":
+        for k in cls.model_fields if long else dumped:
+            if k in long:
+                args.append((k, _RawRepr(f"[<{long[k]} {_type_name(cls, k)}>]")))
                 continue
+            if k == "kind" or k not in dumped:
+                continue
+            v = dumped[k]
             if isinstance(v, Sequence) and not isinstance(v, str):
                 if v == []:  # skip empty lists
                     continue
                 # if this is a sequence with a long repr, just show the length
                 # and type
                 if len(repr(v).split(",")) > 5:
-                    ftype = field_type(type(self).model_fields[k])
-                    type_name = getattr(field_type, "__name__", str(ftype))
-                    v = _RawRepr(f"[<{len(v)} {type_name}>]")
+                    v = _RawRepr(f"[<{len(v)} {_type_name(cls, k)}>]")
             elif isinstance(v, Enum):
                 v = v.value
             elif isinstance(v, datetime):
@@ -160,6 +209,68 @@ class OMEType(BaseModel):
 
         return to_xml(self, **kwargs)
 
+    def write_xml(self, dest: "Path | str | BinaryIO", **kwargs: Any) -> None:
+        """Write this object as XML to a file, in chunks as it is serialized.
+
+        See docstring of [`ome_types.to_xml_stream`][] for kwargs.
+        """
+        from ome_types._conversion import to_xml_stream
+
+        to_xml_stream(self, dest, **kwargs)
+
+    def fingerprint(
+        self, *, exclude_defaults: bool = False, exclude_unset: bool = True
+    ) -> str:
+        """Return a stable digest (hex sha256) of the contents of this object.
+
+        Two objects have the same fingerprint when their canonical XML (i.e. the
+        output of `to_xml(canonicalize=True)`, with the same `exclude_defaults` and
+        `exclude_unset`) is the same, but no XML is rendered. The digests of nested
+        objects are memoized, so after a modification only the changed subtrees are
+        hashed again.
+        """
+        from ome_types._fingerprint import fingerprint
+
+        return fingerprint(
+            self, exclude_defaults=exclude_defaults, exclude_unset=exclude_unset
+        )
+
+    @overload
+    def walk(
+        self, types: None = ..., *, existing_only: bool = ...
+    ) -> "Iterator[OMEType]": ...
+    @overload
+    def walk(
+        self, types: "type[T] | tuple[type[T], ...]", *, existing_only: bool = ...
+    ) -> "Iterator[T]": ...
+    def walk(
+        self,
+        types: "type | tuple[type, ...] | None" = None,
+        *,
+        existing_only: bool = False,
+    ) -> "Iterator[Any]":
+        """Yield the instances of `types` in this object (including itself).
+
+        The objects are yielded in document order.  Only the fields that may contain
+        instances of `types` (according to the field annotations) are walked.
+
+        Parameters
+        ----------
+        types : type | tuple[type, ...], optional
+            The model class(es) of the objects to yield. By default, all objects.
+        existing_only : bool
+            If True, only walk the objects that already exist: fields that were
+            deferred or lazily loaded (see `from_xml`) are not loaded, and items
+            of columnar containers are not created.  By default, False.
+        """
+        from ome_types._walk import walk
+
+        if types is None:
+            types = (OMEType,)
+        elif not isinstance(types, tuple):
+            types = (types,)
+        return walk(self, types, existing_only=existing_only)
+
     @classmethod
     def from_xml(cls: type[T], xml: "XMLSource", **kwargs: Any) -> T:
         """Read an ome-types class from XML.
@@ -182,8 +293,15 @@ class OMEType(BaseModel):
         a field has been "set" by mutating a sequence.  This method updates the
         `model_fields_set` attribute to reflect that.  We assume that if an attribute
         is not None, and is not equal to the default value, then it has been set.
+        (Nested objects are updated too.)
         """
-        update_set_fields(self)
+        for obj in self.walk(existing_only=True):
+            update_set_fields(obj)
+
+
+def _type_name(cls: type[BaseModel], field_name: str) -> str:
+    ftype = field_type(cls.model_fields[field_name])
+    return getattr(field_type, "__name__", str(ftype))
 
 
 class _RawRepr:
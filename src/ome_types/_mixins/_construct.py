@@ -0,0 +1,87 @@
+"""Construction of model objects without validation, for trusted data."""
+
+from __future__ import annotations
+
+from contextlib import suppress
+from copy import deepcopy
+from enum import Enum
+from functools import cache, partial
+from typing import TYPE_CHECKING, Any, Callable, cast
+
+from ome_types._mixins._ids import _id_plan, id_counter
+from ome_types._mixins._tracked import track_lists
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+__all__ = ["trusted_factory"]
+
+
+def trusted_factory(cls: type[BaseModel], params: dict[str, Any]) -> BaseModel:
+    """Class factory for trusted documents: build models without validation.
+
+    The instance is created with `cls.__new__`, and its `__dict__` (the parsed
+    values, completed with the defaults of the missing fields),
+    `__pydantic_fields_set__` (the parsed fields), `__pydantic_extra__` and
+    `__pydantic_private__` are assigned directly.  Neither `__init__` nor the
+    validators are run (IDs are not normalized, and extra fields are not checked).
+    `params` is used as the `__dict__` of the instance, and is modified in place.
+    """
+    id_name, prepare, defaults = _construct_plan(cls)
+    if id_name is not None and "id" in params:
+        # keep the ID counters up to date, so that IDs generated later don't clash
+        with suppress(ValueError):
+            id_num = int(params["id"].rsplit(":", 1)[-1])
+            counter = id_counter()
+            counter[id_name] = max(counter.get(id_name, -1), id_num)
+    if prepare is not None:
+        prepare(params)
+
+    fields_set = set(params)
+    for name, default, factory in defaults:
+        if name not in params:
+            params[name] = factory() if factory is not None else default
+    track_lists(params)
+
+    # this does what `BaseModel.model_construct` does (for models without aliases
+    # or extra fields), without its per-call overhead of resolving field defaults
+    # (it inspects the signature of every default_factory, on every call)
+    obj = cls.__new__(cls)
+    object.__setattr__(obj, "__dict__", params)
+    object.__setattr__(obj, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(obj, "__pydantic_extra__", None)
+    object.__setattr__(obj, "__pydantic_private__", None)
+    if cls.__pydantic_post_init__:
+        # initializes private attributes
+        obj.model_post_init(None)
+    return obj
+
+
+@cache
+def _construct_plan(
+    cls: type[BaseModel],
+) -> tuple[
+    str | None,
+    Callable[[dict[str, Any]], None] | None,
+    list[tuple[str, Any, Callable[[], Any] | None]],
+]:
+    """Return the construction plan of `cls`.
+
+    That is, the ID name, the `_trusted_params` hook of the class (if any), which
+    completes the params as its "before" validators would, and the (name, default,
+    default_factory) of the optional fields.
+    """
+    id_name = _id_plan(cls)[0] if "id" in cls.model_fields else None
+    prepare = getattr(cls, "_trusted_params", None)
+    defaults = []
+    for name, field in cls.model_fields.items():
+        if field.is_required():
+            continue
+        factory = cast("Callable[[], Any] | None", field.default_factory)
+        if factory is None and not isinstance(field.default, _IMMUTABLE):
+            factory = partial(deepcopy, field.default)
+        defaults.append((name, field.default, factory))
+    return id_name, prepare, defaults
+
+
+_IMMUTABLE = (type(None), str, bytes, int, float, Enum, tuple, frozenset)
@@ -0,0 +1,290 @@
+"""An index of the objects in an OME tree, by ID, by type, and by referenced ID.
+
+See `OME.id_index`, `OME.get_by_id`, `OME.find` and `OME.referrers`.
+
+The index is built in one (iterative) traversal of the tree, and kept up to date
+incrementally: each indexed object is recorded with its memo (see
+`OMEType._memo`, which is replaced when a field of the object is assigned) and the
+items of its list fields.  When the index is used, these are compared (by identity)
+with the current state of the tree, and only the objects that have changed are
+read again.  Their children that were already indexed are reused (and checked in
+turn), new children are indexed, and removed children are dropped from the index.
+
+The comparison is skipped when no object (nor list) has changed since the index
+was last checked (see `ome_types._mixins._tracked`), so that using the index is
+O(1) while the tree is unchanged.
+"""
+
+from __future__ import annotations
+
+from itertools import chain, repeat
+from operator import attrgetter, is_
+from typing import TYPE_CHECKING, Any
+
+from ome_types._mixins._base_type import OMEType
+from ome_types._mixins._tracked import TrackedList, generation
+from ome_types._mixins._util import is_columnar
+from ome_types._walk import link_plan, reachable, walk
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from typing import TypeVar
+
+    T = TypeVar("T", bound=OMEType)
+
+_get_memo = attrgetter("_OMEType__memo")
+# (objects are keyed by identity)
+_key = id
+# the memo of a node whose object hasn't been read yet
+_UNREAD: Any = object()
+
+
+class _Node:
+    """An indexed object, with the state of its fields when it was read."""
+
+    __slots__ = (
+        "children",
+        "columnar",
+        "field",
+        "id",
+        "lists",
+        "memo",
+        "obj",
+        "parent",
+        "target",
+    )
+
+    def __init__(self, obj: OMEType, parent: _Node | None, field: str | None) -> None:
+        self.obj = obj
+        self.parent = parent
+        # the field of the parent that holds the object
+        self.field = field
+        self.memo: Any = _UNREAD
+        self.id: str | None = None
+        # the id of the object that this (reference) object refers to
+        self.target: str | None = None
+        # the list fields of the object, with their items
+        self.lists: tuple[tuple[list, tuple], ...] = ()
+        self.children: Sequence[_Node] = ()
+        # columnar containers in the fields of the object (which hold no IDs)
+        self.columnar: tuple[Any, ...] = ()
+
+    def is_current(self) -> bool:
+        """Return True if the fields of the object haven't changed since it was read."""
+        # (the memo of objects that have been read is always set)
+        if self.memo is _UNREAD or _get_memo(self.obj) is not self.memo:
+            return False
+        for lst, items in self.lists:
+            if len(lst) != len(items) or not all(map(is_, lst, items)):
+                return False
+        return True
+
+    def is_current_id(self) -> bool:
+        """Return True if the object still has its ID, where it was indexed."""
+        return getattr(self.obj, "id", None) == self.id and self.is_attached()
+
+    def is_attached(self) -> bool:
+        """Return True if the object is still in the field of its parent (and so on)."""
+        node = self
+        while (parent := node.parent) is not None:
+            value = parent.obj.__dict__.get(node.field)  # type: ignore[arg-type]
+            if value is not node.obj and not (
+                isinstance(value, list) and any(map(is_, value, repeat(node.obj)))
+            ):
+                return False
+            node = parent
+        return True
+
+
+class IdIndex:
+    """Objects of an OME tree, by ID and by type, and references by target ID."""
+
+    def __init__(self, root: OMEType) -> None:
+        self.root = _Node(root, None, None)
+        self.ids: dict[str, OMEType] = {}
+        # class -> {id(obj): obj}
+        self.by_type: dict[type, dict[int, OMEType]] = {}
+        # target id -> {id(reference): node}
+        self.refs: dict[str, dict[int, _Node]] = {}
+        # id(obj) -> node, for all indexed objects
+        self.nodes: dict[int, _Node] = {}
+        # the state of the tree when it was last read (see `refresh`)
+        self._state: tuple[Any, ...] = ()
+        self._columnar: list[Any] = []
+        # whether all the lists of the tree are tracked (see `TrackedList`)
+        self._tracked = False
+        # the generation when the index was last known to be up to date (or None,
+        # if not all the lists of the tree are tracked)
+        self._generation: int | None = None
+        current = generation()
+        self._add(self.root)
+        self._update()
+        self._generation = current if self._tracked else None
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the tree."""
+        current = generation()
+        if current == self._generation:
+            return
+        objects, memos, lists, lengths, items = self._state
+        if not (
+            all(map(is_, map(_get_memo, objects), memos))
+            and list(map(len, lists)) == lengths
+            and all(map(is_, chain.from_iterable(lists), items))
+        ):
+            self._update()
+        # (a change made after `current` was read bumps the generation again)
+        self._generation = current if self._tracked else None
+
+    def get(self, id: str) -> OMEType | None:
+        """Return the object with ID `id`, or None.
+
+        (If the object is still where it was indexed, and still has this ID, the
+        rest of the tree is not checked.)
+        """
+        obj = self.ids.get(id)
+        if obj is not None:
+            node = self.nodes.get(_key(obj))
+            if node is not None and node.id == id and node.is_current_id():
+                return obj
+        self.refresh()
+        return self.ids.get(id)
+
+    def find(self, cls: type[T]) -> list[T]:
+        """Return all objects that are instances of `cls`."""
+        self.refresh()
+        found: list[Any] = []
+        for type_, objects in self.by_type.items():
+            if issubclass(type_, cls):
+                found.extend(objects.values())
+        for container in self._columnar:
+            found.extend(_walk_columnar(container, cls))
+        return found
+
+    def referrers(self, id: str) -> list[OMEType]:
+        """Return the objects that hold references to ID `id`."""
+        self.refresh()
+        found = {}
+        for node in self.refs.get(id, {}).values():
+            if node.parent is not None:
+                found[_key(node.parent.obj)] = node.parent.obj
+        # (items of columnar containers are not indexed: those that exist may hold
+        # references, e.g. `Plane.annotation_refs`)
+        for container in self._columnar:
+            for item in container._items():
+                for ref in _walk_references(item):
+                    if ref.id == id:
+                        found[_key(item)] = item
+        return list(found.values())
+
+    def _update(self) -> None:
+        """Read the objects that have changed (or are new), from the root down."""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not node.is_current():
+                self._read(node)
+            stack.extend(reversed(node.children))
+
+        nodes = self.nodes.values()
+        lists = [lst for node in nodes for lst, _ in node.lists]
+        items = [items for node in nodes for _, items in node.lists]
+        self._state = (
+            [node.obj for node in nodes],
+            [node.memo for node in nodes],
+            lists,
+            list(map(len, lists)),
+            list(chain.from_iterable(items)),
+        )
+        self._columnar = [c for node in nodes for c in node.columnar]
+        self._tracked = all(type(lst) is TrackedList for lst in lists)
+
+    def _read(self, node: _Node) -> None:
+        """Read the fields of the object of `node`, updating its children."""
+        obj = node.obj
+        node.memo = obj._memo()
+        self._unlink(node)
+        has_id, is_ref, fields = link_plan(type(obj))
+        node.id = obj.id if has_id else None  # type: ignore[attr-defined]
+        if node.id is not None:
+            self.ids[node.id] = obj
+        node.target = obj.id if is_ref else None  # type: ignore[attr-defined]
+        if node.target is not None:
+            self.refs.setdefault(node.target, {})[_key(obj)] = node
+
+        old = {(_key(child.obj), child.field): child for child in node.children}
+        lists = []
+        children = []
+        columnar: tuple[Any, ...] = ()
+        values = obj.__dict__
+        for name in fields:
+            value = values.get(name)
+            if value is None:
+                continue
+            if isinstance(value, OMEType):
+                items: Any = (value,)
+            elif isinstance(value, list):
+                lists.append((value, tuple(value)))
+                items = value
+            else:
+                if is_columnar(value):
+                    columnar += (value,)
+                continue
+            for item in items:
+                if not isinstance(item, OMEType):
+                    continue
+                child = old.pop((_key(item), name), None) if old else None
+                if child is None:
+                    child = _Node(item, node, name)
+                    self._add(child)
+                children.append(child)
+        node.lists = tuple(lists)
+        node.children = children
+        node.columnar = columnar
+        for child in old.values():
+            self._drop(child)
+
+    def _add(self, node: _Node) -> None:
+        obj = node.obj
+        self.nodes[_key(obj)] = node
+        self.by_type.setdefault(type(obj), {})[_key(obj)] = obj
+
+    def _drop(self, node: _Node) -> None:
+        """Remove `node` and its children from the index."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children)
+            obj = node.obj
+            # (unless the object was moved, and is now indexed elsewhere)
+            if self.nodes.get(_key(obj)) is node:
+                del self.nodes[_key(obj)]
+                del self.by_type[type(obj)][_key(obj)]
+                self._unlink(node)
+
+    def _unlink(self, node: _Node) -> None:
+        """Remove the object of `node` from the maps by ID and by target ID."""
+        obj = node.obj
+        if node.id is not None and self.ids.get(node.id) is obj:
+            del self.ids[node.id]
+        if node.target is not None:
+            refs = self.refs.get(node.target, {})
+            if refs.get(_key(obj)) is node:
+                del refs[_key(obj)]
+                if not refs:
+                    del self.refs[node.target]
+
+
+def _walk_columnar(container: Any, cls: type[T]) -> Iterator[T]:
+    """Yield the instances of `cls` in a columnar container.
+
+    (The items are created, and kept, only if they may contain instances of `cls`.)
+    """
+    if any(issubclass(type_, cls) for type_ in reachable(container.model)):
+        yield from walk(container, (cls,))
+
+
+def _walk_references(obj: OMEType) -> Iterator[OMEType]:
+    from ome_types.model import Reference
+
+    return walk(obj, (Reference,), existing_only=True)
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import re
+import threading
 import warnings
-from contextlib import suppress
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from functools import cache
 from typing import TYPE_CHECKING, Any, cast
 
 from ome_types._pydantic_compat import field_regex
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from typing import Final
 
     from pydantic import BaseModel
@@ -15,20 +19,79 @@ if TYPE_CHECKING:
 # Default value to support automatic numbering for id field values.
 AUTO_SEQUENCE: Final = "__auto_sequence__"
 # map of id_name -> max id value
+# (for objects created outside of an `id_scope`, and updated when a scope ends)
 ID_COUNTER: dict[str, int] = {}
 
 # map of (id_name, id_value) -> converted id
-# NOTE: this is cleared in OMEMixin.__init__, so that the set of converted IDs
-# is unique to each OME instance
+# (for objects created outside of an `id_scope`; cleared when an OME object is
+# created outside of a scope, see OMEMixin.__init__)
 CONVERTED_IDS: dict[tuple[str, str], str] = {}
 
 
-def _get_id_name_and_pattern(cls: type[BaseModel]) -> tuple[str, str]:
+class IdScope:
+    """The state of ID allocation and conversion for one document.
+
+    IDs are numbered, and invalid IDs converted, independently in each scope, so
+    that documents can be parsed (or built) concurrently, in several threads.
+    """
+
+    __slots__ = ("converted", "counter")
+
+    def __init__(self) -> None:
+        # as ID_COUNTER and CONVERTED_IDS
+        self.counter: dict[str, int] = {}
+        self.converted: dict[tuple[str, str], str] = {}
+
+
+_SCOPE: ContextVar[IdScope | None] = ContextVar("ome_types_id_scope", default=None)
+# guards ID_COUNTER, when scopes end
+_LOCK = threading.Lock()
+
+
+@contextmanager
+def id_scope(scope: IdScope | None = None) -> Iterator[IdScope]:
+    """Allocate and convert IDs in `scope` (by default, a new one) in this context.
+
+    When the scope ends, the enclosing scope (or ID_COUNTER) is updated with its
+    counters, so that IDs created later don't clash with those of the document.
+    """
+    if scope is None:
+        scope = IdScope()
+    token = _SCOPE.set(scope)
+    try:
+        yield scope
+    finally:
+        _SCOPE.reset(token)
+        parent = _SCOPE.get()
+        if parent is not scope:
+            with _LOCK:
+                counter = ID_COUNTER if parent is None else parent.counter
+                for id_name, count in scope.counter.items():
+                    counter[id_name] = max(counter.get(id_name, -1), count)
+
+
+def current_id_scope() -> IdScope | None:
+    """Return the scope IDs are allocated in, in this context (or None)."""
+    return _SCOPE.get()
+
+
+def id_counter() -> dict[str, int]:
+    """Return the ID counters of the current scope (or ID_COUNTER)."""
+    scope = _SCOPE.get()
+    return ID_COUNTER if scope is None else scope.counter
+
+
+@cache
+def _id_plan(cls: type[BaseModel]) -> tuple[str, str, re.Pattern[str]]:
+    """Return the ID name of `cls`, the prefix of its IDs, and their pattern.
+
+    (e.g. "Channel", "Channel:" and the compiled pattern of the `id` field.)
+    """
     # let this raise if it doesn't exist...
     # this should only be used on classes that have an id field
     id_pattern = cast("str", field_regex(cls, "id"))
     id_name = id_pattern.split(":")[-3]
-    return id_name, id_pattern
+    return id_name, f"{id_name}:", re.compile(id_pattern)
 
 
 def validate_id(cls: type[BaseModel], value: int | str) -> Any:
@@ -43,28 +106,41 @@ def validate_id(cls: type[BaseModel], value: int | str) -> Any:
 
     COUNTERS stores the maximum previously-seen value on the class.
     """
-    id_name, id_pattern = _get_id_name_and_pattern(cls)
-    current_count = ID_COUNTER.setdefault(id_name, -1)
+    id_name, prefix, id_pattern = _id_plan(cls)
+    scope = _SCOPE.get()
+    if scope is None:
+        counter, converted = ID_COUNTER, CONVERTED_IDS
+    else:
+        counter, converted = scope.counter, scope.converted
+
+    if (
+        isinstance(value, str)
+        and value.startswith(prefix)
+        and (number := value[len(prefix) :]).isdecimal()
+    ):
+        # the common case: a valid "Name:123" ID (checked without the pattern)
+        counter[id_name] = max(counter.get(id_name, -1), int(number))
+        return value
+
+    current_count = counter.setdefault(id_name, -1)
 
     if value == AUTO_SEQUENCE:
         # if it's the special sentinel, use the next value
-        value = ID_COUNTER[id_name] + 1
+        value = counter[id_name] + 1
     elif isinstance(value, str):
-        if (id_name, value) in CONVERTED_IDS:
-            # XXX: possible bug
-            # if the same invalid value is used across multiple documents
-            # we'll be replacing it with the same converted id here
-            return CONVERTED_IDS[(id_name, value)]
+        if (id_name, value) in converted:
+            # (the same invalid value is converted the same way in a document)
+            return converted[(id_name, value)]
 
         # if the value is a string, extract the number from it if possible
         value_id: str = value.rsplit(":", 1)[-1]
 
         # if the value matches the pattern, just return it
         # but update the counter if it's higher than the current value
-        if re.match(id_pattern, value):
+        if id_pattern.match(value):
             with suppress(ValueError):
                 # (not all IDs have integers after the colon)
-                ID_COUNTER[id_name] = max(current_count, int(value_id))
+                counter[id_name] = max(current_count, int(value_id))
             return value
 
         # if the value doesn't match the pattern, create a proper ID
@@ -72,7 +148,7 @@ def validate_id(cls: type[BaseModel], value: int | str) -> Any:
         id_int = int(value_id) if value_id.isdecimal() else current_count + 1
         newname = validate_id(cls, id_int)
         # store the converted ID so we can use it elsewhere
-        CONVERTED_IDS[(id_name, value)] = newname
+        converted[(id_name, value)] = newname
 
         # warn the user
         msg = f"Casting invalid {id_name}ID {value!r} to {newname!r}"
@@ -82,5 +158,5 @@ def validate_id(cls: type[BaseModel], value: int | str) -> Any:
         raise ValueError(f"Invalid ID value: {value!r}, {type(value)}")
 
     # update the counter to be at least this value
-    ID_COUNTER[id_name] = max(current_count, value)
+    counter[id_name] = max(current_count, value)
     return f"{id_name}:{value}"
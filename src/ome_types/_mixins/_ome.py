@@ -2,29 +2,168 @@ from __future__ import annotations
 
 import warnings
 import weakref
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Any, BinaryIO
+from functools import cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, BinaryIO, TypeVar, cast
+
+from pydantic import PrivateAttr
 
 from ome_types._mixins._base_type import OMEType
-from ome_types._mixins._ids import CONVERTED_IDS
+from ome_types._mixins._ids import CONVERTED_IDS, current_id_scope, id_scope
+from ome_types._mixins._tracked import TrackedList
+from ome_types._walk import _annotated_models, walk
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
     from pathlib import Path
     from typing import Self
 
     from ome_types._autogenerated.ome_2016_06 import OME, Reference
+    from ome_types._mixins._id_index import IdIndex
+    from ome_types._mixins._ids import IdScope
+
+T = TypeVar("T", bound=OMEType)
+
+
+class LazyFields:
+    """Unparsed top-level fields of a lazily loaded OME object.
+
+    Holds the XML elements for each field that has not been accessed yet, the
+    parser used to convert them, and what is needed to link references to objects
+    that have already been loaded (or not).
+    """
+
+    def __init__(self, elements: dict[str, tuple[type, bool, list]], parser: Any):
+        # field name -> (model class, whether the field is a list, XML elements)
+        self.elements = elements
+        self.parser = parser
+        # id -> loaded object
+        self.ids: dict[str, OMEType] = {}
+        # field name -> references waiting for an object in that field
+        self.waiting: dict[str, list[Reference]] = {}
+        self._id_fields: dict[str, str] | None = None
+        # the scope in which the IDs of the document are converted
+        self.id_scope: IdScope | None = None
+
+    def id_fields(self) -> dict[str, str]:
+        """Return a map of id -> field name for all objects that are not loaded."""
+        if self._id_fields is None:
+            from ome_types import model
+
+            ref_tags = {
+                cls.__name__
+                for cls in vars(model).values()
+                if isinstance(cls, type) and issubclass(cls, model.Reference)
+            }
+            self._id_fields = {}
+            for name, (_, _, elements) in self.elements.items():
+                for elem in elements:
+                    for sub in elem.iter():
+                        if (
+                            isinstance(sub.tag, str)
+                            and "ID" in sub.attrib
+                            and sub.tag.rsplit("}", 1)[-1] not in ref_tags
+                        ):
+                            self._id_fields[sub.attrib["ID"]] = name
+        return self._id_fields
+
+
+class _LazyTarget:
+    """Stands in for the weakref of a Reference whose target is not loaded yet."""
+
+    def __init__(self, ome: OMEMixin, field: str, id: str) -> None:
+        self._ome = weakref.ref(ome)
+        self._field = field
+        self._id = id
+
+    def __call__(self) -> OMEType | None:
+        if (ome := self._ome()) is None:
+            return None
+        return collect_ids(getattr(ome, self._field)).get(self._id)
+
+    def __eq__(self, other: object) -> bool:
+        # compare like a weakref: by referent (pydantic compares private attributes)
+        if isinstance(other, (weakref.ref, _LazyTarget)):
+            return bool(self() == other())
+        return NotImplemented
 
 
-class OMEMixin:
+class OMEMixin(OMEType):
+    # top-level fields that have not been loaded yet (see `from_xml(..., lazy=True)`)
+    _lazy: LazyFields | None = PrivateAttr(None)
+
+    # the index of the objects in the tree (see `id_index`), kept across assignments
+    # (a slot, like the memo of OMEType)
+    __slots__ = ("__id_index",)
+
     def __init__(self, **data: Any) -> None:
-        # Clear the cache of converted IDs, so that they are unique to each OME instance
-        CONVERTED_IDS.clear()
-        super().__init__(**data)
+        # IDs are converted consistently within each document: in the scope of the
+        # document being parsed, if any, or else in a new one
+        scope = current_id_scope()
+        with id_scope(scope):
+            super().__init__(**data)
+        if scope is None:
+            # objects built outside of a document share CONVERTED_IDS, until they
+            # are put in one: conversions are not reused for the next document
+            CONVERTED_IDS.clear()
         self._link_refs()
 
+    @property
+    def id_index(self) -> Mapping[str, OMEType]:
+        """A read-only map of the IDs of all objects in the tree to the objects.
+
+        References (e.g. `ImageRef`) are not included.  The index is built once, and
+        then updated incrementally when the tree has changed: only the objects that
+        were modified (or added) since are read again.  The map reflects the tree at
+        the time this property is accessed.  (Fields that have not been loaded yet,
+        see `from_xml(..., lazy=True)`, are loaded.)
+        """
+        return MappingProxyType(self._id_index(refresh=True).ids)
+
+    def get_by_id(self, id: str) -> OMEType | None:
+        """Return the object with ID `id` (e.g. "Image:0"), or None if there is none.
+
+        If the object is still where it was when it was indexed (and still has this
+        ID), it is returned without checking the rest of the tree for changes.
+        """
+        return self._id_index().get(id)
+
+    def find(self, type: type[T]) -> list[T]:
+        """Return all objects in the tree that are instances of `type`.
+
+        For example, `ome.find(Channel)` returns the channels of all images.  Objects
+        are looked up in the index (see `id_index`), by class.
+        """
+        return self._id_index(refresh=True).find(type)
+
+    def referrers(self, obj: OMEType) -> list[OMEType]:
+        """Return the objects in the tree that refer to `obj` (by its ID).
+
+        For example, `ome.referrers(instrument)` returns the images that have an
+        `InstrumentRef` to it.  The referring objects are those that hold the
+        references (e.g. `Image.instrument_ref`), in the order they were indexed.
+        References are looked up in the index (see `id_index`), by target ID.
+        """
+        id_ = obj.id  # type: ignore[attr-defined]
+        return self._id_index(refresh=True).referrers(id_)
+
+    def _id_index(self, refresh: bool = False) -> IdIndex:
+        """Return the index of the objects in the tree, creating it if needed."""
+        from ome_types._mixins._id_index import IdIndex
+
+        self._load_lazy_fields()
+        index = getattr(self, "_OMEMixin__id_index", None)
+        if index is None:
+            index = IdIndex(self)
+            object.__setattr__(self, "_OMEMixin__id_index", index)
+        elif refresh:
+            index.refresh()
+        return index
+
     def _link_refs(self) -> None:
-        ids = collect_ids(self)
-        for ref in collect_references(self):
+        self._load_lazy_fields()
+        ids, references = _collect_links(self)
+        for ref in references:
             # all reference subclasses do actually have an 'id' field
             # but it's not declared in the base class
             if ref.id in ids:
@@ -32,9 +171,67 @@ class OMEMixin:
             else:
                 warnings.warn(f"Reference to unknown ID: {ref.id}", stacklevel=2)
 
+    def _set_lazy_fields(self, lazy: LazyFields) -> None:
+        """Defer the parsing of some top-level fields until they are accessed."""
+        lazy.ids.update(collect_ids(self))
+        for name in lazy.elements:
+            self.__dict__.pop(name, None)
+            self.model_fields_set.add(name)
+        self._lazy = lazy
+
+    def _load_lazy_fields(self) -> None:
+        """Load all top-level fields that have not been accessed yet."""
+        while self._lazy is not None:
+            self._load_lazy_field(next(iter(self._lazy.elements)))
+
+    def _load_lazy_field(self, name: str) -> Any:
+        lazy = cast("LazyFields", self._lazy)
+        cls, is_list, elements = lazy.elements.pop(name)
+        with id_scope(lazy.id_scope):
+            items = [lazy.parser.parse(elem, cls) for elem in elements]
+        value = self.__dict__[name] = TrackedList(items) if is_list else items[-1]
+
+        # link references inside the new objects, and those waiting for them
+        new_ids, references = _collect_links(value)
+        lazy.ids.update(new_ids)
+        for ref in references:
+            if ref.id in lazy.ids:
+                ref._ref = weakref.ref(lazy.ids[ref.id])
+            elif (field := lazy.id_fields().get(ref.id)) in lazy.elements:
+                ref._ref = _LazyTarget(self, field, ref.id)  # type: ignore
+                lazy.waiting.setdefault(field, []).append(ref)
+            else:
+                warnings.warn(f"Reference to unknown ID: {ref.id}", stacklevel=3)
+        for ref in lazy.waiting.pop(name, ()):
+            if ref.id in new_ids:
+                ref._ref = weakref.ref(new_ids[ref.id])
+
+        if not lazy.elements:
+            self._lazy = None
+        return value
+
     if not TYPE_CHECKING:
 
+        def __getattr__(self, name: str) -> Any:
+            # (only called for fields that are missing from __dict__)
+            if name in type(self).model_fields:
+                lazy = self._lazy
+                if lazy is not None and name in lazy.elements:
+                    return self._load_lazy_field(name)
+            return super().__getattr__(name)
+
+        def __setattr__(self, name: str, value: Any) -> None:
+            lazy = self._lazy if name in type(self).model_fields else None
+            if lazy is not None and name in lazy.elements:
+                # the unparsed value is simply replaced
+                del lazy.elements[name]
+                self.__dict__[name] = None
+                if not lazy.elements:
+                    self._lazy = None
+            super().__setattr__(name, value)
+
         def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+            self._load_lazy_fields()
             try:
                 copy = super().__deepcopy__(memo)
             except AttributeError:
@@ -43,9 +240,36 @@ class OMEMixin:
             copy._link_refs()
             return copy
 
+        def __copy__(self) -> Self:
+            self._load_lazy_fields()
+            return super().__copy__()
+
+        def __eq__(self, other: object) -> bool:
+            self._load_lazy_fields()
+            if isinstance(other, OMEMixin):
+                other._load_lazy_fields()
+            return super().__eq__(other)
+
+        def __iter__(self) -> Any:
+            self._load_lazy_fields()
+            return super().__iter__()
+
+        def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+            self._load_lazy_fields()
+            return super().model_dump(**kwargs)
+
+        def model_dump_json(self, **kwargs: Any) -> str:
+            self._load_lazy_fields()
+            return super().model_dump_json(**kwargs)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Load any lazy fields before pickling."""
+        self._load_lazy_fields()
+        return super().__getstate__()  # type: ignore[no-any-return]
+
     def __setstate__(self, state: dict[str, Any]) -> None:
         """Support unpickle of our weakref references."""
-        super().__setstate__(state)  # type: ignore
+        super().__setstate__(state)
         self._link_refs()
 
     @classmethod
@@ -62,45 +286,40 @@ class OMEMixin:
 def collect_ids(value: Any) -> dict[str, OMEType]:
     """Return a map of all model objects contained in value, keyed by id.
 
-    Recursively walks all dataclass fields and iterates over lists. The base
-    case is when value is neither a dataclass nor a list.
+    Walks the model fields and lists in document order: if several objects have
+    the same id, the last one wins.
     """
-    from ome_types.model import Reference
-
-    ids: dict[str, OMEType] = {}
-    if isinstance(value, Sequence) and not isinstance(value, str):
-        for v in value:
-            ids.update(collect_ids(v))
-    elif isinstance(value, OMEType):
-        for fname in type(value).model_fields:
-            if fname == "id" and not isinstance(value, Reference):
-                # We don't need to recurse on the id string, so just record it
-                # and move on.
-                ids[value.id] = value
-            else:
-                ids.update(collect_ids(getattr(value, fname)))
-    # Do nothing for uninteresting types.
-    return ids
+    return _collect_links(value)[0]
 
 
 def collect_references(value: Any) -> list[Reference]:
-    """Return a list of all References contained in value.
+    """Return a list of all References contained in value (in document order)."""
+    return _collect_links(value)[1]
 
-    Recursively walks all dataclass fields and iterates over lists. The base
-    case is when value is either a Reference object, or an uninteresting type
-    that we don't need to inspect further.
 
+def _collect_links(value: Any) -> tuple[dict[str, OMEType], list[Reference]]:
+    """Return the objects with an id, and the references, contained in value.
+
+    In one walk over the objects that already exist (see `ome_types._walk.walk`),
+    which only enters the fields that may contain either.
     """
     from ome_types.model import Reference
 
+    ids: dict[str, OMEType] = {}
     references: list[Reference] = []
-    if isinstance(value, Reference):
-        references.append(value)
-    elif isinstance(value, list):
-        for v in value:
-            references.extend(collect_references(v))
-    elif isinstance(value, OMEType):
-        for f in type(value).model_fields:
-            references.extend(collect_references(getattr(value, f)))
-    # Do nothing for uninteresting types
-    return references
+    for obj in walk(value, _link_types(), existing_only=True):
+        if isinstance(obj, Reference):
+            references.append(obj)
+        else:
+            ids[obj.id] = obj
+    return ids, references
+
+
+@cache
+def _link_types() -> tuple[type[OMEType], ...]:
+    """Return the model classes collected by `_collect_links`."""
+    from ome_types.model import Reference
+
+    # (all model classes, as `OMEType` and its subclasses)
+    models = _annotated_models(OMEType)
+    return (Reference, *(cls for cls in models if "id" in cls.model_fields))
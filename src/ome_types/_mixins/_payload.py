@@ -0,0 +1,157 @@
+"""Mixins for models with a (potentially large) payload that can be deferred.
+
+See `from_xml(..., defer=...)`.
+"""
+
+from __future__ import annotations
+
+import binascii
+import bz2
+import zlib
+from collections.abc import Callable  # noqa: TC003 (resolved by xsdata)
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from pydantic import PrivateAttr
+
+from ome_types._mixins._base_type import OMEType
+from ome_types._mixins._validators import bin_data_root_validator
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+    from typing_extensions import Self
+
+    from ome_types._autogenerated.ome_2016_06 import BinData
+
+_DECOMPRESS: dict[str, Callable[[bytes], bytes]] = {
+    "zlib": zlib.decompress,
+    "bzip2": bz2.decompress,
+}
+
+
+class PayloadMixin(OMEType):
+    # the name of the field that holds the payload
+    _payload_field: ClassVar[str] = "value"
+    # loads the payload, until it is loaded
+    _payload_loader: Callable[[], Any] | None = PrivateAttr(None)
+
+    def _defer(self, loader: Callable[[], Any]) -> None:
+        """Remove the payload, to be loaded by `loader` when it is first needed."""
+        self.__dict__.pop(self._payload_field, None)
+        self.model_fields_set.add(self._payload_field)
+        self._payload_loader = loader
+
+    def _load(self) -> None:
+        """Load the payload, if it was deferred."""
+        if (loader := self._payload_loader) is not None:
+            self.__dict__[self._payload_field] = loader()
+            self._payload_loader = None
+            # (a change of fields, for `OME.id_index`: the payload may be a model)
+            object.__setattr__(self, "_OMEType__memo", None)
+
+    if not TYPE_CHECKING:
+
+        def __getattr__(self, name: str) -> Any:
+            # (only called for fields that are missing from __dict__)
+            if name == self._payload_field and self._payload_loader is not None:
+                self._load()
+                return self.__dict__[name]
+            return super().__getattr__(name)
+
+        def __setattr__(self, name: str, value: Any) -> None:
+            if name == self._payload_field:
+                self._load()
+            super().__setattr__(name, value)
+
+        def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+            self._load()
+            return super().__deepcopy__(memo)
+
+        def __copy__(self) -> Self:
+            self._load()
+            return super().__copy__()
+
+        def __eq__(self, other: object) -> bool:
+            self._load()
+            if isinstance(other, PayloadMixin):
+                other._load()
+            return super().__eq__(other)
+
+        def __iter__(self) -> Any:
+            self._load()
+            return super().__iter__()
+
+        def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+            self._load()
+            return super().model_dump(**kwargs)
+
+        def model_dump_json(self, **kwargs: Any) -> str:
+            self._load()
+            return super().model_dump_json(**kwargs)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Load any deferred payload before pickling."""
+        self._load()
+        return super().__getstate__()  # type: ignore[no-any-return]
+
+
+class BinDataMixin(PayloadMixin):
+    @classmethod
+    def _trusted_params(cls, params: dict[str, Any]) -> None:
+        """Complete the `params` of `trusted_factory`, which skips the validators."""
+        # e.g. <BinData Length="0"/>, for which the parser omits the value
+        bin_data_root_validator(cls, params)  # type: ignore[arg-type]
+
+    def to_numpy(
+        self,
+        dtype: npt.DTypeLike = "uint8",
+        shape: int | tuple[int, ...] | None = None,
+        *,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Return the (decompressed) data as a NumPy array.
+
+        Uncompressed data is not copied: the array is a read-only view of `value`
+        (or of the data decoded from the XML, if it was deferred, which is then not
+        kept).
+
+        Parameters
+        ----------
+        dtype : npt.DTypeLike
+            The type of the values, e.g. `pixels.type.numpy_dtype`.  The byte order
+            is that of `big_endian`.
+        shape : int | tuple[int, ...] | None
+            The shape of the array.  If None, a 1D array is returned.
+        out : np.ndarray | None
+            An array to write the values to (converting them to its dtype and byte
+            order), which is returned.  It must have the same size.
+        """
+        import numpy as np
+
+        slf: BinData = self  # type: ignore[assignment]
+        loader = self._payload_loader
+        data: bytes = loader() if loader is not None else slf.value
+        if (decompress := _DECOMPRESS.get(slf.compression.value)) is not None:
+            data = decompress(data)
+        dt = np.dtype(dtype).newbyteorder(">" if slf.big_endian else "<")
+        if len(data) % dt.itemsize:
+            raise ValueError(
+                f"BinData size ({len(data)} bytes) is not a multiple of the size of "
+                f"{dt} ({dt.itemsize} bytes)"
+            )
+        array = np.frombuffer(data, dtype=dt)
+        if shape is not None:
+            array = array.reshape(shape)
+        if out is None:
+            return array
+        if out.size != array.size:
+            raise ValueError(
+                f"BinData has {array.size} values, but `out` has size {out.size}"
+            )
+        out.reshape(array.shape)[...] = array
+        return out
+
+
+def base64_loader(text: str) -> Callable[[], bytes]:
+    """Return a loader that decodes base64 `text`."""
+    return lambda: binascii.a2b_base64(text)
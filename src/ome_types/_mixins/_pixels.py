@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from operator import attrgetter, is_
+from typing import TYPE_CHECKING, Any, cast
+
+from ome_types._mixins._util import is_columnar
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from ome_types._autogenerated.ome_2016_06 import (
+        Pixels,
+        Plane,
+        UnitsLength,
+        UnitsTime,
+    )
+
+# integer fields of Plane, and fields with a unit (and the kind of unit)
+_INDEX_FIELDS = ("the_z", "the_t", "the_c")
+_QUANTITY_FIELDS = {
+    "delta_t": "time",
+    "exposure_time": "time",
+    "position_x": "length",
+    "position_y": "length",
+    "position_z": "length",
+}
+_get_memo = attrgetter("_OMEType__memo")
+
+
+class PixelsMixin:
+    def planes_table(
+        self,
+        length_unit: UnitsLength | str | None = None,
+        time_unit: UnitsTime | str | None = None,
+        *,
+        as_frame: bool | None = None,
+    ) -> pd.DataFrame | np.ndarray:
+        """Return the indices, timing and position of all planes, as a table.
+
+        The table has one row per plane, and the columns `the_z`, `the_t`, `the_c`,
+        `delta_t`, `exposure_time`, `position_x`, `position_y` and `position_z`.
+        Missing values are NaN.  Values are converted to a common unit (per column)
+        with `ome_types.units.ureg`, in one step for all planes that have the same
+        unit.
+
+        The table is computed once, and reused until the planes (or their fields)
+        are modified.
+
+        Parameters
+        ----------
+        length_unit : UnitsLength | str | None
+            The unit of the `position_*` columns (e.g. "µm").  If None, the unit of
+            the first plane that has a value is used (so that no conversion is needed
+            if all planes have the same unit).
+        time_unit : UnitsTime | str | None
+            The unit of the `delta_t` and `exposure_time` columns (e.g. "ms").  If
+            None, the unit of the first plane that has a value is used.
+        as_frame : bool | None
+            Whether to return a `pandas.DataFrame`.  If None (the default), a
+            DataFrame is returned if pandas is installed.  Otherwise, a (read-only)
+            NumPy structured array is returned.  The units of the columns are in
+            `DataFrame.attrs["units"]`, or in the metadata of the fields of the
+            array (e.g. `table.dtype["delta_t"].metadata["unit"]`).
+        """
+        units = tuple(getattr(u, "value", u) for u in (length_unit, time_unit))
+        table = _cached_table(cast("Pixels", self), cast("tuple[Any, Any]", units))
+        if as_frame is None:
+            try:
+                import pandas as pd
+            except ImportError:
+                return table
+        elif as_frame:
+            import pandas as pd
+        else:
+            return table
+
+        names = cast("tuple[str, ...]", table.dtype.names)
+        frame = pd.DataFrame({name: table[name] for name in names})
+        frame.attrs["units"] = {
+            name: table.dtype[name].metadata["unit"]  # type: ignore[index]
+            for name in _QUANTITY_FIELDS
+        }
+        return frame
+
+    def bin_data_as_array(self) -> np.ndarray:
+        """Return the pixel data in `bin_data_blocks`, as a NumPy array.
+
+        The blocks are decoded (and decompressed) into one preallocated array, of
+        dtype `type.numpy_dtype` (in native byte order).  The dimensions of the
+        array are those of `dimension_order`, reversed: e.g. (T, C, Z, Y, X) for
+        "XYZCT".
+        """
+        import numpy as np
+
+        from ome_types.model import PixelType
+
+        slf = cast("Pixels", self)
+        order = slf.dimension_order.value[::-1]
+        shape = tuple(getattr(slf, f"size_{dim.lower()}") for dim in order)
+        out = np.empty(shape, dtype=cast("str", slf.type.numpy_dtype))
+        flat = out.reshape(-1)
+        blocks = slf.bin_data_blocks
+        offset = 0
+        for block in blocks:
+            if slf.type == PixelType.BIT:
+                # (bits are packed, and each block is padded to whole bytes)
+                count = flat.size // len(blocks)
+                values = np.unpackbits(block.to_numpy(), count=count)
+            else:
+                values = block.to_numpy(out.dtype)
+            if offset + values.size > flat.size:
+                break
+            flat[offset : offset + values.size] = values
+            offset += values.size
+        else:
+            if offset == flat.size:
+                return out
+        raise ValueError(
+            f"The size of the data in bin_data_blocks does not match the size of the "
+            f"image ({shape})"
+        )
+
+
+def _cached_table(pixels: Pixels, units: tuple[str | None, str | None]) -> np.ndarray:
+    """Return the planes table of `pixels`, memoized until the planes change."""
+    planes = pixels.planes
+    if is_columnar(planes):
+        # (the columns are already arrays)
+        return _planes_table(planes, units)
+
+    key = ("planes_table", units)
+    memo = pixels._memo()  # type: ignore[attr-defined]
+    cached = memo.get(key)
+    if cached is not None:
+        lst, items, memos, table = cached
+        if (
+            lst is planes
+            and len(planes) == len(items)
+            and all(map(is_, planes, items))
+            # the memos of the planes are cleared when they are modified
+            and all(map(is_, map(_get_memo, planes), memos))
+        ):
+            return table  # type: ignore[no-any-return]
+
+    table = _planes_table(planes, units)
+    memos = tuple(plane._memo() for plane in planes)  # type: ignore[attr-defined]
+    memo[key] = (planes, tuple(planes), memos, table)
+    return table
+
+
+def _planes_table(
+    planes: list[Plane], units: tuple[str | None, str | None]
+) -> np.ndarray:
+    import numpy as np
+
+    from ome_types.model import Plane
+
+    targets = dict(zip(("length", "time"), units))
+    columns: dict[str, np.ndarray] = {}
+    dtypes: list[tuple[str, Any]] = []
+    for name in _INDEX_FIELDS:
+        if is_columnar(planes):
+            columns[name] = planes.column(name)  # type: ignore[attr-defined]
+        else:
+            columns[name] = np.array([getattr(p, name) for p in planes], dtype=int)
+        dtypes.append((name, columns[name].dtype))
+
+    for name, kind in _QUANTITY_FIELDS.items():
+        unit_name = f"{name}_unit"
+        if is_columnar(planes):
+            values = planes.column(name).astype(float)  # type: ignore[attr-defined]
+            plane_units = planes.column(unit_name)  # type: ignore[attr-defined]
+        else:
+            values = np.array([getattr(p, name) for p in planes], dtype=float)
+            plane_units = np.empty(len(planes), dtype=object)
+            plane_units[:] = [getattr(p, unit_name) for p in planes]
+
+        present = plane_units[~np.isnan(values)]
+        target = targets[kind]
+        if target is None:
+            default = Plane.model_fields[unit_name].default
+            target = (present[0] if len(present) else default).value
+        for unit in set(present.tolist()):
+            if unit.value != target:
+                values[plane_units == unit] *= _conversion_factor(unit.value, target)
+        columns[name] = values
+        dtypes.append((name, np.dtype(float, metadata={"unit": target})))
+
+    table = np.empty(len(planes), dtype=dtypes)
+    for name, values in columns.items():
+        table[name] = values
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache
+def _conversion_factor(from_unit: str, to_unit: str) -> float:
+    from ome_types.units import ureg
+
+    quantity = ureg.Quantity(1, from_unit.replace(" ", "_"))
+    return float(quantity.to(to_unit.replace(" ", "_")).magnitude)
@@ -0,0 +1,77 @@
+"""Tracking of changes to the model objects, for data derived from a whole tree.
+
+Assigning a field of a model object (see `OMEType.__setattr__`), or mutating one of
+its list fields, bumps a process-wide generation counter.  Data derived from a tree
+(e.g. `OME.id_index`) records the generation when it is computed: if the generation
+is still the same, nothing has changed since, in any tree.
+
+List fields are `TrackedList`s, which are created when the fields are set.  Lists
+that were put in the `__dict__` of an object directly (e.g. by `model_construct`,
+or an older pickle) are not tracked: their mutations don't bump the generation,
+which is then not enough to tell that a tree that holds them hasn't changed.
+"""
+
+from __future__ import annotations
+
+from itertools import count
+from typing import Any, Callable
+
+__all__ = ["TrackedList", "changed", "generation", "track_lists"]
+
+_COUNTER = count(1)
+# (a list, so that it can be updated without `global`)
+_GENERATION = [0]
+
+
+def changed() -> None:
+    """Record that a model object, or one of its lists, has changed."""
+    # (the values are unique, so a change can't go unnoticed, even if concurrent
+    # changes are recorded out of order)
+    _GENERATION[0] = next(_COUNTER)
+
+
+def generation() -> int:
+    """Return the current generation (which changes whenever an object changes)."""
+    return _GENERATION[0]
+
+
+class TrackedList(list):
+    """A list that calls `changed` when it is mutated."""
+
+    __slots__ = ()
+
+
+def _tracked(method: Callable) -> Callable:
+    def mutate(self: TrackedList, *args: Any, **kwargs: Any) -> Any:
+        result = method(self, *args, **kwargs)
+        changed()
+        return result
+
+    mutate.__name__ = method.__name__
+    mutate.__doc__ = method.__doc__
+    return mutate
+
+
+for _name in (
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "__setitem__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+):
+    setattr(TrackedList, _name, _tracked(getattr(list, _name)))
+del _name
+
+
+def track_lists(values: dict[str, Any]) -> None:
+    """Replace the plain lists in `values` (the fields of an object) by tracked ones."""
+    for name, value in values.items():
+        if type(value) is list:
+            values[name] = TrackedList(value)
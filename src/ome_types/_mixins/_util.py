@@ -1,6 +1,17 @@
+import sys
 import uuid
+from typing import Any
 
 
 def new_uuid() -> str:
     """Generate a new UUID."""
     return f"urn:uuid:{uuid.uuid4()}"
+
+
+def is_columnar(value: Any) -> bool:
+    """Return True if `value` is a columnar container (see `ome_types.columnar`).
+
+    (Without importing `ome_types.columnar`, which requires numpy.)
+    """
+    module = sys.modules.get("ome_types.columnar")
+    return module is not None and isinstance(value, module.ColumnarList)
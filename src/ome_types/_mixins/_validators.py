@@ -5,9 +5,11 @@ that logic is in the `methods` method in ome_autogen/_generator.py
 
 import warnings
 from collections.abc import Sequence
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, get_args
 
 if TYPE_CHECKING:
+    from pydantic import SerializerFunctionWrapHandler, ValidatorFunctionWrapHandler
+
     from ome_types.model import (  # type: ignore
         OME,
         ROI,
@@ -137,3 +139,29 @@ def validate_map_annotation(cls: "Map", v: Any) -> "Map | dict":
             return v
         return {"ms": [Map.M(k=k, value=v) for k, v in v.items()]}
     return v
+
+
+# @field_validator("planes", "tiff_data_blocks", mode="wrap")
+def columnar_validator(
+    cls: "Pixels", v: Any, handler: "ValidatorFunctionWrapHandler", info: Any
+) -> Any:
+    """Accept columnar containers (see `ome_types.columnar`) for list fields as-is."""
+    from ome_types._mixins._util import is_columnar
+
+    if is_columnar(v):
+        (item_type,) = get_args(cls.model_fields[info.field_name].annotation)
+        if v.model is item_type:
+            return v
+    return handler(v)
+
+
+# @field_serializer("planes", "tiff_data_blocks", mode="wrap")
+def serialize_columnar(
+    self: "Pixels", v: Any, handler: "SerializerFunctionWrapHandler"
+) -> Any:
+    """Dump columnar containers (see `ome_types.columnar`) as lists."""
+    from ome_types._mixins._util import is_columnar
+
+    if is_columnar(v):
+        v = list(v.iter_models())
+    return handler(v)
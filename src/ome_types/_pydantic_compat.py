@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from collections.abc import MutableSequence
 from typing import TYPE_CHECKING, Any
 
 import pydantic.version
@@ -42,16 +41,16 @@ def update_set_fields(self: BaseModel) -> None:
     a field has been "set" by mutating a sequence.  This method updates the
     `model_fields_set` attribute to reflect that.  We assume that if an attribute
     is not None, and is not equal to the default value, then it has been set.
+    (Only the fields of `self` are updated, not those of the objects it contains.
+    Fields whose loading was deferred are already set.)
     """
+    values = self.__dict__
+    fields_set = self.model_fields_set
     for field_name, field in type(self).model_fields.items():
-        current = getattr(self, field_name)
+        if field_name in fields_set:
+            continue
+        current = values.get(field_name)
         if not current:
             continue
         if current != get_default(field):
-            self.model_fields_set.add(field_name)
-        if isinstance(current, BaseModel):
-            update_set_fields(current)
-        if isinstance(current, MutableSequence):
-            for item in current:
-                if isinstance(item, BaseModel):
-                    update_set_fields(item)
+            fields_set.add(field_name)
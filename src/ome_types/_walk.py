@@ -0,0 +1,166 @@
+"""Walks over the model objects in a tree, pruned by per-class traversal tables.
+
+For each model class, the tables record which fields may contain model objects
+(according to the field annotations: other fields hold strings, numbers, enums or
+bytes), and which model classes may be reached through each of them.  A walk only
+enters the fields that may lead to the objects it is looking for, so e.g. the
+references in a tree can be collected without reading the (many) fields of
+`Plane`, `Channel` or `ROI` objects that can never contain one.
+
+The tables are computed when first needed (rather than at class creation, when the
+annotations of the generated classes may not be resolved yet), and cached.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import cache
+from typing import TYPE_CHECKING, Any, get_args
+
+from ome_types._mixins._base_type import OMEType
+from ome_types._mixins._util import is_columnar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = ["link_plan", "nested_fields", "reachable", "walk", "walk_fields"]
+
+# class -> whether its objects are yielded, and the fields to walk (for some types)
+_Plans = dict[type, tuple[bool, tuple[str, ...]]]
+
+
+def walk(
+    value: Any, types: tuple[type, ...] = (OMEType,), *, existing_only: bool = False
+) -> Iterator[Any]:
+    """Yield the instances of `types` contained in `value` (including `value`).
+
+    The objects are yielded in document order, in one iterative walk which only
+    enters the fields that may contain instances of `types` (see `walk_fields`).
+
+    With `existing_only`, only the objects that already exist are walked: the items
+    of columnar containers are not created, and fields whose loading was deferred
+    (see `from_xml(..., lazy=True, defer=...)`) are not loaded.
+    """
+    plans = _plans(types)
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, OMEType):
+            cls = type(value)
+            plan = plans.get(cls)
+            if plan is None:
+                plan = plans[cls] = (issubclass(cls, types), walk_fields(cls, types))
+            matches, fields = plan
+            if matches:
+                yield value
+            if fields:
+                if existing_only:
+                    values = value.__dict__
+                    stack.extend(values.get(name) for name in reversed(fields))
+                else:
+                    stack.extend(getattr(value, name) for name in reversed(fields))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+        elif value is None or isinstance(value, str):
+            # Do nothing for uninteresting types.
+            continue
+        elif is_columnar(value):
+            # (the other items are rebuilt from the columns when they are created)
+            items = value._items() if existing_only else value
+            stack.extend(reversed(list(items)))
+        elif isinstance(value, Sequence):
+            stack.extend(reversed(value))
+
+
+@cache
+def _plans(types: tuple[type, ...]) -> _Plans:
+    return {}
+
+
+@cache
+def walk_fields(cls: type[OMEType], types: tuple[type, ...]) -> tuple[str, ...]:
+    """Return the fields of `cls` through which instances of `types` may be reached."""
+    return tuple(
+        name
+        for name in nested_fields(cls)
+        if any(issubclass(model, types) for model in _field_models(cls, name))
+    )
+
+
+@cache
+def nested_fields(cls: type[OMEType]) -> tuple[str, ...]:
+    """Return the names of the fields of `cls` that may contain model objects."""
+    return tuple(
+        name
+        for name, field in cls.model_fields.items()
+        if _may_contain_models(field.annotation)
+    )
+
+
+@cache
+def reachable(cls: type[OMEType]) -> frozenset[type[OMEType]]:
+    """Return the model classes that objects of `cls` may contain (and `cls`)."""
+    found = {cls}
+    stack = [cls]
+    while stack:
+        parent = stack.pop()
+        for name in nested_fields(parent):
+            for model in _annotated_models(parent.model_fields[name].annotation):
+                if model not in found:
+                    found.add(model)
+                    if name != _payload_field(parent):
+                        stack.append(model)
+    return frozenset(found)
+
+
+@cache
+def link_plan(cls: type[OMEType]) -> tuple[bool, bool, tuple[str, ...]]:
+    """Return whether objects of `cls` have an id or are references, and their fields.
+
+    The fields are those that may contain model objects.  (References have the id
+    of the object they refer to.)
+    """
+    from ome_types.model import Reference
+
+    is_ref = issubclass(cls, Reference)
+    has_id = "id" in cls.model_fields and not is_ref
+    return has_id, is_ref, nested_fields(cls)
+
+
+def _field_models(cls: type[OMEType], name: str) -> set[type[OMEType]]:
+    """Return the model classes that may be reached through a field of `cls`.
+
+    Payloads (e.g. `XMLAnnotation.value`) may be reached, but not what they contain:
+    the contents of XML annotations are arbitrary XML, which can be expensive to load
+    (if it was deferred) and walk through.
+    """
+    models = _annotated_models(cls.model_fields[name].annotation)
+    if name == _payload_field(cls):
+        return set(models)
+    return {model for annotated in models for model in reachable(annotated)}
+
+
+def _payload_field(cls: type[OMEType]) -> str | None:
+    return getattr(cls, "_payload_field", None)
+
+
+def _annotated_models(annotation: Any) -> list[type[OMEType]]:
+    """Return the model classes in a type annotation (including subclasses)."""
+    if annotation is Any or annotation is object:
+        annotation = OMEType
+    if isinstance(annotation, type) and issubclass(annotation, OMEType):
+        found, stack = [], [annotation]
+        while stack:
+            cls = stack.pop()
+            found.append(cls)
+            stack.extend(cls.__subclasses__())
+        return found
+    return [cls for arg in get_args(annotation) for cls in _annotated_models(arg)]
+
+
+def _may_contain_models(annotation: Any) -> bool:
+    if annotation is Any or annotation is object:
+        return True
+    if isinstance(annotation, type) and issubclass(annotation, OMEType):
+        return True
+    return any(_may_contain_models(arg) for arg in get_args(annotation))
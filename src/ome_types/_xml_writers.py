@@ -0,0 +1,435 @@
+"""Streaming writers for the events of the xsdata `XmlSerializer`.
+
+xsdata's default writer builds a complete lxml tree from the serializer events,
+indents it, and then renders it to a single string.  The writers here format the
+events as they arrive instead, so that a document can be written to a file (or a
+socket) in chunks, without ever holding the whole document in memory:
+
+- `PrettyXmlWriter` produces the same output as the default (lxml) writer.
+- `CanonicalXmlWriter` produces the same output as running the default output
+  through `xml.etree.ElementTree.canonicalize(..., strip_text=True)`, and
+  pretty-printing the result with `xml.dom.minidom`.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+from xml.sax.handler import ContentHandler
+
+from xsdata.formats.dataclass.serializers.mixins import XmlWriter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from typing import Any, BinaryIO
+
+__all__ = ["CanonicalXmlWriter", "ChunkedWriter", "PrettyXmlWriter"]
+
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+XML_SPACE_NAME = (XML_NS, "space")
+# size of the chunks written to binary outputs
+CHUNK_SIZE = 1 << 16
+
+
+class ChunkedWriter:
+    """Text output that encodes and writes to a binary file in chunks."""
+
+    def __init__(
+        self, fh: BinaryIO, encoding: str = "utf-8", chunk_size: int = CHUNK_SIZE
+    ) -> None:
+        self._fh = fh
+        self._encoding = encoding
+        self._chunk_size = chunk_size
+        self._buffer: list[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> int:
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= self._chunk_size:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._fh.write("".join(self._buffer).encode(self._encoding))
+            self._buffer.clear()
+            self._size = 0
+
+
+# --------------------------- lxml compatible output ---------------------------
+
+
+def _escape_lxml_text(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    return text
+
+
+def _escape_lxml_attrib(text: str) -> str:
+    text = _escape_lxml_text(text)
+    if '"' in text:
+        text = text.replace('"', "&quot;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#9;")
+    return text
+
+
+class _PrettyHandler(ContentHandler):
+    """Write elements as `lxml.etree.tostring` would, after `lxml.etree.indent`.
+
+    `etree.indent` replaces whitespace-only text before the first child, and
+    whitespace-only tails of the children of an element, with indentation.  Which
+    one applies is only known at the next event, so character data is held until
+    then (as is the end of a start tag, which becomes "/>" if the element is empty).
+    """
+
+    def __init__(self, write: Callable[[str], Any], indent: str) -> None:
+        super().__init__()
+        self._write = write
+        self._indent = indent
+        self._data: list[str] = []
+        self._new_ns: list[tuple[str | None, str]] = []
+        # uri -> prefix, in scope of each open element
+        self._prefixes: list[dict[str, str | None]] = [{XML_NS: "xml"}]
+        # [qualified name, has children] of each open element
+        self._stack: list[list] = []
+        self._open = False
+
+    def endDocument(self) -> None:
+        if self._indent:
+            self._write("\n")
+
+    def startPrefixMapping(self, prefix: str | None, uri: str) -> None:
+        self._new_ns.append((prefix, uri))
+
+    def endPrefixMapping(self, prefix: str | None) -> None:
+        pass
+
+    def characters(self, content: str) -> None:
+        self._data.append(content)
+
+    def ignorableWhitespace(self, whitespace: str) -> None:
+        self._data.append(whitespace)
+
+    def startElementNS(
+        self, name: tuple[str | None, str], qname: Any, attrs: Any
+    ) -> None:
+        self._flush(end=False)
+        if self._open:
+            self._write(">")
+        if self._stack:
+            self._stack[-1][1] = True
+
+        prefixes = self._prefixes[-1]
+        parts = []
+        if self._new_ns:
+            prefixes = prefixes.copy()
+            for prefix, uri in self._new_ns:
+                if prefix == "xml":
+                    continue
+                prefixes[uri] = prefix
+                xmlns = f"xmlns:{prefix}" if prefix else "xmlns"
+                parts.append(f' {xmlns}="{_escape_lxml_attrib(uri)}"')
+            self._new_ns.clear()
+        self._prefixes.append(prefixes)
+
+        tag = _prefixed(name, prefixes)
+        for key, value in attrs.items():
+            parts.append(f' {_prefixed(key, prefixes)}="{_escape_lxml_attrib(value)}"')
+        self._write(f"<{tag}{''.join(parts)}")
+        self._stack.append([tag, False])
+        self._open = True
+
+    def endElementNS(self, name: tuple[str | None, str], qname: Any) -> None:
+        self._flush(end=True)
+        tag, _ = self._stack.pop()
+        self._prefixes.pop()
+        if self._open:
+            self._write("/>")
+            self._open = False
+        else:
+            self._write(f"</{tag}>")
+
+    def _flush(self, end: bool) -> None:
+        data = "".join(self._data)
+        self._data.clear()
+        if not self._stack:
+            return
+        if self._indent:
+            depth = len(self._stack)
+            if self._stack[-1][1]:
+                # tail of the previous child (dedented after the last one)
+                if not data.strip():
+                    data = "\n" + self._indent * (depth - 1 if end else depth)
+            elif not end and not data.strip():
+                # text before the first child
+                data = "\n" + self._indent * depth
+        if data:
+            if self._open:
+                self._write(">")
+                self._open = False
+            self._write(_escape_lxml_text(data))
+
+
+def _prefixed(name: tuple[str | None, str], prefixes: dict[str, str | None]) -> str:
+    uri, local = name
+    if uri and (prefix := prefixes.get(uri)):
+        return f"{prefix}:{local}"
+    return local
+
+
+class PrettyXmlWriter(XmlWriter):
+    """Streaming equivalent of xsdata's `LxmlEventWriter`."""
+
+    def build_handler(self) -> ContentHandler:
+        return _PrettyHandler(self.output.write, self.config.indent or "")
+
+
+# ------------------------------ canonical output ------------------------------
+
+# (minidom escapes whitespace in attributes, but no longer quotes in text, since 3.13)
+if sys.version_info >= (3, 13):
+
+    def _escape_minidom(text: str, attr: bool) -> str:
+        if "&" in text:
+            text = text.replace("&", "&amp;")
+        if "<" in text:
+            text = text.replace("<", "&lt;")
+        if ">" in text:
+            text = text.replace(">", "&gt;")
+        if attr:
+            if '"' in text:
+                text = text.replace('"', "&quot;")
+            if "\r" in text:
+                text = text.replace("\r", "&#13;")
+            if "\n" in text:
+                text = text.replace("\n", "&#10;")
+            if "\t" in text:
+                text = text.replace("\t", "&#9;")
+        return text
+
+else:
+
+    def _escape_minidom(text: str, attr: bool) -> str:
+        if "&" in text:
+            text = text.replace("&", "&amp;")
+        if "<" in text:
+            text = text.replace("<", "&lt;")
+        if '"' in text:
+            text = text.replace('"', "&quot;")
+        if ">" in text:
+            text = text.replace(">", "&gt;")
+        return text
+
+
+class _Node:
+    __slots__ = ("has_elements", "indent", "n_children", "tag", "text")
+
+    def __init__(self, tag: str, indent: str) -> None:
+        self.tag = tag
+        self.indent = indent
+        self.n_children = 0
+        self.has_elements = False
+        # the first child, while it is the only one and it is text
+        self.text: str | None = None
+
+
+class _CanonicalHandler(ContentHandler):
+    """Write elements in canonical form (C14N 2.0), pretty-printed as by minidom.
+
+    Namespace declarations, attribute order and whitespace stripping follow
+    `xml.etree.ElementTree.C14NWriterTarget`.  Then, as in `Node.toprettyxml`, an
+    element whose only child is text is written on one line, and otherwise each
+    child is written on its own line.  The layout of an element is only known once
+    its second child (or its end) arrives, so the first text child is held until
+    then.
+    """
+
+    def __init__(self, write: Callable[[str], Any], indent: str) -> None:
+        super().__init__()
+        self._write = write
+        self._indent = indent
+        self._data: list[str] = []
+        # (uri, prefix) pairs declared in the output, per element
+        self._declared: list[list[tuple[str, str]]] = [[(XML_NS, "xml")]]
+        # (uri, prefix) pairs declared in the input (see C14NWriterTarget)
+        self._ns_stack: list[list[tuple[str, str]]] = [[]]
+        # (name, *attribute names) -> (tag, [(' attr="', attribute name), ...]) in
+        # canonical order, while the namespaces in scope don't change
+        self._layouts: dict[tuple, tuple[str, list[tuple[str, Any]]]] = {}
+        self._preserve_space = [False]
+        self._stack: list[_Node] = []
+
+    def startDocument(self) -> None:
+        self._write('<?xml version="1.0" ?>\n')
+
+    def startPrefixMapping(self, prefix: str | None, uri: str) -> None:
+        self._flush(end=False)
+        self._ns_stack[-1].append((uri, prefix or ""))
+        self._layouts.clear()
+
+    def endPrefixMapping(self, prefix: str | None) -> None:
+        pass
+
+    def characters(self, content: str) -> None:
+        self._data.append(content)
+
+    def ignorableWhitespace(self, whitespace: str) -> None:
+        self._data.append(whitespace)
+
+    def startElementNS(
+        self, name: tuple[str | None, str], qname: Any, attrs: Any
+    ) -> None:
+        self._flush(end=False)
+        if self._stack:
+            parent = self._stack[-1]
+            self._expand(parent)
+            parent.n_children += 1
+            parent.has_elements = True
+
+        new_namespaces: list[tuple[str, str]] = []
+        self._declared.append(new_namespaces)
+        key = (name, *attrs)
+        try:
+            tag, layout = self._layouts[key]
+        except KeyError:
+            tag, layout = self._layouts[key] = self._layout(name, attrs)
+
+        indent = self._stack[-1].indent + self._indent if self._stack else ""
+        parts = [indent, "<", tag]
+        if new_namespaces:
+            for xmlns, uri in sorted(
+                (f"xmlns:{prefix}" if prefix else "xmlns", uri)
+                for uri, prefix in new_namespaces
+            ):
+                parts.append(f' {xmlns}="{_escape_minidom(uri, True)}"')
+            # (these may change the resolution of other names)
+            self._layouts.clear()
+        for start, attr in layout:
+            parts += (start, _escape_minidom(attrs[attr], True), '"')
+        self._write("".join(parts))
+
+        space = attrs.get(XML_SPACE_NAME)
+        self._preserve_space.append(
+            space == "preserve" if space else self._preserve_space[-1]
+        )
+        self._stack.append(_Node(tag, indent))
+        self._ns_stack.append([])
+
+    def endElementNS(self, name: tuple[str | None, str], qname: Any) -> None:
+        self._flush(end=True)
+        node = self._stack.pop()
+        if not node.n_children:
+            self._write("/>\n")
+        elif node.text is not None:
+            self._write(f">{_escape_minidom(node.text, False)}</{node.tag}>\n")
+        else:
+            self._write(f"{node.indent}</{node.tag}>\n")
+        self._preserve_space.pop()
+        declared, in_scope = self._declared.pop(), self._ns_stack.pop()
+        if declared or in_scope:
+            self._layouts.clear()
+
+    def _flush(self, end: bool) -> None:
+        if not self._data and not self._preserve_space[-1]:
+            return
+        data = "".join(self._data)
+        self._data.clear()
+        if not self._stack:
+            return
+        if not self._preserve_space[-1]:
+            data = data.strip()
+        elif self._indent and not data.strip():
+            # preserved whitespace is whatever `etree.indent` left (see _PrettyHandler)
+            node = self._stack[-1]
+            if node.has_elements or not end:
+                depth = len(self._stack)
+                data = "\n" + self._indent * (
+                    depth - 1 if end and node.has_elements else depth
+                )
+        if not data:
+            return
+
+        node = self._stack[-1]
+        if node.n_children:
+            self._expand(node)
+            text = f"{node.indent}{self._indent}{data}\n"
+            self._write(_escape_minidom(text, False))
+        else:
+            node.text = data
+        node.n_children += 1
+
+    def _expand(self, node: _Node) -> None:
+        """Start writing the children of `node` on separate lines."""
+        if not node.n_children:
+            self._write(">\n")
+        elif node.text is not None:
+            text = f"{node.indent}{self._indent}{node.text}\n"
+            self._write(">\n" + _escape_minidom(text, False))
+            node.text = None
+
+    def _layout(
+        self, name: tuple[str | None, str], attrs: Any
+    ) -> tuple[str, list[tuple[str, Any]]]:
+        # (prefixes are assigned in the order of the URIs, see C14NWriterTarget)
+        clark = {_clark(n): n for n in (name, *attrs)}
+        resolved = {
+            clark[key]: self._qname(key)
+            for key in sorted(clark, key=lambda n: n.split("}", 1))
+        }
+        layout = []
+        for attr in sorted(attrs, key=_clark):
+            qname, local, uri = resolved[attr]
+            layout.append((f' {qname if uri else local}="', attr))
+        return resolved[name][0], layout
+
+    def _qname(self, qname: str) -> tuple[str, str, str]:
+        """Resolve the prefix of a {uri}tag name, declaring it if necessary."""
+        uri, tag = qname[1:].rsplit("}", 1) if qname[:1] == "{" else ("", qname)
+
+        prefixes_seen = set()
+        for u, prefix in _iter_namespaces(self._declared):
+            if u == uri and prefix not in prefixes_seen:
+                return f"{prefix}:{tag}" if prefix else tag, tag, uri
+            prefixes_seen.add(prefix)
+
+        if not uri and "" not in prefixes_seen:
+            # no default namespace declared => no prefix needed
+            return tag, tag, uri
+
+        for u, prefix in _iter_namespaces(self._ns_stack):
+            if u == uri:
+                self._declared[-1].append((uri, prefix))
+                return f"{prefix}:{tag}" if prefix else tag, tag, uri
+
+        if not uri:
+            return tag, tag, uri
+        raise ValueError(f'Namespace "{uri}" is not declared in scope')
+
+
+def _clark(name: tuple[str | None, str]) -> str:
+    return f"{{{name[0]}}}{name[1]}" if name[0] else name[1]
+
+
+def _iter_namespaces(stack: list[list[tuple[str, str]]]) -> Iterator[tuple[str, str]]:
+    for namespaces in reversed(stack):
+        yield from namespaces
+
+
+class CanonicalXmlWriter(XmlWriter):
+    """Streaming writer for canonical (C14N 2.0), pretty-printed output."""
+
+    def build_handler(self) -> ContentHandler:
+        return _CanonicalHandler(self.output.write, self.config.indent or "")
+
+    def start_document(self) -> None:
+        self.handler.startDocument()
@@ -0,0 +1,162 @@
+"""Asynchronous versions of `from_xml` and `from_tiff`, for use with asyncio.
+
+File I/O is performed in (cancellable) chunks in a thread (except for the TIFF
+description read by `from_tiff`, which is read in one call), and parsing is offloaded
+to an executor, so that the event loop is never blocked.  The number of documents
+that are read and parsed at the same time can be limited with `configure`:
+
+```python
+import ome_types.aio
+
+ome_types.aio.configure(max_concurrency=4)
+ome = await ome_types.aio.from_xml("big_plate.ome.xml")
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import weakref
+from contextlib import asynccontextmanager, nullcontext
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ome_types import _conversion
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+    from concurrent.futures import Executor
+    from typing import Any, BinaryIO, TypeVar
+
+    from ome_types._conversion import XMLSource
+    from ome_types.model import OME
+
+    T = TypeVar("T")
+
+__all__ = ["configure", "from_tiff", "from_xml"]
+
+# size of the chunks in which files are read
+READ_SIZE = 1 << 20
+
+
+class _Config:
+    executor: Executor | None = None
+    max_concurrency: int | None = None
+
+
+_CONFIG = _Config()
+# one semaphore per event loop (asyncio primitives can't be shared across loops)
+_SEMAPHORES: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def configure(
+    *, executor: Executor | None = None, max_concurrency: int | None = None
+) -> None:
+    """Configure the default executor and concurrency limit.
+
+    Parameters
+    ----------
+    executor : Executor | None
+        The executor used to parse documents.  If None, the default executor of
+        the event loop is used.  A `ProcessPoolExecutor` avoids contention for the GIL
+        (at the cost of pickling the results back).
+    max_concurrency : int | None
+        The maximum number of documents that are read and parsed at the same time
+        (per event loop).  Other calls wait for their turn.  If None, there is no
+        limit.
+    """
+    _CONFIG.executor = executor
+    _CONFIG.max_concurrency = max_concurrency
+    _SEMAPHORES.clear()
+
+
+async def from_xml(
+    source: XMLSource, *, executor: Executor | None = None, **kwargs: Any
+) -> OME:
+    """Asynchronously generate an OME object from an XML document.
+
+    The cancellation of this coroutine takes effect at the next chunk of I/O. If
+    parsing has already started, the parse is abandoned, but it cannot be interrupted
+    in the executor.
+
+    Parameters
+    ----------
+    source : Path | str | bytes | BinaryIO
+        Path to an XML file, string or bytes containing XML, or a file-like object.
+    executor : Executor | None
+        The executor used for parsing, instead of the one set with `configure`.
+    **kwargs : Any
+        Passed to [`ome_types.from_xml`][].
+    """
+    async with _limit():
+        if (
+            isinstance(source, Path)
+            or hasattr(source, "read")
+            or (isinstance(source, str) and os.path.isfile(source))
+        ):
+            source = await _read(source)  # type: ignore[arg-type]
+        return await _run(partial(_conversion.from_xml, source, **kwargs), executor)
+
+
+async def from_tiff(
+    path: Path | str | BinaryIO, *, executor: Executor | None = None, **kwargs: Any
+) -> OME:
+    """Asynchronously generate an OME object from a TIFF file.
+
+    The OME-XML is extracted in a thread, and then parsed as in `from_xml`.  Both
+    steps count towards the `max_concurrency` limit set with `configure`.
+
+    The read of the TIFF description is not cancellable: if this coroutine is
+    cancelled meanwhile, the read still runs to completion in its thread (and its
+    result is discarded).
+
+    Parameters
+    ----------
+    path : Path | str | BinaryIO
+        Path to a TIFF file or a file-like object.
+    executor : Executor | None
+        The executor used for parsing, instead of the one set with `configure`.
+    **kwargs : Any
+        Passed to [`ome_types.from_xml`][].
+    """
+    # (the slot is held while the TIFF is read, not just while it is parsed)
+    async with _limit():
+        xml = await asyncio.to_thread(_conversion.tiff2xml, path)
+        return await _run(partial(_conversion.from_xml, xml, **kwargs), executor)
+
+
+@asynccontextmanager
+async def _limit() -> AsyncIterator[None]:
+    """Bound the number of concurrent calls on the running loop."""
+    if _CONFIG.max_concurrency is None:
+        yield
+        return
+    loop = asyncio.get_running_loop()
+    if loop not in _SEMAPHORES:
+        _SEMAPHORES[loop] = asyncio.Semaphore(_CONFIG.max_concurrency)
+    async with _SEMAPHORES[loop]:
+        yield
+
+
+async def _run(func: Callable[[], T], executor: Executor | None) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or _CONFIG.executor, func)
+
+
+async def _read(source: Path | str | BinaryIO) -> bytes:
+    """Read a file, or file-like object, in chunks (in a thread)."""
+    if hasattr(source, "read"):
+        ctx: Any = nullcontext(source)
+    else:
+        ctx = await asyncio.to_thread(open, source, "rb")
+
+    chunks = []
+    with ctx as fh:
+        # each chunk is a cancellation point
+        while chunk := await asyncio.to_thread(fh.read, READ_SIZE):
+            chunks.append(chunk)
+    return b"".join(chunks)
@@ -0,0 +1,665 @@
+"""Compact, columnar containers for `Pixels.planes` and `Pixels.tiff_data_blocks`.
+
+An image with tens of thousands of planes has as many `Plane` (and often `TiffData`)
+objects, which are slow to create and take a lot of memory.  The containers in this
+module store the fields of these objects as the columns of a NumPy structured array
+instead, while still behaving like a list of model objects:
+
+```python
+ome = from_xml("timelapse.ome.xml", columnar=True)
+planes = ome.images[0].pixels.planes  # a PlaneArray
+
+planes[0].delta_t  # items are (lazily created) Plane objects
+planes["delta_t"]  # whole columns are NumPy arrays
+planes.where(the_c=2)  # all planes with the_c == 2
+```
+
+Containers can also be created from existing objects, and assigned to a `Pixels`:
+`pixels.planes = PlaneArray(pixels.planes)`.  Objects added to a container are
+copied into its columns.
+
+Items are created on first access, and are then kept (so that modifying them
+works as expected), which means that iterating over all the items of a container
+gives up most of its memory savings.  Vectorized access (`column`, `mask`, `where`)
+and serialization don't create any items.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableSequence, Sequence
+from enum import Enum
+from functools import cache
+from itertools import zip_longest
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Generic,
+    TypeVar,
+    cast,
+    get_args,
+    get_origin,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError(
+        "NumPy is required to use columnar containers in ome-types. "
+        "Install with `pip install ome-types[numpy]`."
+    ) from None
+
+from ome_types._mixins._base_type import OMEType
+from ome_types._mixins._construct import trusted_factory
+from ome_types.model import Pixels, Plane, TiffData
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    import numpy.typing as npt
+
+__all__ = ["ColumnarList", "PlaneArray", "TiffDataArray"]
+
+M = TypeVar("M", bound=OMEType)
+
+# the bookkeeping columns, after those of the model fields
+_SET = "__set__"  # bit mask of the fields in `model_fields_set`
+_NULL = "__null__"  # bit mask of the fields that are None
+_ITEM = "__item__"  # the model object for this row, once created
+
+
+class _Column:
+    """How a model field is stored in (and restored from) its column."""
+
+    __slots__ = (
+        "bit",
+        "default",
+        "dtype",
+        "ge",
+        "kind",
+        "members",
+        "name",
+        "parse",
+        "required",
+    )
+
+    def __init__(self, name: str, annotation: Any, field: Any, bit: int) -> None:
+        self.name = name
+        self.bit = bit
+        self.members: list[Enum] = []
+        self.ge = next((m.ge for m in field.metadata if hasattr(m, "ge")), None)
+        self.parse: Callable[[str], Any] | None = None
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            self.kind = "enum"
+            self.members = list(annotation)
+            self.dtype = "u1" if len(self.members) < 256 else "u2"
+            codes = {m.value: i for i, m in enumerate(self.members)}
+            self.parse = codes.__getitem__
+        elif annotation is bool:
+            self.kind, self.dtype = "bool", "?"
+            self.parse = {"true": True, "1": True, "false": False, "0": False}.get
+        elif annotation is int:
+            self.kind, self.dtype, self.parse = "int", "i8", int
+        elif annotation is float:
+            self.kind, self.dtype, self.parse = "float", "f8", float
+        else:
+            self.kind, self.dtype = "object", "O"
+            if annotation is str:
+                self.parse = str
+        self.required = field.is_required()
+        self.default = None if self.required else field.get_default()
+
+    def encode(self, value: Any) -> Any:
+        """Return the value stored in the column for a (non-None) field value."""
+        if self.kind == "enum":
+            return self.members.index(value)
+        return value
+
+    def decode(self, value: Any) -> Any:
+        """Return the field value for a (non-null) value of the column."""
+        if self.kind == "enum":
+            return self.members[value]
+        if isinstance(value, OMEType):
+            # nested objects may be shared by several rows
+            return value.model_copy()
+        return value
+
+    @property
+    def fill(self) -> Any:
+        """The value stored for None."""
+        return {"float": np.nan, "object": None}.get(self.kind, 0)
+
+
+class _Layout:
+    """The columns of a model class."""
+
+    def __init__(self, model: type[OMEType]) -> None:
+        self.columns: list[_Column] = []
+        # fields that hold lists: rows with (non-empty) lists keep their object
+        self.list_fields: list[str] = []
+        # XML attribute and child element names -> column
+        self.attributes: dict[str, _Column] = {}
+        self.elements: dict[str, tuple[_Column, type | None]] = {}
+        for name, field in model.model_fields.items():
+            extra = cast("dict", field.json_schema_extra or {})
+            annotation = field.annotation
+            if get_origin(annotation) is list:
+                self.list_fields.append(name)
+                continue
+            args = [a for a in get_args(annotation) if a is not type(None)]
+            if args:  # Optional[...]
+                annotation = args[0]
+            column = _Column(name, annotation, field, 1 << len(self.columns))
+            self.columns.append(column)
+            if extra.get("type") == "Attribute":
+                self.attributes[extra["name"]] = column
+            elif isinstance(annotation, type) and issubclass(annotation, OMEType):
+                self.elements[extra["name"]] = (column, annotation)
+
+        mask = "u4" if len(self.columns) <= 32 else "u8"
+        self.dtype = np.dtype(
+            [(c.name, c.dtype) for c in self.columns]
+            + [(_SET, mask), (_NULL, mask), (_ITEM, "O")]
+        )
+        self.by_name = {c.name: c for c in self.columns}
+        self.required = sum(c.bit for c in self.columns if c.required)
+
+    def encode(self, obj: OMEType) -> tuple:
+        """Return the row for a model object."""
+        values = obj.__dict__
+        row = []
+        null = 0
+        for column in self.columns:
+            value = values[column.name]
+            if value is None:
+                null |= column.bit
+                row.append(column.fill)
+            else:
+                row.append(column.encode(value))
+        fields_set = obj.model_fields_set
+        set_mask = sum(c.bit for c in self.columns if c.name in fields_set)
+        # objects that can't be restored from their columns are kept
+        keep = any(values[name] for name in self.list_fields)
+        return (*row, set_mask, null, obj if keep else None)
+
+    def decode(self, model: type[M], row: tuple) -> M:
+        """Create a model object from a row (as returned by `ndarray.tolist()`)."""
+        set_mask, null = row[-3], row[-2]
+        values = {}
+        fields_set = set()
+        for column, value in zip(self.columns, row):
+            values[column.name] = None if null & column.bit else column.decode(value)
+            if set_mask & column.bit:
+                fields_set.add(column.name)
+        # (like `model_construct`, but faster)
+        obj = trusted_factory(model, values)
+        object.__setattr__(obj, "__pydantic_fields_set__", fields_set)
+        return obj  # type: ignore[return-value]
+
+
+@cache
+def _layout(model: type[OMEType]) -> _Layout:
+    return _Layout(model)
+
+
+class ColumnarList(MutableSequence[M], Generic[M]):
+    """A list of model objects, stored as the columns of a NumPy structured array.
+
+    Use one of the concrete subclasses: `PlaneArray` or `TiffDataArray`.
+
+    Parameters
+    ----------
+    items : Iterable[M]
+        The initial items (copied into the columns).
+    """
+
+    model: ClassVar[type[OMEType]]
+
+    def __init__(self, items: Iterable[M] = ()) -> None:
+        self._layout = _layout(self.model)
+        self._buf = np.empty(0, dtype=self._layout.dtype)
+        self._len = 0
+        # whether any row may have an item (see `_ITEM`)
+        self._has_items = False
+        self.extend(items)
+
+    # ------------------------ sequence protocol ------------------------
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return self._len
+
+    def __getitem__(self, index: Any) -> Any:
+        """Return an item, a list of items (for a slice, mask or indices) or a column.
+
+        Parameters
+        ----------
+        index : int | slice | str | array-like
+            An index, a slice, a field name (returns `column(index)`), an array of
+            indices, or a boolean mask (e.g. returned by `mask`).
+        """
+        if isinstance(index, str):
+            return self.column(index)
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(self._len))]
+        if isinstance(index, (Sequence, np.ndarray)):
+            return [self._item(int(i)) for i in self._indices(index)]
+        return self._item(self._check_index(index))
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        """Replace an item, or a slice of items (copied into the columns)."""
+        rows = self._rows
+        if isinstance(index, slice):
+            new = self._encode_many(value)
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                stop = max(start, stop)
+                self._set_rows(np.concatenate([rows[:start], new, rows[stop:]]))
+                return
+            indices = range(start, stop, step)
+            if len(new) != len(indices):
+                raise ValueError(
+                    f"attempt to assign sequence of size {len(new)} to extended "
+                    f"slice of size {len(indices)}"
+                )
+            rows[list(indices)] = new
+        else:
+            rows[self._check_index(index)] = self._encode(value)
+        self._has_items = True
+
+    def __delitem__(self, index: int | slice) -> None:
+        """Delete an item, or a slice of items."""
+        keep = np.ones(self._len, dtype=bool)
+        if isinstance(index, slice):
+            keep[index] = False
+        else:
+            keep[self._check_index(index)] = False
+        self._set_rows(self._rows[keep])
+
+    def __iter__(self) -> Iterator[M]:
+        """Iterate over the items (creating and keeping them, see `iter_models`)."""
+        for i in range(self._len):
+            yield self._item(i)
+
+    def insert(self, index: int, value: M) -> None:
+        """Insert an item (copied into the columns) before `index`."""
+        index = min(max(index + self._len if index < 0 else index, 0), self._len)
+        self._reserve(1)
+        buf = self._buf
+        buf[index + 1 : self._len + 1] = buf[index : self._len]
+        buf[index] = self._encode(value)
+        self._len += 1
+        self._has_items = True
+
+    def append(self, value: M) -> None:
+        """Append an item (copied into the columns)."""
+        self._reserve(1)
+        self._buf[self._len] = self._encode(value)
+        self._len += 1
+        self._has_items = True
+
+    def extend(self, values: Iterable[M]) -> None:
+        """Append items (copied into the columns)."""
+        new = self._encode_many(values)
+        self._reserve(len(new))
+        self._buf[self._len : self._len + len(new)] = new
+        self._len += len(new)
+        self._has_items = True
+
+    def clear(self) -> None:
+        """Remove all items."""
+        self._set_rows(self._buf[:0])
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the items with those of another sequence."""
+        if isinstance(other, ColumnarList):
+            other = other.iter_models()  # type: ignore[assignment]
+        elif isinstance(other, Sequence) and not isinstance(other, str):
+            if len(other) != self._len:
+                return False
+        else:
+            return NotImplemented
+        pairs = zip_longest(self.iter_models(), other, fillvalue=object())
+        return all(a == b for a, b in pairs)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return a short representation (without the items)."""
+        return f"{type(self).__name__}(<{self._len} {self.model.__name__}>)"
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Return the state for pickling."""
+        return {"rows": self._rows.copy()}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the state from pickling."""
+        self._layout = _layout(self.model)
+        self._set_rows(state["rows"])
+
+    # ------------------------ vectorized access ------------------------
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """The names of the fields that are stored as columns."""
+        return tuple(self._layout.by_name)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the values of a field for all items, as a new NumPy array.
+
+        Missing values (None) are NaN for numeric fields (so optional integer fields
+        are returned as floats), and None otherwise. Enum fields are returned as
+        arrays of enum members.
+        """
+        try:
+            column = self._layout.by_name[name]
+        except KeyError:
+            raise KeyError(
+                f"{self.model.__name__} field {name!r} is not stored as a column. "
+                f"Available columns are: {self.fields}"
+            ) from None
+        self._sync()
+        rows = self._rows
+        values = rows[name]
+        null = (rows[_NULL] & column.bit).astype(bool)
+        if column.kind == "enum":
+            out = np.empty(len(values), dtype=object)
+            out[:] = [column.members[v] for v in values.tolist()]
+        elif column.kind in ("int", "bool") and null.any():
+            out = values.astype(float if column.kind == "int" else object)
+        else:
+            return values.copy()
+        out[null] = np.nan if column.kind == "int" else None
+        return out
+
+    def mask(self, **criteria: Any) -> npt.NDArray[np.bool_]:
+        """Return a boolean mask of the items whose fields have the given values.
+
+        Each keyword argument is a field name, and either a value (compared for
+        equality) or a list of values (matching any of them), e.g.
+        `planes.mask(the_c=2, the_t=[0, 1])`.
+        """
+        mask = np.ones(self._len, dtype=bool)
+        for name, value in criteria.items():
+            values = self.column(name)
+            column = self._layout.by_name[name]
+            many = isinstance(value, (list, tuple, set, np.ndarray))
+            if column.kind == "enum":
+                # (accept enum values, like the model fields do)
+                enum = type(column.members[0])
+                value = [enum(v) for v in value] if many else enum(value)
+            if many:
+                mask &= np.isin(values, list(value))
+            else:
+                mask &= values == value
+        return mask
+
+    def where(self, **criteria: Any) -> list[M]:
+        """Return the items whose fields have the given values (see `mask`)."""
+        return self[self.mask(**criteria)]  # type: ignore[no-any-return]
+
+    def iter_models(self) -> Iterator[M]:
+        """Iterate over the items, without keeping them.
+
+        Items that have already been created are yielded as they are, the others
+        are created from the columns (and discarded by the container).
+        """
+        layout = self._layout
+        for row in self._rows.tolist():
+            item = row[-1]
+            yield layout.decode(self.model, row) if item is None else item  # type: ignore
+
+    # ------------------------ internals ------------------------
+
+    @property
+    def _rows(self) -> np.ndarray:
+        return self._buf[: self._len]
+
+    def _set_rows(self, rows: np.ndarray) -> None:
+        self._buf = rows
+        self._len = len(rows)
+        self._has_items = True
+
+    def _reserve(self, n: int) -> None:
+        if self._len + n > len(self._buf):
+            buf = np.empty(
+                max(self._len + n, 2 * len(self._buf)), dtype=self._buf.dtype
+            )
+            buf[: self._len] = self._rows
+            self._buf = buf
+
+    def _check_index(self, index: int) -> int:
+        index = int(index)
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return index
+
+    def _indices(self, index: Any) -> np.ndarray:
+        index = np.asarray(index)
+        if index.dtype == bool:
+            if index.shape != (self._len,):
+                raise IndexError(
+                    f"boolean index of shape {index.shape} does not match "
+                    f"{type(self).__name__} of length {self._len}"
+                )
+            return np.flatnonzero(index)
+        return np.arange(self._len)[index]
+
+    def _item(self, index: int) -> M:
+        row = self._buf[index]
+        item = row[_ITEM]
+        if item is None:
+            item = row[_ITEM] = self._layout.decode(self.model, row.item())
+            self._has_items = True
+        return item  # type: ignore[no-any-return]
+
+    def _items(self) -> Iterator[M]:
+        """Iterate over the items that have been created (or kept)."""
+        if self._has_items:
+            yield from (i for i in self._rows[_ITEM].tolist() if i is not None)
+
+    def _sync(self) -> None:
+        """Write the fields of created items back to the columns."""
+        if not self._has_items:
+            return
+        rows = self._rows
+        any_items = False
+        for index, item in enumerate(rows[_ITEM].tolist()):
+            if item is not None:
+                any_items = True
+                row = self._layout.encode(item)
+                rows[index] = (*row[:-1], item)
+        self._has_items = any_items
+
+    def _encode(self, value: Any) -> tuple:
+        if not isinstance(value, self.model):
+            value = self.model.model_validate(value)
+        row = self._layout.encode(value)
+        if row[-1] is not None:
+            # (copied, like the rest of the row)
+            row = (*row[:-1], value.model_copy(deep=True))
+        return row
+
+    def _encode_many(self, values: Iterable[Any]) -> np.ndarray:
+        if isinstance(values, ColumnarList) and values.model is self.model:
+            values._sync()
+            rows = values._rows.copy()
+            items = rows[_ITEM]
+            for index, item in enumerate(items.tolist()):
+                if item is not None:
+                    keep = any(getattr(item, n) for n in self._layout.list_fields)
+                    items[index] = item.model_copy(deep=True) if keep else None
+            return rows
+        return np.array([self._encode(v) for v in values], dtype=self._layout.dtype)
+
+    @classmethod
+    def _from_elements(
+        cls, elements: list[Any], parse: Callable[[Any, type], Any]
+    ) -> ColumnarList:
+        """Create a container from XML elements (see `from_xml(..., columnar=True)`).
+
+        Parameters
+        ----------
+        elements : list
+            lxml or ElementTree elements for the model class.
+        parse : Callable[[element, type], OMEType]
+            Parses an element into an instance of a model class. Used for elements
+            that can't be stored directly in the columns, and for nested objects.
+        """
+        layout = _layout(cls.model)
+        columns = layout.columns
+        template = [
+            c.fill if c.default is None else c.encode(c.default) for c in columns
+        ]
+        default_null = sum(c.bit for c in columns if c.default is None)
+        index_of = {c.name: i for i, c in enumerate(columns)}
+        # nested objects are parsed once, and shared by all rows that have them
+        nested: dict[tuple, Any] = {}
+
+        rows = []
+        for elem in elements:
+            row = list(template)
+            set_mask = 0
+            null = default_null
+            try:
+                for key, value in elem.attrib.items():
+                    column = layout.attributes.get(key)
+                    if column is None:
+                        continue  # (e.g. xsi attributes)
+                    if column.parse is None:
+                        raise _Unsupported
+                    parsed = column.parse(value)
+                    if parsed is None:
+                        raise ValueError(f"invalid value for {key}: {value!r}")
+                    row[index_of[column.name]] = parsed
+                    set_mask |= column.bit
+                    null &= ~column.bit
+                for child in elem:
+                    if not isinstance(child.tag, str):
+                        continue  # comments
+                    entry = layout.elements.get(child.tag.rsplit("}", 1)[-1])
+                    if entry is None or len(child):
+                        raise _Unsupported
+                    column, clazz = entry
+                    key = (child.tag, child.text, tuple(sorted(child.attrib.items())))
+                    if key not in nested:
+                        nested[key] = parse(child, clazz)  # type: ignore
+                    row[index_of[column.name]] = nested[key]
+                    set_mask |= column.bit
+                    null &= ~column.bit
+            except (_Unsupported, KeyError):
+                # (KeyError: unknown enum value, let the parser report it)
+                rows.append(layout.encode(parse(elem, cls.model)))
+                continue
+            except ValueError as e:
+                raise ValueError(f"Invalid {cls.model.__name__} element: {e}") from e
+            if missing := layout.required & ~set_mask:
+                names = [c.name for c in columns if c.bit & missing]
+                raise ValueError(
+                    f"Invalid {cls.model.__name__} element: missing {names}"
+                )
+            rows.append((*row, set_mask, null, None))
+
+        array = cls()
+        array._set_rows(np.array(rows, dtype=layout.dtype))
+        array._has_items = any(row[-1] is not None for row in rows)
+        for column in columns:
+            if column.ge is not None and (array._buf[column.name] < column.ge).any():
+                raise ValueError(
+                    f"Invalid {cls.model.__name__} element: "
+                    f"{column.name} must be >= {column.ge}"
+                )
+        return array
+
+
+class _Unsupported(Exception):
+    """An element that can't be converted to a row directly."""
+
+
+class PlaneArray(ColumnarList[Plane]):
+    """A columnar list of `Plane` objects (see `ColumnarList`)."""
+
+    model = Plane
+
+
+class TiffDataArray(ColumnarList[TiffData]):
+    """A columnar list of `TiffData` objects (see `ColumnarList`)."""
+
+    model = TiffData
+
+
+# ------------------------ parsing ------------------------
+
+_COLUMNAR_FIELDS: dict[str, tuple[str, type[ColumnarList]]] = {
+    "Plane": ("planes", PlaneArray),
+    "TiffData": ("tiff_data_blocks", TiffDataArray),
+}
+
+
+class ColumnarParser:
+    """Wraps a parser, so that `Plane` and `TiffData` elements become columnar.
+
+    The elements are removed from each `Pixels` element before the rest of the
+    document is parsed (and put back afterwards), and converted to containers that
+    are assigned to the resulting `Pixels` objects.
+    """
+
+    def __init__(self, parser: Any) -> None:
+        self.parser = parser
+        # whether some rows kept their object, whose references need linking
+        self.needs_linking = False
+
+    def parse(self, source: Any, clazz: type) -> Any:
+        root = source.getroot() if hasattr(source, "getroot") else source
+        tag = root.tag if isinstance(root.tag, str) else ""
+        ns = tag[: tag.index("}") + 1] if tag.startswith("{") else ""
+
+        restore: list[tuple[Any, list]] = []
+        blocks: list[dict[str, ColumnarList]] = []
+        try:
+            for pixels in root.iter(f"{ns}Pixels"):
+                children = list(pixels)
+                elements: dict[str, list] = {name: [] for name in _COLUMNAR_FIELDS}
+                for child in children:
+                    if isinstance(child.tag, str):
+                        name = child.tag.rsplit("}", 1)[-1]
+                        if name in elements:
+                            elements[name].append(child)
+                            pixels.remove(child)
+                restore.append((pixels, children))
+                block = {}
+                for name, (field, array_type) in _COLUMNAR_FIELDS.items():
+                    array = array_type._from_elements(elements[name], self.parser.parse)
+                    self.needs_linking |= array._has_items
+                    block[field] = array
+                blocks.append(block)
+            result = self.parser.parse(source, clazz)
+        finally:
+            for pixels, children in restore:
+                pixels[:] = children
+
+        if blocks:
+            targets = _iter_pixels(result)
+            if len(targets) != len(blocks):  # pragma: no cover
+                raise RuntimeError("Could not match Pixels elements to objects")
+            for pixels, block in zip(targets, blocks):
+                for field, array in block.items():
+                    pixels.__dict__[field] = array
+                    if array:
+                        pixels.model_fields_set.add(field)
+        return result
+
+
+def _iter_pixels(obj: Any) -> list[Pixels]:
+    """Return the Pixels objects in `obj`, in document order."""
+    from ome_types.model import OME, Image
+
+    if isinstance(obj, Pixels):
+        return [obj]
+    if isinstance(obj, Image):
+        return [obj.pixels]
+    if isinstance(obj, OME):
+        return [image.pixels for image in obj.images]
+    return []
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import weakref
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
 from xml.etree.ElementTree import QName
 
+from pydantic import BaseModel
 from xsdata.formats.dataclass import context, parsers, serializers
 from xsdata.formats.dataclass.serializers import config
 from xsdata.formats.dataclass.serializers.mixins import XmlWriterEvent
@@ -11,11 +13,12 @@ from xsdata.models.enums import QNames
 from xsdata.utils import collections, namespaces
 from xsdata.utils.constants import EMPTY_MAP, return_input
 
+from xsdata_pydantic_basemodel.pydantic_compat import field_defaults
+
 if TYPE_CHECKING:
     from collections.abc import Generator, Iterator
 
-    from pydantic import BaseModel
-    from xsdata.formats.dataclass.models.elements import XmlMeta
+    from xsdata.formats.dataclass.models.elements import XmlMeta, XmlVar
 
 
 class XmlContext(context.XmlContext):
@@ -50,15 +53,112 @@ class XmlParser(parsers.XmlParser):
     context: XmlContext = field(default_factory=XmlContext)
 
 
+class _AttributePlan(NamedTuple):
+    """How to serialize one attribute (or wildcard attributes) field of a class."""
+
+    name: str
+    var: XmlVar
+    # the default value, for `ignore_default_attributes` (`_REQUIRED` if required)
+    default: Any
+
+
+class _ElementPlan(NamedTuple):
+    """How to serialize one element (or text) field of a class."""
+
+    name: str
+    var: XmlVar
+    # the model classes that can be converted directly (without xsi:type)
+    model_types: tuple[type, ...]
+    # whether None values are still rendered
+    nillable: bool
+
+
+class _ClassPlan(NamedTuple):
+    """Precomputed serialization plan for a model class."""
+
+    meta: XmlMeta
+    namespace: str | None
+    attributes: tuple[_AttributePlan, ...]
+    # None if the class has sequential fields (they need `next_value`)
+    elements: tuple[_ElementPlan, ...] | None
+
+
+_REQUIRED = object()
+# serialization plans (without an attribute_sort_key), per context, per
+# (class, namespace)
+_PLANS: weakref.WeakKeyDictionary[context.XmlContext, dict[tuple, _ClassPlan]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _attribute_plan(var: XmlVar) -> _AttributePlan:
+    if var.required:
+        default = _REQUIRED
+    else:
+        default = var.default() if callable(var.default) else var.default
+    return _AttributePlan(var.name, var, default)
+
+
+def _element_plan(var: XmlVar) -> _ElementPlan:
+    # see `convert_value` & `convert_xsi_type` for the conditions under which a
+    # model value ends up in a plain `convert_dataclass` call
+    direct = (
+        var.is_element
+        and var.clazz is not None
+        and not (var.mixed or var.tokens or var.any_type or var.wrapper_qname)
+    )
+    model_types = tuple(t for t in var.types if direct and _is_model(t))
+    return _ElementPlan(var.name, var, model_types, var.nillable and var.required)
+
+
+def _build_plan(meta: XmlMeta, sort_key: Callable | None) -> _ClassPlan:
+    attribute_vars = meta.get_attribute_vars()
+    if sort_key is not None:
+        attribute_vars = sorted(attribute_vars, key=sort_key)
+    element_vars = meta.get_element_vars()
+    sequential = any(var.sequence is not None for var in element_vars)
+    return _ClassPlan(
+        meta=meta,
+        namespace=namespaces.split_qname(meta.qname)[0],
+        attributes=tuple(map(_attribute_plan, attribute_vars)),
+        elements=None if sequential else tuple(map(_element_plan, element_vars)),
+    )
+
+
+def _is_model(clazz: type) -> bool:
+    return isinstance(clazz, type) and issubclass(clazz, BaseModel)
+
+
 @dataclass
 class XmlSerializer(serializers.XmlSerializer):
     context: XmlContext = field(default_factory=XmlContext)
 
-    # overriding so we can pass the args we want to next_attribute
-    # and so that we can skip unset values
+    def __post_init__(self) -> None:
+        self._plans = _PLANS.setdefault(self.context, {})
+        # plans with an attribute_sort_key are only kept by this serializer (sort
+        # keys are often lambdas, which would otherwise accumulate in _PLANS)
+        self._sorted_plans: dict[tuple, _ClassPlan] = {}
+
+    def _plan(self, clazz: type, namespace: str | None) -> _ClassPlan:
+        """Return the (cached) serialization plan of a class."""
+        sort_key = getattr(self.config, "attribute_sort_key", None)
+        key: tuple
+        if sort_key is None:
+            plans, key = self._plans, (clazz, namespace)
+        else:
+            plans, key = self._sorted_plans, (clazz, namespace, sort_key)
+        try:
+            return plans[key]
+        except KeyError:
+            meta = self.context.build(clazz, namespace, globalns=self.config.globalns)
+            plan = plans[key] = _build_plan(meta, sort_key)
+            return plan
+
+    # overriding so that we can skip unset values, and so that we use precomputed
+    # plans rather than reflecting on the metadata of each object
     def convert_dataclass(
         self,
-        obj: BaseModel,
+        obj: Any,
         namespace: str | None = None,
         qname: str | None = None,
         nillable: bool = False,
@@ -70,33 +170,74 @@ class XmlSerializer(serializers.XmlSerializer):
         Optionally override the qualified name and the xsi properties
         type and nil.
         """
-        meta = self.context.build(
-            obj.__class__, namespace, globalns=self.config.globalns
-        )
-        qname = qname or meta.qname
+        plan = self._plan(obj.__class__, namespace)
+        meta = plan.meta
+        if qname:
+            namespace = namespaces.split_qname(qname)[0]
+        else:
+            qname, namespace = meta.qname, plan.namespace
         nillable = nillable or meta.nillable
-        namespace, _tag = namespaces.split_qname(qname)
 
         yield XmlWriterEvent.START, qname
 
         # XXX: reason 1 for overriding.
-        ignore_unset = getattr(self.config, "ignore_unset_attributes", False)
-        for key, value in self.next_attribute(
-            obj,
-            meta,
-            nillable,
-            xsi_type,
-            self.config.ignore_default_attributes,
-            ignore_unset,
-            getattr(self.config, "attribute_sort_key", None),
-        ):
-            yield XmlWriterEvent.ATTR, key, value
-
-        for var, value in self.next_value(obj, meta):
-            # XXX: reason 2 for overriding.
-            if ignore_unset and var.name not in obj.model_fields_set:
-                continue
-            yield from self.convert_value(value, var, namespace)
+        fields_set = None
+        if getattr(self.config, "ignore_unset_attributes", False):
+            fields_set = update_fields_set(obj)
+
+        ignore_optionals = self.config.ignore_default_attributes
+        for name, var, default in plan.attributes:
+            if var.is_attribute:
+                value = getattr(obj, name)
+                if (
+                    value is None
+                    or (ignore_optionals and value == default)
+                    or (fields_set is not None and name not in fields_set)
+                    or (not value and collections.is_array(value))
+                ):
+                    continue
+                if value.__class__ is not str:
+                    value = self.encode_primitive(value, var)
+                yield XmlWriterEvent.ATTR, var.qname, value
+            else:
+                for key, value in getattr(obj, name, EMPTY_MAP).items():
+                    yield XmlWriterEvent.ATTR, key, value
+        if xsi_type:
+            yield XmlWriterEvent.ATTR, QNames.XSI_TYPE, QName(xsi_type)
+        if nillable:
+            yield XmlWriterEvent.ATTR, QNames.XSI_NIL, "true"
+
+        if plan.elements is None:
+            for var, value in self.next_value(obj, meta):
+                # XXX: reason 2 for overriding.
+                if fields_set is not None and var.name not in fields_set:
+                    continue
+                yield from self.convert_value(value, var, namespace)
+        else:
+            for name, var, model_types, nillable_var in plan.elements:
+                # XXX: reason 2 for overriding.
+                if fields_set is not None and name not in fields_set:
+                    continue
+                value = getattr(obj, name)
+                if value is None and not nillable_var:
+                    continue
+                if not model_types:
+                    yield from self.convert_value(value, var, namespace)
+                    continue
+                # shortcut for (lists of) nested models: the most common case
+                if not (var.list_element and collections.is_array(value)):
+                    # (sequences with their own iteration, e.g. ome_types.columnar)
+                    iter_models = getattr(value, "iter_models", None)
+                    value = (
+                        iter_models() if var.list_element and iter_models else (value,)
+                    )
+                for item in value:
+                    if item.__class__ in model_types:
+                        yield from self.convert_dataclass(
+                            item, namespace, var.qname, var.nillable
+                        )
+                    else:
+                        yield from self.convert_value(item, var, namespace)
 
         yield XmlWriterEvent.END, qname
 
@@ -154,6 +295,25 @@ class XmlSerializer(serializers.XmlSerializer):
             yield QNames.XSI_NIL, "true"
 
 
+def update_fields_set(obj: BaseModel) -> set[str]:
+    """Add populated fields that differ from their default to `model_fields_set`.
+
+    Pydantic isn't aware of mutations to sequences (e.g. `image.rois.append(...)`)
+    so such fields may be missing from `model_fields_set`.  We assume that if a
+    field is truthy and not equal to its default value, then it has been set.
+
+    This is only done for the object at hand (not recursively): the serializer calls
+    it on each object as it walks the tree, so the document is traversed only once.
+    """
+    fields_set = obj.model_fields_set
+    for name, default in field_defaults(type(obj)).items():
+        if name not in fields_set:
+            value = getattr(obj, name)
+            if value and value != default:
+                fields_set.add(name)
+    return fields_set
+
+
 @dataclass
 class JsonParser(parsers.JsonParser):
     context: XmlContext = field(default_factory=XmlContext)
@@ -93,3 +93,20 @@ def dataclass_fields(obj: type[M]) -> tuple[dc.Field, ...]:
         _pydantic_field_to_dataclass_field(name, f)
         for name, f in obj.model_fields.items()  # type: ignore
     )
+
+
+@cache
+def field_defaults(obj: type[M]) -> dict[str, Any]:
+    """Return the default value of each field of the given pydantic model class.
+
+    Default factories are called once, so the returned values must not be mutated.
+    Required fields are omitted.
+    """
+    defaults = {}
+    for name, f in obj.model_fields.items():  # type: ignore
+        default_factory, default = _get_defaults(f)
+        if default_factory is not dc.MISSING:
+            defaults[name] = default_factory()
+        elif default is not dc.MISSING:
+            defaults[name] = default
+    return defaults
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 import sys
 from collections import defaultdict
 from pathlib import Path
@@ -59,6 +60,22 @@ def single_xml() -> Path:
     return DATA / "example.ome.xml"
 
 
+class CountingReader(io.BytesIO):
+    """In-memory binary file that counts the bytes read from it."""
+
+    bytes_read = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+@pytest.fixture
+def counting_reader() -> type[CountingReader]:
+    return CountingReader
+
+
 def pytest_addoption(parser: pytest.Parser) -> None:
     parser.addoption(
         "--ome-watch",
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from ome_types import _conversion, aio, from_tiff, from_xml
+
+DATA = Path(__file__).parent / "data"
+XML = DATA / "two-screens-two-plates-four-wells.ome.xml"
+
+
+@pytest.fixture(autouse=True)
+def _reset_config() -> Any:
+    yield
+    aio.configure()
+
+
+@pytest.mark.parametrize("kind", ["path", "str", "bytes", "file"])
+def test_from_xml(kind: str) -> None:
+    expected = from_xml(XML)
+
+    async def main() -> Any:
+        if kind == "file":
+            with open(XML, "rb") as fh:
+                return await aio.from_xml(fh)
+        source: Any = {"path": XML, "str": str(XML), "bytes": XML.read_bytes()}[kind]
+        return await aio.from_xml(source)
+
+    assert asyncio.run(main()) == expected
+
+
+def test_from_tiff() -> None:
+    path = DATA / "ome.tiff"
+    with ThreadPoolExecutor(1) as executor:
+        ome = asyncio.run(aio.from_tiff(path, executor=executor))
+    assert ome == from_tiff(path)
+
+
+def test_bounded_concurrency() -> None:
+    active = peak = 0
+    lock = threading.Lock()
+    original = _conversion.from_xml
+
+    def slow_from_xml(*args: Any, **kwargs: Any) -> Any:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        try:
+            return original(*args, **kwargs)
+        finally:
+            with lock:
+                active -= 1
+
+    async def main() -> list:
+        return await asyncio.gather(*(aio.from_xml(XML) for _ in range(6)))
+
+    with ThreadPoolExecutor(6) as executor:
+        aio.configure(executor=executor, max_concurrency=2)
+        with patch.object(_conversion, "from_xml", slow_from_xml):
+            results = asyncio.run(main())
+    assert len(results) == 6
+    assert peak == 2
+
+
+def test_bounded_tiff_reads() -> None:
+    active = peak = 0
+    lock = threading.Lock()
+    original = _conversion.tiff2xml
+
+    def slow_tiff2xml(*args: Any, **kwargs: Any) -> Any:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        try:
+            return original(*args, **kwargs)
+        finally:
+            with lock:
+                active -= 1
+
+    async def main() -> list:
+        path = DATA / "ome.tiff"
+        return await asyncio.gather(*(aio.from_tiff(path) for _ in range(4)))
+
+    aio.configure(max_concurrency=1)
+    with patch.object(_conversion, "tiff2xml", slow_tiff2xml):
+        results = asyncio.run(main())
+    assert len(results) == 4
+    assert peak == 1
+
+
+def test_cancel() -> None:
+    aio.configure(max_concurrency=1)
+
+    async def main() -> None:
+        task = asyncio.create_task(aio.from_xml(XML))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # the concurrency slot was released
+        assert (await asyncio.wait_for(aio.from_xml(XML), 5)).images
+
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ome_types import OME, from_tiff, from_tiff_many, from_xml, from_xml_many
+
+DATA = Path(__file__).parent / "data"
+XML = [
+    DATA / "example.ome.xml",
+    DATA / "two-screens-two-plates-four-wells.ome.xml",
+    DATA / "spim.ome.xml",
+]
+
+
+def test_from_xml_many() -> None:
+    paths = [*XML, DATA / "missing.ome.xml", DATA / "ome.tiff"]
+    results = list(from_xml_many(paths, workers=2))
+    assert [p for p, _ in results] == paths
+
+    for path, ome in results[:3]:
+        assert isinstance(ome, OME)
+        assert ome == from_xml(path)
+    # errors are returned, not raised
+    assert isinstance(results[3][1], FileNotFoundError)
+    assert isinstance(results[4][1], Exception)
+
+    # references are re-linked on arrival
+    ome = results[1][1]
+    assert isinstance(ome, OME)
+    ref = ome.plates[0].wells[0].well_samples[0].image_ref
+    assert ref is not None
+    assert ref.ref is ome.images[0]
+
+
+def test_from_tiff_many() -> None:
+    paths = [DATA / "ome.tiff"] * 3
+    expected = from_tiff(paths[0])
+    results = list(from_tiff_many(paths, workers=2, ordered=False))
+    assert all(ome == expected for _, ome in results)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_many_with_executor(ordered: bool) -> None:
+    with ThreadPoolExecutor(2) as executor:
+        results = dict(from_xml_many(XML, executor=executor, ordered=ordered))
+        # the executor is not shut down
+        assert executor.submit(lambda: 1).result() == 1
+    assert set(results) == set(XML)
+    assert all(isinstance(ome, OME) for ome in results.values())
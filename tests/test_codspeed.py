@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import io
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
-from ome_types import OME, from_tiff, from_xml, to_dict, to_xml
+from ome_types import (
+    OME,
+    from_tiff,
+    from_xml,
+    iter_xml,
+    to_dict,
+    to_xml,
+    to_xml_stream,
+    validate_xml,
+    warm_schema_cache,
+)
+from ome_types.model import Channel, Reference
 
 if all(x not in {"--codspeed", "tests/test_codspeed.py"} for x in sys.argv):
     pytest.skip("use --codspeed to run benchmarks", allow_module_level=True)
@@ -21,6 +33,10 @@ SMALL = DATA / "multi-channel.ome.xml"  # 1KB
 MED = DATA / "two-screens-two-plates-four-wells.ome.xml"  # 16KB
 LARGE = DATA / "OverViewScan2-aics.ome.xml"  # 972KB
 XML = [SMALL, MED, LARGE]
+UPGRADE = [
+    DATA / "transformations-upgrade.ome.xml",
+    DATA / "2008_instrument.ome.xml",
+]
 
 
 @pytest.mark.benchmark
@@ -29,17 +45,250 @@ def test_time_from_xml(file: Path) -> None:
     _ = from_xml(file)
 
 
+@pytest.mark.benchmark
+@pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
+def test_time_from_xml_fast(file: Path) -> None:
+    _ = from_xml(file, engine="fast")
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
+def test_time_from_xml_trusted(file: Path) -> None:
+    _ = from_xml(file, trusted=True)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
+def test_time_from_xml_fast_trusted(file: Path) -> None:
+    _ = from_xml(file, engine="fast", trusted=True)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
+def test_time_iter_xml(file: Path) -> None:
+    for _ in iter_xml(file):
+        pass
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
+def test_time_from_xml_lazy_images(file: Path) -> None:
+    _ = from_xml(file, lazy=True).images[0].pixels
+
+
+@pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
+def test_time_from_xml_filelike(
+    file: Path, benchmark: BenchmarkFixture, counting_reader: type[io.BytesIO]
+) -> None:
+    data = file.read_bytes()
+    readers: list[Any] = []
+
+    def _parse() -> None:
+        readers.append(counting_reader(data))
+        from_xml(readers[-1])
+
+    benchmark(_parse)
+    # the document is read (and parsed) exactly once
+    assert all(r.bytes_read == len(data) for r in readers)
+
+
 @pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
 def test_time_to_xml(file: Path, benchmark: BenchmarkFixture) -> None:
     ome = from_xml(file)
     benchmark(lambda: to_xml(ome))
 
 
+@pytest.mark.parametrize("canonicalize", [False, True], ids=["pretty", "canonical"])
+def test_time_to_xml_stream(canonicalize: bool, benchmark: BenchmarkFixture) -> None:
+    ome = from_xml(LARGE)
+    benchmark(lambda: to_xml_stream(ome, io.BytesIO(), canonicalize=canonicalize))
+
+
+@pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
+def test_time_to_xml_canonical(file: Path, benchmark: BenchmarkFixture) -> None:
+    ome = from_xml(file)
+    benchmark(lambda: to_xml(ome, canonicalize=True))
+
+
+def test_time_to_xml_mutated(benchmark: BenchmarkFixture) -> None:
+    # fields populated by mutation are only discovered while serializing
+    ome = from_xml(LARGE)
+    for image in ome.images:
+        image.pixels.planes.extend(image.pixels.planes[:1])
+    benchmark(lambda: to_xml(ome))
+
+
+def test_time_fingerprint(benchmark: BenchmarkFixture) -> None:
+    # only the modified subtree (and its ancestors) is hashed again
+    ome = from_xml(LARGE)
+    ome.fingerprint()
+    plane = ome.images[0].pixels.planes[0]
+
+    def _modify_and_fingerprint() -> None:
+        plane.the_z = 1 - plane.the_z
+        ome.fingerprint()
+
+    benchmark(_modify_and_fingerprint)
+
+
+@pytest.mark.parametrize("file", [DATA / "hcs.ome.xml", LARGE], ids=["hcs", "large"])
+def test_time_link_refs(file: Path, benchmark: BenchmarkFixture) -> None:
+    # (done on construction, deepcopy and unpickling)
+    ome = from_xml(file)
+    benchmark(ome._link_refs)
+
+
+def test_time_referrers(benchmark: BenchmarkFixture) -> None:
+    # references are indexed by target id (and the index is kept up to date)
+    ome = from_xml(MED)
+    targets = list(ome.id_index.values())
+    image = ome.images[0]
+
+    def _modify_and_look_up() -> None:
+        image.name = "a" if image.name == "b" else "b"
+        for target in targets:
+            ome.referrers(target)
+
+    benchmark(_modify_and_look_up)
+
+
+def test_time_walk(benchmark: BenchmarkFixture) -> None:
+    # only the fields that may contain references are walked
+    ome = from_xml(LARGE)
+    benchmark(lambda: list(ome.walk(Reference)))
+
+
+def test_time_update_set_fields(benchmark: BenchmarkFixture) -> None:
+    ome = from_xml(LARGE)
+    benchmark(ome._update_set_fields)
+
+
+@pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
+def test_time_repr(file: Path, benchmark: BenchmarkFixture) -> None:
+    ome = from_xml(file)
+    benchmark(lambda: repr(ome))
+
+
+def test_time_get_by_id(benchmark: BenchmarkFixture) -> None:
+    # the index is built once, and only modified objects are read again
+    ome = from_xml(LARGE)
+    ids = list(ome.id_index)
+    plane = ome.images[0].pixels.planes[0]
+
+    def _modify_and_look_up() -> None:
+        plane.the_z = 1 - plane.the_z
+        for id_ in ids:
+            ome.get_by_id(id_)
+        ome.find(Channel)
+
+    benchmark(_modify_and_look_up)
+
+
+@pytest.fixture(scope="module")
+def many_planes() -> str:
+    from ome_types.model import Image, Pixels, Plane, TiffData
+
+    planes = [
+        Plane(the_z=z, the_c=c, the_t=t, delta_t=t * 0.5, exposure_time=10)
+        for t in range(100)
+        for c in range(4)
+        for z in range(25)
+    ]
+    pixels = Pixels(
+        size_x=1, size_y=1, size_z=25, size_c=4, size_t=100, type="uint8",
+        dimension_order="XYZCT", planes=planes,
+        tiff_data_blocks=[TiffData(ifd=i, plane_count=1) for i in range(len(planes))],
+    )  # fmt: skip
+    return to_xml(OME(images=[Image(pixels=pixels)]))
+
+
+@pytest.mark.parametrize("columnar", [False, True], ids=["lists", "columnar"])
+def test_time_from_xml_many_planes(
+    many_planes: str, columnar: bool, benchmark: BenchmarkFixture
+) -> None:
+    if columnar:
+        pytest.importorskip("numpy")
+    benchmark(lambda: from_xml(many_planes, columnar=columnar, trusted=True))
+
+
+def test_time_columnar_where(many_planes: str, benchmark: BenchmarkFixture) -> None:
+    pytest.importorskip("numpy")
+    planes = from_xml(many_planes, columnar=True).images[0].pixels.planes
+    benchmark(lambda: planes.where(the_c=2, the_z=[0, 1]))
+
+
+def test_time_planes_table(many_planes: str, benchmark: BenchmarkFixture) -> None:
+    pytest.importorskip("numpy")
+    pytest.importorskip("pint")
+    pixels = from_xml(many_planes).images[0].pixels
+    plane = pixels.planes[0]
+
+    def _modify_and_tabulate() -> None:
+        plane.delta_t_unit = "ms" if plane.delta_t_unit.value == "s" else "s"
+        pixels.planes_table(time_unit="ms", as_frame=False)
+
+    benchmark(_modify_and_tabulate)
+
+
+@pytest.fixture(scope="module")
+def many_ids() -> str:
+    from ome_types.model import Experimenter
+
+    experimenters = [Experimenter(id=f"Experimenter:{i}") for i in range(100_000)]
+    return to_xml(OME(experimenters=experimenters))
+
+
+def test_time_from_xml_many_ids(many_ids: str, benchmark: BenchmarkFixture) -> None:
+    # (each ID is validated)
+    benchmark(lambda: from_xml(many_ids, engine="fast"))
+
+
+@pytest.fixture(scope="module")
+def large_bin_data() -> str:
+    from ome_types.model import BinData, Image, Pixels
+
+    # 16 planes of 512x512 uint16 pixels (8 MiB)
+    data = bytes(range(256)) * (512 * 512 * 2 // 256)
+    pixels = Pixels(
+        size_x=512, size_y=512, size_z=16, size_c=1, size_t=1, type="uint16",
+        dimension_order="XYZCT",
+        bin_data_blocks=[
+            BinData(value=data, length=len(data), big_endian=False) for _ in range(16)
+        ],
+    )  # fmt: skip
+    return to_xml(OME(images=[Image(pixels=pixels)]))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"defer": ["BinData"]}, {"skip": ["BinData"]}],
+    ids=["decode", "defer", "skip"],
+)
+def test_time_from_xml_large_bin_data(
+    large_bin_data: str, kwargs: dict, benchmark: BenchmarkFixture
+) -> None:
+    benchmark(lambda: from_xml(large_bin_data, **kwargs))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("file", UPGRADE, ids=["upgrade", "2008"])
+def test_time_from_xml_upgrade(file: Path) -> None:
+    pytest.importorskip("lxml")
+    # transformers are compiled once per thread, then reused
+    for _ in range(5):
+        _ = from_xml(file)
+
+
 @pytest.mark.benchmark
 def test_time_from_tiff() -> None:
     _ = from_tiff(TIFF)
 
 
+@pytest.mark.benchmark
+def test_time_from_tiff_mmap() -> None:
+    _ = from_tiff(TIFF, use_mmap=True)
+
+
 @pytest.mark.parametrize("file", [SMALL, MED], ids=["small", "med"])
 def test_time_from_xml_to_dict(file: Path) -> None:
     _ = to_dict(file)
@@ -49,3 +298,17 @@ def test_time_from_xml_to_dict(file: Path) -> None:
 def test_time_from_dict_to_ome(file: Path, benchmark: BenchmarkFixture) -> None:
     d = to_dict(file)
     benchmark(lambda: OME(**d))
+
+
+def test_time_validate_small_repeated(benchmark: BenchmarkFixture) -> None:
+    # schema compilation is cached, so this should scale with the size of the
+    # document, not the size of the schema
+    pytest.importorskip("lxml")
+    warm_schema_cache()
+    data = SMALL.read_bytes()
+
+    def _validate() -> None:
+        for _ in range(20):
+            validate_xml(data)
+
+    benchmark(_validate)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from ome_types import from_xml, to_xml
+from ome_types.model import (
+    OME,
+    AnnotationRef,
+    CommentAnnotation,
+    Image,
+    Pixels,
+    Plane,
+    TiffData,
+    UnitsTime,
+)
+
+np = pytest.importorskip("numpy")
+
+from ome_types.columnar import PlaneArray, TiffDataArray  # noqa: E402
+
+DATA = Path(__file__).parent / "data"
+
+
+@pytest.mark.filterwarnings("ignore")
+@pytest.mark.parametrize("kwargs", [{}, {"trusted": True}, {"lazy": True}])
+def test_columnar_roundtrip(valid_xml: Path, kwargs: dict) -> None:
+    ome = from_xml(valid_xml, **kwargs)
+    columnar = from_xml(valid_xml, columnar=True, **kwargs)
+    assert to_xml(columnar) == to_xml(ome)
+    assert to_xml(columnar, exclude_unset=False) == to_xml(ome, exclude_unset=False)
+    assert columnar.model_dump() == ome.model_dump()
+    assert columnar == ome
+    assert pickle.loads(pickle.dumps(columnar)) == ome
+    for image in columnar.images:
+        assert isinstance(image.pixels.planes, PlaneArray)
+        assert isinstance(image.pixels.tiff_data_blocks, TiffDataArray)
+
+
+def _pixels() -> Pixels:
+    planes = [
+        Plane(the_z=z, the_c=c, the_t=0, exposure_time=c * 10 or None)
+        for c in range(3)
+        for z in range(2)
+    ]
+    return Pixels(
+        size_x=1, size_y=1, size_z=2, size_c=3, size_t=1, type="uint8",
+        dimension_order="XYZCT", planes=PlaneArray(planes),
+        tiff_data_blocks=[TiffData(ifd=i) for i in range(6)],
+    )  # fmt: skip
+
+
+def test_columnar_queries() -> None:
+    planes = _pixels().planes
+    assert isinstance(planes, PlaneArray)
+    assert len(planes) == 6
+    np.testing.assert_array_equal(planes["the_c"], [0, 0, 1, 1, 2, 2])
+    np.testing.assert_array_equal(
+        planes.column("exposure_time"), [np.nan, np.nan, 10, 10, 20, 20]
+    )
+    assert planes.column("delta_t_unit")[0] is UnitsTime.SECOND
+    assert [p.the_z for p in planes.where(the_c=2)] == [0, 1]
+    assert len(planes.where(the_c=[0, 1], the_z=1)) == 2
+    assert len(planes.where(exposure_time_unit="s")) == 6
+    assert planes[planes.mask(the_c=1)] == planes[2:4]
+    with pytest.raises(KeyError, match="annotation_refs"):
+        planes.column("annotation_refs")
+
+
+def test_columnar_mutation() -> None:
+    pixels = _pixels()
+    planes = pixels.planes
+    assert planes[0] is planes[0]
+    planes[0].the_c = 5
+    planes[-1].delta_t = 1.5
+    assert planes["the_c"][0] == 5
+    assert planes.column("delta_t")[-1] == 1.5
+
+    planes.append(Plane(the_z=0, the_c=0, the_t=1))
+    planes.insert(0, {"the_z": 1, "the_c": 1, "the_t": 1})
+    del planes[1]
+    assert len(planes) == 7
+    np.testing.assert_array_equal(planes["the_t"], [1, 0, 0, 0, 0, 0, 1])
+    planes[1:3] = []
+    assert len(planes) == 5
+
+    # items are only kept in the container if they can't be restored from columns
+    planes[0].annotation_refs.append(AnnotationRef(id="Annotation:0"))
+    ome = OME(
+        images=[Image(pixels=pixels)],
+        structured_annotations=[CommentAnnotation(id="Annotation:0", value="hi")],
+    )
+    ome = from_xml(to_xml(ome), columnar=True)
+    restored = ome.images[0].pixels.planes
+    assert [p.model_dump() for p in restored] == [p.model_dump() for p in planes]
+    assert restored[0].annotation_refs[0].ref.value == "hi"
+
+    pixels.planes = [Plane(the_z=0, the_c=0, the_t=0)]
+    assert isinstance(pixels.planes, list)
+    assert not isinstance(pixels.planes, PlaneArray)
+    pixels.planes = PlaneArray(pixels.planes)
+    assert isinstance(pixels.planes, PlaneArray)
+
+
+def test_columnar_invalid() -> None:
+    xml = to_xml(OME(images=[Image(pixels=_pixels())]))
+    with pytest.raises(ValueError, match="the_c must be >= 0"):
+        from_xml(xml.replace('TheC="1"', 'TheC="-1"'), columnar=True)
+    with pytest.raises(ValueError, match="missing"):
+        from_xml(xml.replace('TheC="1"', ""), columnar=True)
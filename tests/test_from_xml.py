@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import copy
 import io
+import pickle
+import warnings
 from pathlib import Path
+from typing import Any
 
 import pytest
 from pydantic import ValidationError
+from xsdata.exceptions import ParserError
+from xsdata.formats.dataclass.parsers.config import ParserConfig
 
-from ome_types import from_xml, model
+from ome_types import from_xml, iter_xml, model, to_xml
 from ome_types._conversion import OME_2016_06_URI, _get_root_ome_type
+from ome_types._mixins import _ids
+from ome_types._mixins._ome import collect_ids, collect_references
 
 DATA = Path(__file__).parent / "data"
 VALIDATE = [False]
@@ -84,3 +92,185 @@ def test_must_be_binary(tmp_path: Path) -> None:
 
     with pytest.raises(TypeError, match="Unsupported source type"):
         from_xml(8)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "name", ["OverViewScan2-aics.ome.xml", "2008_instrument.ome.xml"]
+)
+def test_source_read_once(name: str, counting_reader: type[io.BytesIO]) -> None:
+    data = (DATA / name).read_bytes()
+    fh: Any = counting_reader(data)
+    assert isinstance(from_xml(fh), model.OME)
+    assert fh.bytes_read == len(data)
+
+
+def test_long_prolog() -> None:
+    comment = "<!-- " + "x" * 50_000 + " -->"
+    xml = f'{comment}<Detector xmlns="{OME_2016_06_URI}" ID="Detector:1"/>'
+    assert from_xml(xml).id == "Detector:1"
+
+
+def test_capitalize_across_chunks() -> None:
+    from ome_types._conversion import _capitalize_ome
+
+    data = b"<a xmlns='http://www.openmicroscopy.org/Schemas/ome/2016-06'/>" * 3
+    for size in (1, 5, 11, 12, 13, 64):
+        chunks = [data[i : i + size] for i in range(0, len(data), size)]
+        fixed = b"".join(_capitalize_ome(chunks))
+        assert fixed == data.replace(b"Schemas/ome/", b"Schemas/OME/")
+
+
+def _parse_or_error(path: Path, **kwargs: Any) -> Any:
+    _ids.ID_COUNTER.clear()
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        try:
+            result = from_xml(path, **kwargs)
+        except Exception as e:
+            result = type(e)
+    return result, [str(x.message) for x in w]
+
+
+def test_fast_engine(any_xml: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_ids, "ID_COUNTER", {})
+    expected, expected_warnings = _parse_or_error(any_xml)
+    result, result_warnings = _parse_or_error(any_xml, engine="fast")
+    assert result == expected
+    assert result_warnings == expected_warnings
+
+
+def test_fast_engine_unknown_property() -> None:
+    xml = f'<Detector xmlns="{OME_2016_06_URI}" ID="Detector:1"><Foo/></Detector>'
+    with pytest.raises(ParserError, match="Unknown property"):
+        from_xml(xml, engine="fast")
+    with pytest.raises(ValueError, match="Unknown parser engine"):
+        from_xml(xml, engine="slow")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("engine", ["xsdata", "fast"])
+def test_trusted(valid_xml: Path, engine: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_ids, "ID_COUNTER", {})
+    expected, expected_warnings = _parse_or_error(valid_xml)
+    if expected_warnings:
+        pytest.skip("trusted mode does not fix invalid documents")
+    counter = {k: v for k, v in _ids.ID_COUNTER.items() if v >= 0}
+
+    result, _ = _parse_or_error(valid_xml, engine=engine, trusted=True)
+    assert result == expected
+    assert to_xml(result) == to_xml(expected)  # same model_fields_set
+    # counters are updated, so that newly created objects get fresh IDs
+    assert _ids.ID_COUNTER == counter
+
+
+def test_trusted_links_refs() -> None:
+    ome = from_xml(DATA / "two-screens-two-plates-four-wells.ome.xml", trusted=True)
+    ref = ome.screens[0].plate_refs[0]
+    assert ref.ref is not None
+    assert ref.ref.id == ref.id
+    assert ome.screens[0].model_fields_set >= {"id", "plate_refs"}
+
+
+def test_trusted_bin_data_hook() -> None:
+    from ome_types._mixins._construct import trusted_factory
+
+    class MyBinData(model.BinData):
+        pass
+
+    # the empty payload of <BinData Length="0"/> is supplied by the class itself,
+    # so it also applies to subclasses
+    for cls in (model.BinData, MyBinData):
+        obj = trusted_factory(cls, {"length": 0, "big_endian": False})
+        assert isinstance(obj, cls)
+        assert obj.value == b""
+        assert obj == cls(length=0, big_endian=False)
+
+
+def test_trusted_custom_class_factory() -> None:
+    config = ParserConfig(class_factory=lambda cls, params: cls(**params))
+    with pytest.raises(ValueError, match="class_factory"):
+        from_xml(
+            DATA / "example.ome.xml", trusted=True, parser_kwargs={"config": config}
+        )
+    # a config with the default class factory is fine
+    ome = from_xml(
+        DATA / "example.ome.xml", trusted=True, parser_kwargs={"config": ParserConfig()}
+    )
+    assert ome.images
+
+
+def test_iter_xml() -> None:
+    path = DATA / "two-screens-two-plates-four-wells.ome.xml"
+    ome = from_xml(path)
+
+    items = list(iter_xml(path))
+    assert [type(i) for i in items] == [model.Plate] * 2 + [model.Image] * 22
+    images = [i for i in items if isinstance(i, model.Image)]
+    assert images == ome.images
+
+    # nested types are yielded before their container, which is still complete
+    items = list(iter_xml(path, [model.Plate, model.WellSample], engine="fast"))
+    assert isinstance(items[0], model.WellSample)
+    plates = [i for i in items if isinstance(i, model.Plate)]
+    assert [p.model_dump() for p in plates] == [p.model_dump() for p in ome.plates]
+    n_samples = sum(len(w.well_samples) for p in ome.plates for w in p.wells)
+    assert len(items) == len(plates) + n_samples
+
+    with pytest.raises(ValueError, match="not a top-level OME element"):
+        next(iter_xml(path, [model.ROI.Union]))
+
+
+def test_iter_xml_upgrade() -> None:
+    path = DATA / "2008_instrument.ome.xml"
+    instruments = list(iter_xml(path, [model.Instrument]))
+    expected = from_xml(path).instruments
+    # (references are not resolved, so compare the data only)
+    assert [i.model_dump() for i in instruments] == [i.model_dump() for i in expected]
+
+
+@pytest.mark.parametrize("engine", ["xsdata", "fast"])
+def test_lazy(valid_xml: Path, engine: str) -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = from_xml(valid_xml)
+        ome = from_xml(valid_xml, lazy=True, engine=engine)
+    assert ome.model_fields_set == expected.model_fields_set
+    # every reference resolves, loading whatever it needs on demand
+    for ref in collect_references(ome.images):
+        if ref.id in collect_ids(expected):
+            assert ref.ref is not None
+            assert ref.ref.id == ref.id
+    assert to_xml(ome) == to_xml(expected)
+    assert ome._lazy is None
+    assert ome == expected
+
+
+def test_lazy_access() -> None:
+    path = DATA / "two-screens-two-plates-four-wells.ome.xml"
+    expected = from_xml(path)
+    ome = from_xml(path, lazy=True)
+    assert ome._lazy is not None
+    assert {"images", "plates", "screens"} == set(ome._lazy.elements)
+
+    # only the accessed field is loaded
+    assert [p.model_dump() for p in ome.plates] == [
+        p.model_dump() for p in expected.plates
+    ]
+    assert set(ome._lazy.elements) == {"images", "screens"}
+
+    # a reference to an unloaded object loads its field on demand
+    image_ref = ome.plates[0].wells[0].well_samples[0].image_ref
+    assert image_ref is not None
+    assert image_ref.ref is ome.images[0]
+    assert set(ome._lazy.elements) == {"screens"}
+
+    # assignment replaces the unloaded value
+    ome.screens = []
+    assert ome._lazy is None
+    assert ome.screens == []
+
+    ome = from_xml(path, lazy=True)
+    assert pickle.loads(pickle.dumps(ome)) == expected
+    ome = from_xml(path, lazy=True)
+    assert copy.deepcopy(ome) == expected
+    ome = from_xml(path, lazy=True)
+    assert ome.model_dump() == expected.model_dump()
@@ -1,9 +1,19 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from functools import partial
+from pathlib import Path
+from typing import Any
+
 import pytest
 
 from ome_types import from_xml, model
-from ome_types._mixins import _ids
+from ome_types._mixins import _id_index, _ids
+from ome_types._mixins._ome import collect_ids
 from ome_types.model import Line, Rectangle
 
+DATA = Path(__file__).parent / "data"
+
 
 def test_no_id(monkeypatch: "pytest.MonkeyPatch") -> None:
     """Test that ids are optional, and auto-increment."""
@@ -19,6 +29,32 @@ def test_no_id(monkeypatch: "pytest.MonkeyPatch") -> None:
         model.Instrument(id="nonsense")
 
 
+def test_valid_ids(monkeypatch: "pytest.MonkeyPatch") -> None:
+    monkeypatch.setattr(_ids, "ID_COUNTER", {})
+    assert model.Channel(id="Channel:5").id == "Channel:5"
+    lsid = "urn:lsid:example.org:Channel:7"
+    assert model.Channel(id=lsid).id == lsid
+    assert model.Channel(id="Channel:x").id == "Channel:x"
+    # the counter is updated with the highest number seen
+    assert _ids.ID_COUNTER["Channel"] == 7
+    assert model.Channel().id == "Channel:8"
+
+
+def test_converted_ids_outside_documents(monkeypatch: "pytest.MonkeyPatch") -> None:
+    """IDs converted for objects built by hand are only reused within a document."""
+    monkeypatch.setattr(_ids, "ID_COUNTER", {})
+    omes = []
+    for _ in range(2):
+        with pytest.warns(match="Casting invalid InstrumentID"):
+            instrument = model.Instrument(id="Microscope")
+        ref = model.InstrumentRef(id="Microscope")
+        image = model.Image(pixels=_pixels(), instrument_ref=ref)
+        omes.append(model.OME(instruments=[instrument], images=[image]))
+        assert ref.ref is instrument
+    assert [ome.instruments[0].id for ome in omes] == ["Instrument:0", "Instrument:1"]
+    assert _ids.CONVERTED_IDS == {}
+
+
 def test_shape_ids(monkeypatch: "pytest.MonkeyPatch") -> None:
     monkeypatch.setattr(_ids, "ID_COUNTER", {})
     rect = Rectangle(x=0, y=0, width=1, height=1)
@@ -50,3 +86,155 @@ def test_id_conversion(monkeypatch: "pytest.MonkeyPatch") -> None:
     assert ome.images[0].instrument_ref is not None
     assert ome.images[0].instrument_ref.id == "Instrument:0"
     assert ome.images[0].instrument_ref.ref is ome.instruments[0]
+
+
+def _pixels(**kwargs: Any) -> model.Pixels:
+    return model.Pixels(
+        size_x=1, size_y=1, size_z=1, size_c=1, size_t=1, type="uint8",
+        dimension_order="XYZCT", **kwargs,
+    )  # fmt: skip
+
+
+def test_id_index(valid_xml: Path) -> None:
+    ome = from_xml(valid_xml)
+    assert dict(ome.id_index) == collect_ids(ome)
+    for id_, obj in collect_ids(ome).items():
+        assert ome.get_by_id(id_) is obj
+    assert ome.get_by_id("Image:nonexistent") is None
+    channels = [c for image in ome.images for c in image.pixels.channels]
+    assert ome.find(model.Channel) == channels
+    assert len(ome.find(model.Annotation)) == len(ome.structured_annotations)
+
+
+def test_id_index_updates() -> None:
+    image = model.Image(id="Image:0", pixels=_pixels(id="Pixels:0"))
+    ome = model.OME(images=[image])
+    assert ome.get_by_id("Image:0") is image
+    assert ome.get_by_id("Channel:1:0") is None
+
+    # objects that are added, removed, moved or modified are found (or not)
+    channel = model.Channel(id="Channel:1:0")
+    ome.images.append(model.Image(id="Image:1", pixels=_pixels(channels=[channel])))
+    assert ome.get_by_id("Channel:1:0") is channel
+    assert ome.find(model.Image) == ome.images
+    channel.id = "Channel:1:1"
+    assert ome.get_by_id("Channel:1:0") is None
+    assert ome.get_by_id("Channel:1:1") is channel
+    ome.images[1].pixels.channels.remove(channel)
+    image.pixels.channels.append(channel)
+    assert ome.get_by_id("Channel:1:1") is channel
+    del ome.images[0]
+    assert ome.get_by_id("Channel:1:1") is None
+    assert ome.get_by_id("Image:0") is None
+    ome.images = [image]
+    assert dict(ome.id_index) == collect_ids(ome)
+    assert ome.find(model.Channel) == [channel]
+
+
+def test_id_index_unchanged(monkeypatch: pytest.MonkeyPatch) -> None:
+    ome = from_xml(DATA / "two-screens-two-plates-four-wells.ome.xml")
+    assert ome.find(model.Image) == ome.images
+    referrers = ome.referrers(ome.plates[0])
+    assert referrers
+    # references are linked without invalidating the memos of the objects
+    ref = ome.screens[0].plate_refs[0]
+    memo = ref._memo()
+    ome._link_refs()
+    assert ref._memo() is memo
+
+    # while nothing changes, the tree is not compared with the index
+    reads: list[Any] = []
+    monkeypatch.setattr(_id_index, "_get_memo", lambda obj: reads.append(obj))
+    assert ome.find(model.Image) == ome.images
+    assert ome.get_by_id("Image:nonexistent") is None
+    assert ome.referrers(ome.plates[0]) == referrers
+    assert not reads
+    monkeypatch.undo()
+
+    # mutations of (nested) lists and fields are seen
+    image = ome.images.pop()
+    assert ome.find(model.Image) == ome.images
+    ome.images[0].pixels.channels.append(model.Channel(id="Channel:99:0"))
+    assert ome.get_by_id("Channel:99:0") is not None
+    ome.images[0].pixels.channels[-1].id = "Channel:99:1"
+    assert ome.get_by_id("Channel:99:0") is None
+    ome.images += [image]
+    assert ome.find(model.Image)[-1] is image
+
+    # lists that are not tracked (e.g. put in `__dict__` directly) are compared
+    pixels = ome.images[0].pixels
+    pixels.__dict__["channels"] = channels = []
+    pixels.size_c = 1
+    assert ome.get_by_id("Channel:99:1") is None
+    channels.append(model.Channel(id="Channel:99:2"))
+    assert ome.get_by_id("Channel:99:2") is channels[0]
+
+
+def test_referrers(valid_xml: Path) -> None:
+    ome = from_xml(valid_xml)
+    expected: dict[str, list] = {}
+    for obj in ome.walk():
+        for name in type(obj).model_fields:
+            value = getattr(obj, name)
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, model.Reference):
+                    holders = expected.setdefault(item.id, [])
+                    if not any(holder is obj for holder in holders):
+                        holders.append(obj)
+    for id_, target in collect_ids(ome).items():
+        assert ome.referrers(target) == expected.get(id_, [])
+
+
+def test_referrers_updates() -> None:
+    instrument = model.Instrument(id="Instrument:0")
+    images = [
+        model.Image(id=f"Image:{i}", pixels=_pixels(), instrument_ref={"id": ref})
+        for i, ref in enumerate(["Instrument:0", "Instrument:0", "Instrument:1"])
+    ]
+    instruments = [instrument, model.Instrument(id="Instrument:1")]
+    ome = model.OME(instruments=instruments, images=images)
+    assert ome.referrers(instrument) == images[:2]
+
+    # references that are added, removed or modified are found (or not)
+    images[2].instrument_ref.id = "Instrument:0"  # type: ignore[union-attr]
+    assert ome.referrers(instrument) == images
+    images[0].instrument_ref = None
+    del ome.images[1]
+    assert ome.referrers(instrument) == images[2:]
+    ome.images.append(images[1])
+    assert ome.referrers(instrument) == images[2:0:-1]
+
+    # the index isn't copied, but rebuilt for the copy
+    for copy in [deepcopy(ome), pickle.loads(pickle.dumps(ome))]:
+        referrers = copy.referrers(copy.instruments[0])
+        assert list(map(id, referrers)) == list(map(id, copy.images[1:]))
+
+
+_CONCURRENT_XML = """<OME xmlns="http://www.openmicroscopy.org/Schemas/OME/2016-06">
+    <Instrument ID="Instrument:{i}"/>
+    <Instrument ID="Microscope"/>
+    <Image ID="Image:{i}">
+        <InstrumentRef ID="Microscope"/>
+        <Pixels DimensionOrder="XYCZT" SizeC="1" SizeT="1" SizeX="1" SizeY="1"
+            SizeZ="1" ID="Pixels" Type="uint8"/>
+    </Image>
+</OME>
+"""
+
+
+@pytest.mark.filterwarnings("ignore:Casting invalid")
+@pytest.mark.parametrize("engine", ["xsdata", "fast"])
+def test_concurrent_parsing(engine: str) -> None:
+    """IDs are numbered and converted independently for each document."""
+    sources = [_CONCURRENT_XML.format(i=i) for i in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(partial(from_xml, engine=engine), sources))
+    for i, ome in enumerate(results):
+        # invalid IDs are numbered after the highest ID of the same kind
+        instrument = ome.instruments[1]
+        assert instrument.id == f"Instrument:{i + 1}"
+        assert ome.images[0].pixels.id == "Pixels:0"
+        ref = ome.images[0].instrument_ref
+        assert ref is not None
+        assert ref.id == instrument.id
+        assert ref.ref is instrument
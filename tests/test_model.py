@@ -3,6 +3,7 @@ from __future__ import annotations
 import copy
 import datetime
 import io
+import struct
 import sys
 import warnings
 from pathlib import Path
@@ -12,6 +13,8 @@ import pytest
 from pydantic import ValidationError
 
 from ome_types import from_tiff, from_xml, model, to_xml
+from ome_types._conversion import tiff2xml, tiff_xml_offset
+from ome_types._mixins._base_type import OMEType
 from ome_types.model import OME, AnnotationRef, CommentAnnotation, Instrument
 
 DATA = Path(__file__).parent / "data"
@@ -29,6 +32,70 @@ def test_from_tiff() -> None:
     with open(_path, "rb") as fh:
         assert model.OME.from_tiff(fh) == ome  # class method for coverage
 
+    assert from_tiff(_path, trusted=True) == ome
+    assert from_tiff(_path, use_mmap=True) == ome
+
+
+def _make_tiff(*ifds: tuple[bytes, list[bytes]]) -> bytes:
+    """Make a (pixel-less) little-endian TIFF with descriptions in IFDs & SubIFDs."""
+    buf = bytearray(b"II*\0\0\0\0\0")
+
+    def write_ifd(desc: bytes, subifds: list[int]) -> int:
+        entries = [(270, 2, len(desc), len(buf))]
+        buf.extend(desc)
+        if subifds:
+            entries.append((330, 13, len(subifds), len(buf)))
+            buf.extend(struct.pack(f"<{len(subifds)}I", *subifds))
+            if len(subifds) == 1:  # stored in the tag itself
+                entries[-1] = (330, 13, 1, subifds[0])
+        offset = len(buf)
+        buf.extend(struct.pack("<H", len(entries)))
+        for entry in entries:
+            buf.extend(struct.pack("<HHII", *entry))
+        buf.extend(b"\0\0\0\0")  # next IFD
+        return offset
+
+    offsets = []
+    for desc, sub_descs in ifds:
+        offsets.append(write_ifd(desc, [write_ifd(d, []) for d in sub_descs]))
+    struct.pack_into("<I", buf, 4, offsets[0])
+    for prev, offset in zip(offsets, offsets[1:]):
+        struct.pack_into("<I", buf, prev + 2 + 12 * buf[prev], offset)
+    return bytes(buf)
+
+
+def test_tiff2xml_all_ifds(tmp_path: Path) -> None:
+    xml = tiff2xml(DATA / "ome.tiff")
+
+    # OME-XML in the second IFD
+    path = tmp_path / "ifd1.tif"
+    path.write_bytes(_make_tiff((b"not ome\0", []), (xml + b"\0", [])))
+    assert tiff2xml(path) == xml
+    offset, size = tiff_xml_offset(path)
+    assert path.read_bytes()[offset : offset + size] == xml
+
+    # OME-XML in a SubIFD
+    for sub_descs in ([xml], [b"lowres", xml]):
+        path.write_bytes(_make_tiff((b"first", sub_descs)))
+        assert tiff2xml(path) == xml
+        view = tiff2xml(path, use_mmap=True)
+        assert isinstance(view, memoryview)
+        assert view == xml
+        assert from_xml(view) == from_xml(xml)
+        del view  # release the mapping
+
+    # no OME-XML at all: the first description is returned
+    path.write_bytes(_make_tiff((b"first", [b"second"]), (b"third", [])))
+    assert tiff2xml(path) == b"first"
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_tiff2xml_empty_file(tmp_path: Path, use_mmap: bool) -> None:
+    path = tmp_path / "empty.tif"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="recognized TIFF header"):
+        tiff2xml(path, use_mmap=use_mmap)
+
 
 def test_required_missing() -> None:
     """Test subclasses with non-default arguments still work."""
@@ -195,6 +262,135 @@ def test_numpy_pixel_types() -> None:
         numpy.dtype(m.numpy_dtype)
 
 
+@pytest.mark.parametrize("columnar", [False, True])
+def test_planes_table(pixels: model.Pixels, columnar: bool) -> None:
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("pint")
+
+    pixels.planes = [
+        model.Plane(
+            the_z=z, the_c=0, the_t=0, delta_t=z, position_x=z, position_x_unit="nm"
+        )
+        for z in range(10)
+    ]
+    pixels.planes[1].delta_t_unit = "ms"
+    pixels.planes[2].delta_t = None
+    if columnar:
+        from ome_types.columnar import PlaneArray
+
+        pixels.planes = PlaneArray(pixels.planes)
+
+    table = pixels.planes_table(length_unit="µm", as_frame=False)
+    np.testing.assert_array_equal(table["the_z"], range(10))
+    assert table["delta_t"][:4].tolist()[::3] == [0, 3]
+    assert table["delta_t"][1] == pytest.approx(0.001)
+    assert np.isnan(table["delta_t"][2])
+    assert table.dtype["delta_t"].metadata == {"unit": "s"}
+    assert table["position_x"][2] == pytest.approx(0.002)
+    assert table.dtype["position_x"].metadata == {"unit": "µm"}
+    np.testing.assert_array_equal(
+        pixels.planes_table(time_unit="ms", as_frame=False)["delta_t"][3:5],
+        [3000, 4000],
+    )
+
+    # the table is reused until the planes change
+    assert (pixels.planes_table(length_unit="µm", as_frame=False) is table) is (
+        not columnar
+    )
+    pixels.planes[3].the_z = 0
+    assert pixels.planes_table(length_unit="µm", as_frame=False)["the_z"][3] == 0
+    pixels.planes.append(model.Plane(the_z=0, the_c=0, the_t=1))
+    assert len(pixels.planes_table(as_frame=False)) == 11
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "bzip2"])
+def test_bin_data_as_array(compression: str) -> None:
+    import bz2
+    import zlib
+
+    np = pytest.importorskip("numpy")
+
+    data = np.arange(2 * 3 * 4 * 5, dtype=">u2").reshape(2, 3, 4, 5)
+    compress = {"none": bytes, "zlib": zlib.compress, "bzip2": bz2.compress}
+    blocks = [
+        model.BinData(
+            value=compress[compression](plane.tobytes()),
+            compression=compression,
+            big_endian=True,
+            length=0,
+        )
+        for plane in data.reshape(6, 20)
+    ]
+    pixels = model.Pixels(
+        size_x=5, size_y=4, size_z=3, size_c=1, size_t=2, type="uint16",
+        dimension_order="XYZTC", bin_data_blocks=blocks,
+    )  # fmt: skip
+    np.testing.assert_array_equal(blocks[1].to_numpy("uint16", (4, 5)), data[0, 1])
+    array = pixels.bin_data_as_array()
+    assert array.shape == (1, 2, 3, 4, 5)
+    assert array.dtype == np.dtype("uint16")
+    np.testing.assert_array_equal(array[0], data)
+
+    # deferred BinData is decoded on demand
+    ome = from_xml(to_xml(OME(images=[model.Image(pixels=pixels)])), defer=["BinData"])
+    pixels = ome.images[0].pixels
+    assert "value" not in pixels.bin_data_blocks[0].__dict__
+    np.testing.assert_array_equal(pixels.bin_data_as_array()[0], data)
+    assert "value" not in pixels.bin_data_blocks[0].__dict__
+    assert pixels.bin_data_blocks[0].value == blocks[0].value
+
+    pixels.size_x = 4
+    with pytest.raises(ValueError, match="does not match"):
+        pixels.bin_data_as_array()
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"trusted": True}, {"engine": "fast"}])
+def test_defer_payloads(valid_xml: Path, kwargs: dict) -> None:
+    ome = from_xml(valid_xml, **kwargs)
+    deferred = from_xml(valid_xml, defer=["BinData", "XMLAnnotation"], **kwargs)
+    assert to_xml(deferred) == to_xml(ome)
+    assert deferred == ome
+    with pytest.raises(ValueError, match="Cannot defer"):
+        from_xml(valid_xml, defer=["Plane"])
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"engine": "fast"}])
+def test_defer_skip_xml_annotations(with_xml_annotations: Path, kwargs: dict) -> None:
+    ome = from_xml(with_xml_annotations, **kwargs)
+    annotations = ome.structured_annotations.xml_annotations
+
+    deferred = from_xml(with_xml_annotations, defer=["XMLAnnotation"], **kwargs)
+    list(deferred.walk(existing_only=True))  # (doesn't load the payloads)
+    for anno, expected in zip(
+        deferred.structured_annotations.xml_annotations, annotations
+    ):
+        if expected.value.any_elements:
+            assert "value" not in anno.__dict__
+        assert anno.value == expected.value
+        assert "value" in anno.__dict__
+
+    skipped = from_xml(with_xml_annotations, skip=["XMLAnnotation"], **kwargs)
+    skipped_annotations = skipped.structured_annotations.xml_annotations
+    assert [a.id for a in skipped_annotations] == [a.id for a in annotations]
+    assert all(not a.value.any_elements for a in skipped_annotations)
+    assert [i.model_dump() for i in skipped.images] == [
+        i.model_dump() for i in ome.images
+    ]
+
+
+def test_skip_bin_data() -> None:
+    block = model.BinData(value=bytes(range(8)), length=8, big_endian=False)
+    pixels = model.Pixels(
+        size_x=4, size_y=2, size_z=1, size_c=1, size_t=1, type="uint8",
+        dimension_order="XYZCT", bin_data_blocks=[block],
+    )  # fmt: skip
+    xml = to_xml(OME(images=[model.Image(pixels=pixels)]))
+    ome = from_xml(xml, skip=["BinData"])
+    block = ome.images[0].pixels.bin_data_blocks[0]
+    assert block.value == b""
+    assert block.length == 8
+
+
 def test_xml_annotations_to_etree(with_xml_annotations: Path) -> None:
     from xsdata_pydantic_basemodel.compat import AnyElement
 
@@ -226,9 +422,43 @@ def test_update_unset(pixels: model.Pixels) -> None:
     assert "Channel" in xml
     assert "Image" in xml
     assert "CommentAnnotation" in xml
+    # the fields populated by mutation are now known to be set
+    assert {"images", "structured_annotations"} <= ome.model_fields_set
+    assert "channels" in pixels.model_fields_set
 
     assert from_xml(xml) == ome
 
+    pixels.planes.append(model.Plane(the_z=0, the_t=0, the_c=0))
+    ome._update_set_fields()
+    assert "planes" in pixels.model_fields_set
+
+
+def _all_objects(obj: OMEType) -> list[OMEType]:
+    """Return all the model objects in `obj`, in document order (the slow way)."""
+    found = [obj]
+    for name in type(obj).model_fields:
+        value = getattr(obj, name)
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, OMEType):
+                found.extend(_all_objects(item))
+    return found
+
+
+def test_walk(valid_xml: Path) -> None:
+    ome = from_xml(valid_xml)
+    objects = _all_objects(ome)
+    assert list(map(id, ome.walk())) == list(map(id, objects))
+    for types in [model.Channel, model.Reference, (model.Plane, model.ROI)]:
+        expected = [o for o in objects if isinstance(o, types)]
+        assert list(map(id, ome.walk(types))) == list(map(id, expected))
+
+
+def test_repr_long_lists(pixels: model.Pixels) -> None:
+    pixels.channels.extend(model.Channel() for _ in range(7))
+    assert "channels=[<7 " in repr(pixels)
+    pixels.channels[1:] = []
+    assert "channels=[{'id': 'Channel:" in repr(pixels)
+
 
 @pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
 def test_transformations() -> None:
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import io
 import json
 import pickle
 import re
+import warnings
 from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
@@ -11,7 +13,7 @@ from xml.etree import ElementTree as ET
 
 import pytest
 
-from ome_types import from_xml, to_dict, to_xml
+from ome_types import from_xml, to_dict, to_xml, to_xml_stream
 from ome_types._conversion import OME_2016_06_NS, OME_2016_06_URI, OME_2016_06_XSD
 from ome_types.model import OME, Channel, Image, Pixels
 
@@ -32,6 +34,13 @@ SKIP_ROUNDTRIP = {
     "seq0000xy01c1",
 }
 
+# documents that are not read back identically from their canonical XML
+NO_CANONICAL_ROUNDTRIP = {
+    # the indentation of the canonical XML is added to the (xml:space="preserve")
+    # mixed content of an XMLAnnotation, each time it is read back
+    "xmlannotation-body-space",
+}
+
 
 def true_stem(p: Path) -> str:
     return p.name.partition(".")[0]
@@ -167,6 +176,116 @@ def test_canonicalize() -> None:
     _ = to_xml(ome, validate=True, canonicalize=True)
 
 
+@pytest.mark.parametrize("kwargs", [{}, {"indent": 0}, {"canonicalize": True}])
+def test_to_xml_stream(any_xml: Path, kwargs: dict) -> None:
+    pytest.importorskip("lxml")  # (the output of to_xml differs slightly without it)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ome = from_xml(any_xml)
+
+    out = io.BytesIO()
+    to_xml_stream(ome, out, **kwargs)
+    assert out.getvalue() == to_xml(ome, **kwargs).encode()
+
+
+def test_write_xml(tmp_path: Path) -> None:
+    ome = from_xml(DATA / "example.ome.xml")
+    # escaping of special characters
+    ome.images[0].description = 'a & b < c > d " e\n\tf'
+    path = tmp_path / "out.ome.xml"
+    ome.write_xml(path, canonicalize=True)
+    assert path.read_text(encoding="utf-8") == to_xml(ome, canonicalize=True)
+    assert from_xml(path) == ome
+
+
+@pytest.mark.parametrize("indent", [0, 2])
+def test_canonicalize_matches_c14n(any_xml: Path, indent: int) -> None:
+    """Native canonical output is the same as canonicalizing with ET and minidom."""
+    pytest.importorskip("lxml")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ome = from_xml(any_xml)
+
+    xml = to_xml(ome, include_namespace=True, indent=indent)
+    c14n = ET.canonicalize(xml, strip_text=True)
+    expected = minidom.parseString(c14n).toprettyxml(indent=" " * indent)
+    assert to_xml(ome, canonicalize=True, indent=indent) == expected
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"exclude_defaults": True}])
+def test_fingerprint(
+    any_xml: Path, kwargs: dict, request: pytest.FixtureRequest
+) -> None:
+    if true_stem(any_xml) in NO_CANONICAL_ROUNDTRIP:
+        request.applymarker(
+            pytest.mark.xfail(reason="not preserved by canonical XML", strict=True)
+        )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ome = from_xml(any_xml)
+        other = from_xml(to_xml(ome, canonicalize=True, **kwargs))
+
+    fingerprint = ome.fingerprint(**kwargs)
+    assert ome.fingerprint(**kwargs) == fingerprint  # memoized
+    assert ome.model_copy(deep=True).fingerprint(**kwargs) == fingerprint
+    # the document read back from its canonical XML has the same fingerprint
+    assert other.fingerprint(**kwargs) == fingerprint
+
+
+def test_fingerprint_invalidation() -> None:
+    ome = from_xml(DATA / "OverViewScan2-aics.ome.xml")
+    original = ome.fingerprint()
+    assert ome.fingerprint(exclude_unset=False) != original
+
+    # assignment of a nested field
+    plane = ome.images[0].pixels.planes[0]
+    plane.the_z = 5
+    assert ome.fingerprint() != original
+    plane.the_z = 0
+    assert ome.fingerprint() == original
+
+    # mutation of a list
+    ome.images[0].pixels.planes.append(plane.model_copy())
+    assert ome.fingerprint() != original
+    ome.images[0].pixels.planes.pop()
+    assert ome.fingerprint() == original
+
+    # mutation of arbitrary XML content
+    element = ome.structured_annotations.xml_annotations[0].value.any_elements[0]
+    text, element.children[0].text = element.children[0].text, "changed"
+    assert ome.fingerprint() != original
+    element.children[0].text = text
+    assert ome.fingerprint() == original
+
+
+def test_serializer_plans() -> None:
+    from xsdata_pydantic_basemodel.bindings import (
+        SerializerConfig,
+        XmlContext,
+        XmlSerializer,
+    )
+
+    context = XmlContext()
+    pixels = Pixels(
+        size_c=1, size_t=1, size_x=1, size_y=1, size_z=1, dimension_order="XYZCT",
+        type="uint8", physical_size_x=0.5,
+    )  # fmt: skip
+    xml = XmlSerializer(context=context).render(pixels)
+    # plans are built once per class, and shared by serializers using the context
+    plan = XmlSerializer(context=context)._plan(Pixels, None)
+    assert XmlSerializer(context=context)._plan(Pixels, None) is plan
+
+    # a different attribute order gets its own plan, kept by the serializer only
+    config = SerializerConfig(attribute_sort_key=lambda var: var.qname)
+    serializer = XmlSerializer(config=config, context=context)
+    sorted_xml = serializer.render(pixels)
+    attrs = ET.fromstring(sorted_xml).attrib
+    assert list(attrs) == sorted(attrs)
+    assert ET.fromstring(xml).attrib == attrs
+    assert serializer._plans is XmlSerializer(context=context)._plans
+    assert all(len(key) == 2 for key in serializer._plans)
+
+
 def test_export_schema() -> None:
     schema = OME.model_json_schema()
     assert isinstance(schema, dict)
@@ -1,5 +1,5 @@
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -20,3 +20,18 @@ def test_transform() -> None:
 
     with pytest.warns(match="Transformed source"):
         from_xml(DATA / "2008_instrument.ome.xml", warn_on_schema_update=True)
+
+
+def test_xslt_cache() -> None:
+    from lxml import etree
+
+    tform = MagicMock(wraps=etree.XSLT)
+    _conversion._XSLT_CACHE.__dict__.clear()
+    with patch.object(etree, "XSLT", tform):
+        ome1 = from_xml(DATA / "2008_instrument.ome.xml")
+        n_compiled = tform.call_count
+        ome2 = from_xml(DATA / "2008_instrument.ome.xml")
+    assert n_compiled
+    # converting the same document again doesn't compile anything
+    assert tform.call_count == n_compiled
+    assert ome1 == ome2
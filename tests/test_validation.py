@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import contextlib
-from contextlib import AbstractContextManager, nullcontext
+import threading
+from contextlib import AbstractContextManager, nullcontext, suppress
 from typing import TYPE_CHECKING, Callable
 
 import pytest
@@ -49,3 +50,58 @@ def test_validation_anybackend(single_xml: Path) -> None:
 def test_validation_raises(invalid_xml: Path, backend: str) -> None:
     with pytest.raises(_conversion.ValidationError):
         VALIDATORS[backend](invalid_xml)
+
+
+def test_lxml_schema_cache(single_xml: Path) -> None:
+    pytest.importorskip("lxml")
+    _conversion.clear_schema_cache()
+    assert not _conversion._lxml_schemas()
+
+    _conversion.warm_schema_cache()
+    schema = _conversion._get_lxml_schema(_conversion.OME_2016_06_XSD)
+    validate_xml(single_xml)
+    validate_xml(single_xml.read_bytes())
+    assert len(_conversion._lxml_schemas()) == 1
+    assert _conversion._get_lxml_schema(_conversion.OME_2016_06_XSD) is schema
+
+    _conversion.clear_schema_cache()
+    assert not _conversion._lxml_schemas()
+
+
+def test_lxml_validation_threaded(single_xml: Path, invalid_xml: Path) -> None:
+    pytest.importorskip("lxml")
+    from concurrent.futures import ThreadPoolExecutor
+
+    n_threads = 4
+    # all threads start validating at the same time
+    barrier = threading.Barrier(n_threads)
+    schemas: dict[int, set[int]] = {}
+
+    def _validate(path: Path) -> bool:
+        with suppress(threading.BrokenBarrierError):
+            barrier.wait(timeout=5)
+        schema = _conversion._get_lxml_schema(_conversion.OME_2016_06_XSD)
+        schemas.setdefault(threading.get_ident(), set()).add(id(schema))
+        try:
+            _conversion.validate_xml_with_lxml(path)
+        except _conversion.ValidationError as e:
+            assert "failed" in str(e)
+            return False
+        return True
+
+    _conversion.clear_schema_cache()
+    paths = [single_xml, invalid_xml] * 8
+    with ThreadPoolExecutor(n_threads) as pool:
+        results = list(pool.map(_validate, paths))
+    assert results == [True, False] * 8
+    # each thread compiled, and reused, its own schema
+    assert all(len(ids) == 1 for ids in schemas.values())
+    assert len(set().union(*schemas.values())) == len(schemas)
+
+    # clearing the cache also drops the schemas of the other threads
+    with ThreadPoolExecutor(1) as pool:
+        before = pool.submit(_conversion._get_lxml_schema, _conversion.OME_2016_06_XSD)
+        first = before.result()
+        _conversion.clear_schema_cache()
+        after = pool.submit(_conversion._get_lxml_schema, _conversion.OME_2016_06_XSD)
+        assert after.result() is not first